@@ -0,0 +1,119 @@
+"""
+Benchmark the per-case latency of AVL runs.
+
+Compares, on the same operating points:
+    - xvfb: one AVL process per case under xvfb-run (previous headless path),
+    - no-graphics: one AVL process per case, no plot commands and no X server,
+    - session: one persistent AVL session running all the cases.
+
+Usage:
+    python scripts/benchmark_avl.py [--avl path/to/aircraft.avl] [--cases 20]
+"""
+
+# Futures
+from __future__ import annotations
+
+# Imports
+import os
+import time
+import argparse
+import tempfile
+
+from ceasiompy.pyavl.func.data import AVLData
+from ceasiompy.pyavl.func.session import AVLSession
+from ceasiompy.pyavl.func.config import (
+    get_command_path,
+    write_command_file,
+)
+from ceasiompy.utils.ceasiompyutils import run_software
+
+from pathlib import Path
+
+from ceasiompy.pyavl import (
+    MODULE_DIR,
+    SOFTWARE_NAME,
+)
+
+
+# Functions
+def write_cases(avl_path: Path, results_dir: Path, nb_cases: int) -> list[Path]:
+    case_dirs = []
+    for i_case in range(nb_cases):
+        avl_data = AVLData(
+            ref_area=1.0,
+            ref_length=1.0,
+            altitude=1000.0,
+            mach=0.3,
+            alpha=-5.0 + 10.0 * i_case / max(nb_cases - 1, 1),
+            beta=0.0,
+        )
+        case_dir = write_command_file(i_case, avl_path, avl_data, results_dir)
+        avl_data.save_json(json_path=case_dir / "avldata.json")
+        case_dirs.append(case_dir)
+
+    return case_dirs
+
+
+def run_processes(case_dirs: list[Path], xvfb: bool) -> None:
+    for case_dir in case_dirs:
+        with open(get_command_path(case_dir)) as stdin:
+            run_software(
+                software_name=SOFTWARE_NAME,
+                arguments=[""],
+                wkdir=case_dir,
+                stdin=stdin,
+                xvfb=xvfb,
+                timeout=300,
+            )
+
+
+def run_session(avl_path: Path, results_dir: Path, case_dirs: list[Path]) -> None:
+    session = AVLSession(avl_path, results_dir, xvfb=False)
+    session.start()
+    try:
+        for case_dir in case_dirs:
+            session.run_case(case_dir)
+    finally:
+        session.close()
+
+
+# Main
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--avl", type=Path, default=Path(MODULE_DIR, "tests", "aircraft.avl"))
+    parser.add_argument("--cases", type=int, default=20)
+    args = parser.parse_args()
+
+    # Command files without plot commands, as in batch runs
+    os.environ["CEASIOMPY_NO_GRAPHICS"] = "1"
+
+    avl_path = args.avl.resolve()
+    modes = {
+        "xvfb": lambda wkdir, cases: run_processes(cases, xvfb=True),
+        "no-graphics": lambda wkdir, cases: run_processes(cases, xvfb=False),
+        "session": lambda wkdir, cases: run_session(avl_path, wkdir, cases),
+    }
+
+    print(f"{'mode':<12} {'total [s]':>10} {'per case [ms]':>14}")
+    for mode, run in modes.items():
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wkdir = Path(tmpdir)
+            case_dirs = write_cases(avl_path, wkdir, args.cases)
+
+            start = time.perf_counter()
+            run(wkdir, case_dirs)
+            elapsed = time.perf_counter() - start
+
+            missing = [
+                case_dir.name for case_dir in case_dirs if not (case_dir / "st.txt").exists()
+            ]
+            if missing:
+                print(f"{mode}: no st.txt for {len(missing)} case(s), e.g. {missing[0]}")
+
+        print(f"{mode:<12} {elapsed:>10.2f} {1000 * elapsed / args.cases:>14.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark the point to marker lookup of the SU2 force extraction.
+
+Compares, on a synthetic surface mesh, the vectorised marker index of su2mesh.py
+(built from the mesh, then loaded from its cache) with the previous lookup
+in Python lists (quadratic: timed on a subset of the points and extrapolated).
+
+Usage:
+    python scripts/benchmark_marker_index.py [--markers 4] [--elems 100000]
+"""
+
+# Futures
+from __future__ import annotations
+
+# Imports
+import time
+import argparse
+import tempfile
+import numpy as np
+
+from ceasiompy.su2run.func.su2mesh import (
+    read_marker_nodes,
+    get_point_marker_index,
+)
+
+from pathlib import Path
+
+
+# Functions
+def write_surface_mesh(su2_mesh_path: Path, nb_markers: int, nb_elems: int) -> None:
+    rng = np.random.default_rng(0)
+    nb_points = nb_markers * nb_elems
+    with open(su2_mesh_path, "w") as f:
+        f.write(f"NDIME=3\nNPOIN={nb_points}\n")
+        np.savetxt(f, rng.random((nb_points, 3)), fmt="%.6f")
+        f.write(f"NMARK={nb_markers}\n")
+        for i in range(nb_markers):
+            offset = i * nb_elems
+            nodes = offset + rng.integers(0, nb_elems, (nb_elems, 3))
+            f.write(f"MARKER_TAG=Marker{i}\nMARKER_ELEMS={nb_elems}\n")
+            np.savetxt(f, np.column_stack([np.full(nb_elems, 5), nodes]), fmt="%d")
+
+
+def legacy_point_markers(marker_dict: dict, nb_points: int) -> list[str]:
+    mesh_marker = []
+    for i in range(nb_points):
+        for marker, ids_list in marker_dict.items():
+            if i in ids_list:
+                mesh_marker.append(marker)
+                break
+        else:
+            mesh_marker.append("")
+    return mesh_marker
+
+
+# Main
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--markers", type=int, default=4)
+    parser.add_argument("--elems", type=int, default=100_000)
+    parser.add_argument("--legacy-points", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        su2_mesh_path = Path(tmpdir, "mesh.su2")
+        write_surface_mesh(su2_mesh_path, args.markers, args.elems)
+
+        start = time.perf_counter()
+        marker_names, point_marker = get_point_marker_index(su2_mesh_path)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        get_point_marker_index(su2_mesh_path)
+        cached_time = time.perf_counter() - start
+
+        marker_dict = {
+            name: nodes.tolist() for name, nodes in read_marker_nodes(su2_mesh_path).items()
+        }
+        nb_legacy = min(args.legacy_points, len(point_marker))
+        start = time.perf_counter()
+        expected = legacy_point_markers(marker_dict, nb_legacy)
+        legacy_time = (time.perf_counter() - start) * len(point_marker) / nb_legacy
+
+    names = np.array(marker_names + [""], dtype=object)
+    same = list(names[point_marker[:nb_legacy]]) == expected
+
+    print(f"{'points':>8} {'index [s]':>10} {'cached [s]':>11} {'lists [s]':>10} {'same':>5}")
+    print(
+        f"{len(point_marker):>8} {index_time:>10.3f} {cached_time:>11.4f} "
+        f"{legacy_time:>10.1f} {str(same):>5}"
+    )
+
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
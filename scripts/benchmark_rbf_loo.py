@@ -0,0 +1,72 @@
+"""
+Benchmark the leave-one-out errors of SMTrain RBF models.
+
+Compares, on synthetic data, the brute-force LOO (one retraining per sample)
+with the closed-form LOO (one factorisation of the RBF system).
+
+Usage:
+    python scripts/benchmark_rbf_loo.py [--samples 100 200 400] [--dim 4]
+"""
+
+# Futures
+from __future__ import annotations
+
+# Imports
+import time
+import argparse
+import numpy as np
+
+from smt.surrogate_models import RBF
+from ceasiompy.smtrain.func.sampling import (
+    get_rbf_loo_residuals,
+    _get_brute_force_loo_residuals,
+)
+
+
+# Functions
+def synthetic_data(n_samples: int, dim: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-1.0, 1.0, size=(n_samples, dim))
+    y = np.sin(3.0 * x[:, :1]) + (x**2).sum(axis=1, keepdims=True)
+    return x, y
+
+
+# Main
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--dim", type=int, default=4)
+    parser.add_argument("--d0", type=float, default=1.0)
+    parser.add_argument("--reg", type=float, default=1e-10)
+    args = parser.parse_args()
+
+    print(f"{'samples':>8} {'brute [s]':>10} {'closed [s]':>11} {'speed-up':>9} {'max diff':>10}")
+    for n_samples in args.samples:
+        x, y = synthetic_data(n_samples, args.dim)
+        model = RBF(d0=args.d0, poly_degree=-1, reg=args.reg, print_global=False)
+        model.set_training_values(x, y)
+        model.train()
+
+        start = time.perf_counter()
+        brute = _get_brute_force_loo_residuals(model, x, y)
+        brute_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        closed = get_rbf_loo_residuals(model, x, y)
+        closed_time = time.perf_counter() - start
+
+        if closed is None:
+            print(f"{n_samples:>8} closed-form LOO not available for this model.")
+            continue
+
+        max_diff = float(np.max(np.abs(brute - closed)))
+        print(
+            f"{n_samples:>8} {brute_time:>10.3f} {closed_time:>11.3f} "
+            f"{brute_time / closed_time:>9.1f} {max_diff:>10.2e}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
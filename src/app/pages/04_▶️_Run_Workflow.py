@@ -26,6 +26,10 @@ from streamlitutils import (
 
 from pathlib import Path
 from ceasiompy.utils.workflowclasses import Workflow
+from ceasiompy.utils.jobqueue import (
+    JobQueue,
+    start_service,
+)
 from typing import (
     Final,
     Callable,
@@ -379,6 +383,56 @@ def terminate_solver_processes() -> None:
                 continue
 
 
+def _write_workflow_config() -> Path:
+    """Write the ceasiompy.cfg of the workflow of the session and return its path."""
+
+    st.session_state.workflow.modules_list = st.session_state.workflow_modules
+    st.session_state.workflow.optim_method = "None"
+    st.session_state.workflow.module_optim = ["NO"] * len(st.session_state.workflow.modules_list)
+    st.session_state.workflow.write_config_file()
+
+    return Path(st.session_state.workflow.working_dir, "ceasiompy.cfg")
+
+
+def _submit_workflow() -> None:
+    """Submit the workflow to the job queue, it runs without locking the page."""
+
+    job_queue = JobQueue()
+    # Plots are displayed in the Results page
+    job = job_queue.submit(
+        _write_workflow_config(),
+        submitter=os.environ.get("USER"),
+        graphics=True,
+    )
+    if start_service(db_path=job_queue.db_path):
+        st.info("The job queue service has been started.")
+    st.success(
+        f"Job {job.id} queued as {Path(job.workflow_dir).name}, "
+        "follow it in the Results page."
+    )
+
+
+def display_job_queue() -> None:
+    jobs = JobQueue().list_jobs(limit=10)
+    if not jobs:
+        return None
+
+    st.markdown("**Job queue**")
+    st.dataframe(
+        [
+            {
+                "Job": job.id,
+                "Workflow": Path(job.workflow_dir).name,
+                "Status": job.status,
+                "Submitted by": job.submitter or "",
+                "Detail": job.detail or "",
+            }
+            for job in jobs
+        ],
+        hide_index=True,
+    )
+
+
 def _run_workflow(
     on_progress: Callable[[list | None], None],
     spinner_slot,
@@ -387,13 +441,7 @@ def _run_workflow(
     st.session_state.workflow_run_failed = False
     st.session_state.workflow_has_completed = False
 
-    st.session_state.workflow.modules_list = st.session_state.workflow_modules
-    st.session_state.workflow.optim_method = "None"
-    st.session_state.workflow.module_optim = ["NO"] * len(st.session_state.workflow.modules_list)
-    st.session_state.workflow.write_config_file()
-
-    working_dir = Path(st.session_state.workflow.working_dir)
-    config_path = Path(working_dir, "ceasiompy.cfg")
+    config_path = _write_workflow_config()
 
     workflow = Workflow()
     workflow.from_config_file(config_path)
@@ -457,10 +505,22 @@ def workflow_runner() -> None:
         **_filter_supported_kwargs(st.button, width="stretch"),
     )
 
+    submit_clicked = st.button(
+        label="Submit to job queue",
+        help="Run the workflow in the background, other workflows can be submitted meanwhile",
+        type="primary",
+        **_filter_supported_kwargs(st.button, width="stretch"),
+    )
+
     spinner_slot = st.empty()
     status_placeholder = st.empty()
     on_progress = make_progress_callback(status_placeholder)
 
+    if submit_clicked:
+        _submit_workflow()
+        display_job_queue()
+        return None
+
     if run_clicked:
         st.session_state.workflow_status_list = []
         st.session_state.workflow_run_failed = False
@@ -471,6 +531,7 @@ def workflow_runner() -> None:
         return None
 
     on_progress(st.session_state.get("workflow_status_list"))
+    display_job_queue()
 
 
 def display_simulation_settings() -> None:
@@ -30,6 +30,11 @@ from time import perf_counter
 from functools import lru_cache
 from contextlib import contextmanager
 from ceasiompy.utils.plot import section_3d_view
+from ceasiompy.utils.profiling import PROFILE_NAME
+from ceasiompy.utils.jobqueue import (
+    ACTIVE_JOB_STATUS,
+    get_workflow_job,
+)
 from ceasiompy.utils.commonpaths import get_wkdir
 from SALib.sample.sobol import sample as sobol_sample
 from SALib.analyze.sobol import analyze as sobol_analyze
@@ -815,6 +820,98 @@ def _render_workflow_status_summary(status_map: dict[str, dict], results_name: l
     st.markdown("---")
 
 
+def _flatten_profile(span: dict, parent_id: str, rows: list[dict]) -> float:
+    """Append the spans of a profile tree to rows, return the icicle value of span."""
+
+    span_id = f"{parent_id}/{len(rows)}"
+    row = {
+        "id": span_id,
+        "parent": parent_id,
+        "name": str(span.get("name", "")),
+        "wall": float(span.get("wall", 0.0)),
+        "cpu": float(span.get("cpu", 0.0)),
+        "peak_rss_mb": span.get("peak_rss_mb"),
+    }
+    rows.append(row)
+
+    children_value = sum(
+        _flatten_profile(child, span_id, rows) for child in span.get("children", [])
+    )
+    # Concurrent children may last longer than their parent
+    row["value"] = max(row["wall"], children_value)
+
+    return row["value"]
+
+
+def _render_workflow_profile(workflow_dir: Path) -> None:
+    profile_path = Path(workflow_dir, PROFILE_NAME)
+    if not profile_path.exists():
+        return None
+    try:
+        profile = json.loads(profile_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    rows: list[dict] = []
+    _flatten_profile(profile, "", rows)
+
+    with st.expander("Performance profile", expanded=False):
+        fig = go.Figure(
+            go.Icicle(
+                ids=[row["id"] for row in rows],
+                labels=[row["name"] for row in rows],
+                parents=[row["parent"] for row in rows],
+                values=[row["value"] for row in rows],
+                branchvalues="total",
+                customdata=[
+                    [row["wall"], row["cpu"], row["peak_rss_mb"] or 0.0] for row in rows
+                ],
+                hovertemplate=(
+                    "<b>%{label}</b><br>wall %{customdata[0]:.2f} s"
+                    "<br>cpu %{customdata[1]:.2f} s"
+                    "<br>peak RSS %{customdata[2]:.0f} MB<extra></extra>"
+                ),
+                tiling={"orientation": "v"},
+            )
+        )
+        fig.update_layout(margin={"t": 10, "l": 0, "r": 0, "b": 0}, height=500)
+        st.plotly_chart(fig, width="stretch", key=f"{workflow_dir}_profile")
+
+        if len(rows) < 2:
+            return None
+
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "span": row["name"],
+                        "wall [s]": row["wall"],
+                        "cpu [s]": row["cpu"],
+                        "peak RSS [MB]": row["peak_rss_mb"],
+                    }
+                    for row in rows[1:]
+                ]
+            )
+            .sort_values("wall [s]", ascending=False)
+            .head(20),
+            hide_index=True,
+        )
+
+
+@st.fragment(run_every=2.0)
+def _follow_workflow_job(workflow_dir: Path, job_id: int) -> None:
+    """Display the status of a queued or running job until it ends."""
+
+    job = get_workflow_job(workflow_dir)
+    if job is None or job.status not in ACTIVE_JOB_STATUS:
+        # The job has ended: display its results
+        st.rerun()
+
+    st.info(f"Job {job_id} is {job.status}, its progress is updated every few seconds.")
+    status_map, modules_name = _load_workflow_status_map(workflow_dir)
+    _render_workflow_status_summary(status_map, modules_name)
+
+
 def show_results() -> None:
     """Display the results of the selected workflow."""
 
@@ -883,6 +980,11 @@ def show_results() -> None:
         except OSError as exc:
             st.warning(f"Unable to prepare workflow download: {exc}")
 
+    job = get_workflow_job(chosen_workflow)
+    if job is not None and job.status in ACTIVE_JOB_STATUS:
+        _follow_workflow_job(chosen_workflow, job.id)
+        return None
+
     results_dir = Path(chosen_workflow, "Results")
     if not results_dir.exists():
         st.warning("No results have been found for the selected workflow!")
@@ -902,6 +1004,7 @@ def show_results() -> None:
         return None
 
     _render_workflow_status_summary(status_map, results_name)
+    _render_workflow_profile(chosen_workflow)
 
     _display_xml(
         path=Path(chosen_workflow, "selected_cpacs.xml"),
@@ -1938,34 +2041,8 @@ def _display_txt(path: Path) -> None:
 
 @st.cache_resource(show_spinner=False)
 def _load_su2_mesh_cached(path_str: str, mtime_ns: int) -> pv.DataSet:
-    _ = mtime_ns  # cache invalidation key
-    path = Path(path_str)
-    temp_file_path: str | None = None
-    try:
-        marker_map: dict[str, int] = {}
-        with path.open() as handle:
-            temp_file = tempfile.NamedTemporaryFile(
-                mode="w",
-                delete=False,
-                suffix=".su2",
-            )
-            with temp_file as temp:
-                for line in handle:
-                    if line.startswith("MARKER_TAG="):
-                        tag = line.split("=", 1)[1].strip()
-                        marker_map.setdefault(tag, len(marker_map) + 1)
-                        line = f"MARKER_TAG= {marker_map[tag]}\n"
-                    temp.write(line)
-            temp_file_path = temp_file.name
-        if temp_file_path is None:
-            raise RuntimeError("Temporary SU2 file was not created.")
-        return pv.read(temp_file_path)
-    finally:
-        if temp_file_path is not None:
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass
+    # Reuse the (cached) meshio parse instead of re-reading the SU2 text file.
+    return pv.from_meshio(_load_su2_meshio_cached(path_str, mtime_ns))
 
 
 @st.cache_resource(show_spinner=False)
@@ -340,8 +340,115 @@ def main() -> None:
         help="Select maximum number of authorized CPUs.",
     )
 
+    # Headless batch of workflows
+    parser.add_argument(
+        "--cfg",
+        type=Path,
+        required=False,
+        help=(
+            "Run the workflow of a configuration file (ceasiompy.cfg) without GUI,\n"
+            "on each CPACS file of --batch and each variant of --parameters.\n"
+            "\n"
+            "Examples:\n"
+            "  ceasiompy_run --cfg ceasiompy.cfg --batch path/to/cpacs_dir\n"
+            "  ceasiompy_run --cfg ceasiompy.cfg --batch a.xml b.xml --parameters table.csv\n"
+            "\n"
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="",
+        type=Path,
+        default=None,
+        required=False,
+        help="CPACS files or directories of CPACS files to run with --cfg.",
+    )
+    parser.add_argument(
+        "--parameters",
+        type=Path,
+        required=False,
+        help="CSV table of CPACS variants (one column per xpath, one row per variant).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        help="Number of workflows of the batch run concurrently (sharing --cpus).",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        required=False,
+        help="Aeromap results of the batch (.csv or .parquet).",
+    )
+
+    # Local job queue of workflows
+    parser.add_argument(
+        "--submit",
+        type=Path,
+        required=False,
+        help=(
+            "Submit the workflow of a configuration file (ceasiompy.cfg) to the job queue.\n"
+            "\n"
+            "Examples:\n"
+            "  ceasiompy_run --submit path/to/ceasiompy.cfg\n"
+            "\n"
+        ),
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        nargs="?",
+        const=1,
+        metavar="WORKERS",
+        required=False,
+        help="Run the job queue service with WORKERS concurrent workflows (sharing --cpus).",
+    )
+    parser.add_argument(
+        "--jobs",
+        action="store_true",
+        required=False,
+        help="List the last jobs of the job queue.",
+    )
+
     args: Namespace = parser.parse_args()
 
+    if args.submit is not None or args.serve is not None or args.jobs:
+        # Imported here, launching the GUI does not need it
+        from ceasiompy.utils.jobqueue import (
+            JobQueue,
+            serve,
+        )
+
+        if args.submit is not None:
+            job = JobQueue().submit(args.submit, submitter=os.environ.get("USER"))
+            print(f"Job {job.id} queued in {job.workflow_dir}.")
+        if args.jobs:
+            for job in JobQueue().list_jobs():
+                print(f"{job.id:>5}  {job.status:<10} {job.workflow_dir}  {job.detail or ''}")
+        if args.serve is not None:
+            serve(nb_workers=args.serve, nb_cpus=int(args.cpus))
+        return None
+
+    if args.cfg is None and (args.batch or args.parameters):
+        parser.error("--batch and --parameters require a workflow configuration file (--cfg).")
+
+    if args.cfg is not None:
+        # Imported here, launching the GUI does not need it
+        from ceasiompy.utils.batchrunner import run_batch
+
+        run_batch(
+            cfg_path=args.cfg,
+            inputs=args.batch,
+            parameter_table=args.parameters,
+            wkdir=args.wkdir,
+            nb_cpus=int(args.cpus),
+            nb_workers=args.workers,
+            results_path=args.results,
+        )
+        return None
+
     port = int(args.port) if args.port is not None else None
     wkdir = Path(args.wkdir) if args.wkdir is not None else None
     geometry_path = (
@@ -73,5 +73,6 @@ GMSH_GROWTH_FACTOR_XPATH = GMSH_XPATH + "/growth_factor"
 GMSH_GROWTH_RATIO_XPATH = GMSH_XPATH + "/growth_ratio"
 GMSH_FEATURE_ANGLE_XPATH = GMSH_XPATH + "/feature_angle"
 GMSH_CTRLSURF_ANGLE_XPATH = GMSH_XPATH + "/DeflectionAngle"
+GMSH_CTRLSURF_WORKERS_XPATH = GMSH_XPATH + "/DeflectionWorkers"
 GMSH_SAVE_CGNS_XPATH = GMSH_XPATH + "/SaveCGNS"
 GMSH_MESH_CHECKER_XPATH = GMSH_XPATH + "/MeshChecker"
@@ -36,6 +36,7 @@ from ceasiompy.CPACSTOGMSH import (
     GMSH_MESH_SIZE_FUSELAGE_XPATH,
     GMSH_MESH_SIZE_ENGINES_XPATH,
     GMSH_CTRLSURF_ANGLE_XPATH,
+    GMSH_CTRLSURF_WORKERS_XPATH,
     GMSH_MESH_SIZE_PROPELLERS_XPATH,
     GMSH_N_POWER_FACTOR_XPATH,
     GMSH_N_POWER_FIELD_XPATH,
@@ -416,3 +417,15 @@ def gui_settings(cpacs: CPACS) -> None:
             xpath=GMSH_CTRLSURF_ANGLE_XPATH,
             help="List of Aileron, Elevator, Rudder angles.",
         )
+
+        int_vartype(
+            tixi=tixi,
+            xpath=GMSH_CTRLSURF_WORKERS_XPATH,
+            default_value=0,
+            min_value=0,
+            name="Parallel deflection meshes",
+            key="ctrl_surf_workers",
+            help="""Number of deflected geometries meshed concurrently
+                (Euler meshes only). 0 uses all the available CPUs.
+            """,
+        )
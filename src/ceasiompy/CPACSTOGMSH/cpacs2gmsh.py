@@ -6,10 +6,19 @@ Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
 
 # Imports
 
+import queue
 import signal
 import threading
+import multiprocessing
 
-from ceasiompy.utils.ceasiompyutils import call_main
+from ceasiompy.utils.ceasiompyutils import (
+    call_main,
+    get_sane_max_cpu,
+)
+from ceasiompy.utils.cpugovernor import (
+    cpu_lease,
+    init_worker_lease,
+)
 from ceasiompy.utils.geometryfunctions import return_uidwings
 from ceasiompy.CPACSTOGMSH.func.exportbrep import export_brep
 from ceasiompy.CPACSTOGMSH.func.meshvis import cgns_mesh_checker
@@ -22,6 +31,7 @@ from ceasiompy.CPACSTOGMSH.func.rans_mesh_generator import (
 from cpacspy.cpacsfunctions import (
     get_value,
     create_branch,
+    get_value_or_default,
 )
 from ceasiompy.CPACSTOGMSH.func.utils import (
     retrieve_rans_gui_values,
@@ -32,6 +42,11 @@ from ceasiompy.CPACSTOGMSH.func.utils import (
 from pathlib import Path
 from typing import Callable
 from cpacspy.cpacspy import CPACS
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
 
 from ceasiompy import log
 from ceasiompy.utils.commonxpaths import (
@@ -41,7 +56,11 @@ from ceasiompy.utils.commonxpaths import (
 from ceasiompy.CPACSTOGMSH import (
     MODULE_NAME,
     CONTROL_SURFACES_LIST,
+    GMSH_MESH_TYPE_XPATH,
+    GMSH_SAVE_CGNS_XPATH,
+    GMSH_OPEN_GUI_XPATH,
     GMSH_CTRLSURF_ANGLE_XPATH,
+    GMSH_CTRLSURF_WORKERS_XPATH,
 )
 
 # =================================================================================================
@@ -370,6 +389,122 @@ def deform_surf(
     )
 
 
+def _run_deflection_job(
+    cpacs_file: str,
+    wkdir: Path,
+    surf: str,
+    angle: float,
+    wing_names: list,
+    job_index: int,
+    progress_queue,
+) -> None:
+    """
+    Run deform_surf in a worker process and report its progress
+    as (job_index, progress, detail) into progress_queue.
+    """
+
+    def _queue_progress(detail: str | None = None, progress: float | None = None) -> None:
+        progress_queue.put((job_index, progress, detail))
+
+    deform_surf(
+        CPACS(cpacs_file),
+        wkdir,
+        surf,
+        angle,
+        wing_names,
+        progress_callback=_queue_progress,
+    )
+
+
+def run_deflections(
+    cpacs: CPACS,
+    wkdir: Path,
+    deflections: list[tuple[str, float]],
+    wing_names: list,
+    nb_workers: int,
+    *,
+    progress_callback: Callable[..., None] | None = None,
+) -> None:
+    """
+    Mesh the deflected geometries concurrently, one process per (surface, angle)
+    with its own brep_files_{surf}_{angle} directory (gmsh state is per process).
+
+    Args:
+        cpacs (CPACS): CPACS file to deform.
+        wkdir (Path): Results directory.
+        deflections (list): (control surface, deflection angle) to mesh.
+        wing_names (list): Wings of aircraft.
+        nb_workers (int): Number of meshing processes.
+
+    """
+
+    nb_jobs = len(deflections)
+    job_progress = [0.0] * nb_jobs
+    completed = 0
+
+    # Spawn fresh interpreters: forking a process with an initialized gmsh is unsafe.
+    mp_context = multiprocessing.get_context("spawn")
+    with cpu_lease(nb_workers) as nb_workers, mp_context.Manager() as manager:
+        progress_queue = manager.Queue()
+        # One CPU per worker, the meshing of a worker draws from it (see cpugovernor.py)
+        with ProcessPoolExecutor(
+            max_workers=nb_workers,
+            mp_context=mp_context,
+            initializer=init_worker_lease,
+            initargs=(1,),
+        ) as executor:
+            future_to_job = {
+                executor.submit(
+                    _run_deflection_job,
+                    str(cpacs.cpacs_file),
+                    wkdir,
+                    surf,
+                    angle,
+                    wing_names,
+                    job_index,
+                    progress_queue,
+                ): job_index
+                for job_index, (surf, angle) in enumerate(deflections)
+            }
+            log.info(f"Meshing {nb_jobs} deflected geometries with {nb_workers} processes.")
+
+            pending = set(future_to_job)
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                detail = None
+                while True:
+                    try:
+                        job_index, progress, job_detail = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if progress is not None:
+                        job_progress[job_index] = max(job_progress[job_index], progress)
+                    if job_detail:
+                        surf, angle = deflections[job_index]
+                        detail = f"{surf} {angle} deg: {job_detail}"
+
+                for future in done:
+                    job_index = future_to_job[future]
+                    surf, angle = deflections[job_index]
+                    try:
+                        future.result()
+                    except Exception:
+                        log.error(f"Meshing with {surf} deflection {angle} deg failed.")
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    job_progress[job_index] = 1.0
+                    completed += 1
+                    log.info(f"Mesh with {surf} deflection {angle} deg completed.")
+
+                _progress_update(
+                    progress_callback,
+                    detail=detail or f"{completed}/{nb_jobs} deflected meshes completed.",
+                    progress=sum(job_progress) / nb_jobs,
+                )
+
+
 def main(
     cpacs: CPACS,
     results_dir: Path,
@@ -408,25 +543,31 @@ def main(
 
     log.info(f"list of deflection angles {angles_list}.")
 
-    # Compute number of runs to keep progress monotonic.
+    # Baseline mesh (no deflection) and deflected geometries to mesh.
     wing_names = return_uidwings(tixi)
-    total_runs = 0
-    if angles_list:
-        for angle in angles_list:
-            if angle == 0.0:
-                total_runs += 1
-                continue
-            total_runs += sum(
-                1 for surf in CONTROL_SURFACES_LIST
-                if any(surf in wing for wing in wing_names)
-            )
-    else:
-        total_runs = 1
-    total_runs = max(total_runs, 1)
+    run_baseline = not angles_list or 0.0 in angles_list
+    deflections = []
+    for angle in reversed(angles_list):
+        if angle == 0.0:
+            continue
+
+        # Flap deformation has no utily in stability derivatives
+        for surf in CONTROL_SURFACES_LIST:
+            # Check if control surface exists through name of wings
+            if not any(surf in wing for wing in wing_names):
+                log.warning(
+                    f"No control surface {surf}. "
+                    f"It can not be deflected by angle {angle}."
+                )
+            else:
+                deflections.append((surf, angle))
+
+    # Compute number of runs to keep progress monotonic.
+    total_runs = max(int(run_baseline) + len(deflections), 1)
 
-    def _run_with_progress(run_index: int, fn: Callable[..., None]) -> None:
+    def _run_with_progress(run_index: int, fn: Callable[..., None], nb_runs: int = 1) -> None:
         offset = run_index / total_runs
-        span = 1.0 / total_runs
+        span = nb_runs / total_runs
 
         def _wrapped_progress(**kwargs):
             progress = kwargs.pop("progress", None)
@@ -436,60 +577,67 @@ def main(
 
         fn(progress_callback=_wrapped_progress)
 
-    # Check if angles_list is empty
-    if not angles_list:
-        # No specified angles: run as usual
+    run_index = 0
+    if run_baseline:
+        # No deformation for angle 0
         _progress_update(
             progress_callback,
             detail="Meshing baseline (no deflection)...",
         )
         _run_with_progress(
-            0,
+            run_index,
             lambda **kwargs: run_cpacs2gmsh(cpacs, results_dir, **kwargs),
         )
+        run_index += 1
+
+    if not deflections:
         return None
 
-    run_index = 0
-    for angle in reversed(angles_list):
-        if angle == 0.0:
-            # No deformation for angle 0
-            _progress_update(
-                progress_callback,
-                detail="Meshing baseline (no deflection)...",
-            )
-            _run_with_progress(
-                run_index,
-                lambda **kwargs: run_cpacs2gmsh(cpacs, results_dir, **kwargs),
-            )
-            run_index += 1
-            continue
+    # Only Euler meshes write all their files under deflection-specific names.
+    nb_workers = int(get_value_or_default(tixi, GMSH_CTRLSURF_WORKERS_XPATH, 0))
+    if nb_workers < 1:
+        nb_workers = get_sane_max_cpu()
+    nb_workers = min(nb_workers, len(deflections))
+    parallel = (
+        nb_workers > 1
+        and get_value(tixi, GMSH_MESH_TYPE_XPATH) == "EULER"
+        and not get_value_or_default(tixi, GMSH_SAVE_CGNS_XPATH, False)
+        and not get_value_or_default(tixi, GMSH_OPEN_GUI_XPATH, False)
+    )
 
-        # Flap deformation has no utily in stability derivatives
-        for surf in CONTROL_SURFACES_LIST:
-            # Check if control surface exists through name of wings
-            if not any(surf in wing for wing in wing_names):
-                log.warning(
-                    f"No control surface {surf}. "
-                    f"It can not be deflected by angle {angle}."
-                )
-            else:
-                # If control Surface exists, deform the correct wings
-                _progress_update(
-                    progress_callback,
-                    detail=f"Meshing with {surf} deflection {angle} deg...",
-                )
-                _run_with_progress(
-                    run_index,
-                    lambda **kwargs: deform_surf(
-                        cpacs,
-                        results_dir,
-                        surf,
-                        angle,
-                        wing_names,
-                        **kwargs,
-                    ),
-                )
-                run_index += 1
+    if parallel:
+        _run_with_progress(
+            run_index,
+            lambda **kwargs: run_deflections(
+                cpacs,
+                results_dir,
+                deflections,
+                wing_names,
+                nb_workers,
+                **kwargs,
+            ),
+            nb_runs=len(deflections),
+        )
+        return None
+
+    for surf, angle in deflections:
+        # If control Surface exists, deform the correct wings
+        _progress_update(
+            progress_callback,
+            detail=f"Meshing with {surf} deflection {angle} deg...",
+        )
+        _run_with_progress(
+            run_index,
+            lambda **kwargs: deform_surf(
+                cpacs,
+                results_dir,
+                surf,
+                angle,
+                wing_names,
+                **kwargs,
+            ),
+        )
+        run_index += 1
 
 
 # Main
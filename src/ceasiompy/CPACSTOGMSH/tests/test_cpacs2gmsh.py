@@ -0,0 +1,156 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for the meshing of the deflected geometries in 'CPACSTOGMSH/cpacs2gmsh.py'
+"""
+
+# Imports
+
+import os
+import pytest
+
+from ceasiompy.CPACSTOGMSH import cpacs2gmsh
+from ceasiompy.CPACSTOGMSH.cpacs2gmsh import run_deflections
+
+from pathlib import Path
+from types import SimpleNamespace
+
+from ceasiompy.utils.commonxpaths import GEOMETRY_MODE_XPATH
+from ceasiompy.CPACSTOGMSH import (
+    GMSH_MESH_TYPE_XPATH,
+    GMSH_SAVE_CGNS_XPATH,
+    GMSH_OPEN_GUI_XPATH,
+    GMSH_CTRLSURF_ANGLE_XPATH,
+    GMSH_CTRLSURF_WORKERS_XPATH,
+)
+
+WING_NAMES = ["Wing", "left_aileron", "right_aileron", "left_flap", "right_flap"]
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _fake_deflection_job(cpacs_file, wkdir, surf, angle, wing_names, job_index, progress_queue):
+    """Stand-in for _run_deflection_job, run in the worker processes."""
+
+    if surf == "fail":
+        raise RuntimeError("Meshing failed.")
+    progress_queue.put((job_index, 0.5, "2D mesh"))
+    Path(wkdir, f"mesh_{surf}_{angle}.su2").write_text(str(os.getpid()))
+
+
+@pytest.fixture
+def gmsh_settings(monkeypatch):
+    """Settings of CPACS2GMSH, and the meshes run by main (mesh functions are stubbed)."""
+
+    settings = {
+        GEOMETRY_MODE_XPATH: "3D",
+        GMSH_CTRLSURF_ANGLE_XPATH: "0;5;-5;5",
+        GMSH_CTRLSURF_WORKERS_XPATH: 0,
+        GMSH_MESH_TYPE_XPATH: "EULER",
+        GMSH_SAVE_CGNS_XPATH: False,
+        GMSH_OPEN_GUI_XPATH: False,
+    }
+    runs = []
+
+    def _get_value(tixi, xpath, default=None):
+        return settings.get(xpath, default)
+
+    monkeypatch.setattr(cpacs2gmsh, "get_value", _get_value)
+    monkeypatch.setattr(cpacs2gmsh, "get_value_or_default", _get_value)
+    monkeypatch.setattr(cpacs2gmsh, "get_sane_max_cpu", lambda: 8)
+    monkeypatch.setattr(cpacs2gmsh, "return_uidwings", lambda tixi: WING_NAMES)
+    monkeypatch.setattr(
+        cpacs2gmsh,
+        "run_cpacs2gmsh",
+        lambda cpacs, wkdir, **kwargs: runs.append("baseline"),
+    )
+    monkeypatch.setattr(
+        cpacs2gmsh,
+        "deform_surf",
+        lambda cpacs, wkdir, surf, angle, wing_names, **kwargs: runs.append((surf, angle)),
+    )
+    monkeypatch.setattr(
+        cpacs2gmsh,
+        "run_deflections",
+        lambda cpacs, wkdir, deflections, wing_names, nb_workers, **kwargs: runs.append(
+            (nb_workers, sorted(deflections))
+        ),
+    )
+
+    return settings, runs
+
+
+def _run_main(tmp_path: Path) -> None:
+    tixi = SimpleNamespace(getTextElement=lambda xpath: "3D")
+    cpacs2gmsh.main(SimpleNamespace(tixi=tixi), tmp_path)
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_deflections_in_parallel(gmsh_settings, tmp_path):
+
+    settings, runs = gmsh_settings
+
+    # Unique non zero angles, for the control surfaces of the wings (no rudder)
+    _run_main(tmp_path)
+    deflections = [("aileron", -5.0), ("aileron", 5.0), ("flap", -5.0), ("flap", 5.0)]
+    assert runs == ["baseline", (4, deflections)]
+
+    # Workers set in the GUI, at most one per deflection
+    runs.clear()
+    settings[GMSH_CTRLSURF_WORKERS_XPATH] = 3
+    settings[GMSH_CTRLSURF_ANGLE_XPATH] = "5"
+    _run_main(tmp_path)
+    assert runs == [(2, [("aileron", 5.0), ("flap", 5.0)])]
+
+
+@pytest.mark.parametrize("setting", [
+    {GMSH_MESH_TYPE_XPATH: "RANS"},
+    {GMSH_SAVE_CGNS_XPATH: True},
+    {GMSH_OPEN_GUI_XPATH: True},
+    {GMSH_CTRLSURF_WORKERS_XPATH: 1},
+])
+def test_deflections_in_serial(gmsh_settings, tmp_path, setting):
+
+    settings, runs = gmsh_settings
+    settings.update(setting)
+    settings[GMSH_CTRLSURF_ANGLE_XPATH] = "5;-5"
+
+    _run_main(tmp_path)
+    assert sorted(runs) == [("aileron", -5.0), ("aileron", 5.0), ("flap", -5.0), ("flap", 5.0)]
+
+
+def test_run_deflections(monkeypatch, tmp_path):
+
+    monkeypatch.setattr(cpacs2gmsh, "_run_deflection_job", _fake_deflection_job)
+    cpacs = SimpleNamespace(cpacs_file=Path(tmp_path, "aircraft.xml"))
+    deflections = [("aileron", 5.0), ("aileron", -5.0), ("flap", 5.0)]
+
+    progresses = []
+    run_deflections(
+        cpacs,
+        tmp_path,
+        deflections,
+        WING_NAMES,
+        nb_workers=2,
+        progress_callback=lambda detail, progress: progresses.append(progress),
+    )
+
+    # One mesh per deflection, in at most two processes
+    pids = {
+        Path(tmp_path, f"mesh_{surf}_{angle}.su2").read_text() for surf, angle in deflections
+    }
+    assert 1 <= len(pids) <= 2
+    assert str(os.getpid()) not in pids
+    assert progresses == sorted(progresses) and progresses[-1] == 1.0
+
+    # The failure of a deflection is raised
+    with pytest.raises(RuntimeError, match="Meshing failed"):
+        run_deflections(cpacs, tmp_path, [("fail", 5.0)] + deflections, WING_NAMES, 2)
@@ -12,19 +12,18 @@ import builtins
 
 from pathlib import Path
 from logging import Logger
+from typing import TYPE_CHECKING
 
-from pydantic import (
-    BaseModel,
-    ConfigDict,
-)
-
-# Imports
-
-from streamlit.elements.lib.layout_utils import Gap
+# pydantic and streamlit are slow to import: only import them when needed
+if TYPE_CHECKING:
+    from streamlit.elements.lib.layout_utils import Gap
 
 # Constants
 
-MAIN_GAP: Gap = "xlarge"
+MAIN_GAP: "Gap" = "xlarge"
+
+# Config of CustomConfig (a pydantic ConfigDict, which is a plain dict)
+ceasiompy_cfg = {"arbitrary_types_allowed": True}
 
 # /CEASIOMpy/src
 SRC_PATH = Path(__file__).parents[1]
@@ -53,11 +52,22 @@ class IgnoreSpecificError(logging.Filter):
         return not any(error in record.getMessage() for error in ignore_errors)
 
 
-class CustomConfig(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+# Functions
 
+def __getattr__(name: str):
+    """Define CustomConfig (and import pydantic) on first access."""
+
+    if name != "CustomConfig":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from pydantic import BaseModel
+
+    class CustomConfig(BaseModel):
+        model_config = ceasiompy_cfg
+
+    globals()[name] = CustomConfig
+    return CustomConfig
 
-# Functions
 
 def get_logger() -> Logger:
     """
@@ -106,6 +116,3 @@ def custom_print(*args, **kwargs):
 
 builtins.print = custom_print
 
-
-# Ignore arbitrary types
-ceasiompy_cfg = CustomConfig.model_config
@@ -12,7 +12,16 @@ from ceasiompy.utils import get_module_status
 
 from pathlib import Path
 
-from ceasiompy.utils.commonxpaths import MESH_XPATH
+from ceasiompy.utils.commonxpaths import (
+    MESH_XPATH,
+    WINGS_XPATH,
+    PYLONS_XPATH,
+    ENGINES_XPATH,
+    SU2MESH_XPATH,
+    FUSELAGES_XPATH,
+    AIRFOILS_XPATH,
+    GEOMETRY_MODE_XPATH,
+)
 
 # ==============================================================================
 #   INITIALIZATION
@@ -36,6 +45,18 @@ RES_DIR = True
 MODULE_DIR = Path(__file__).parent
 MODULE_NAME = MODULE_DIR.name
 
+# ===== CPACS xpaths read and written (workflow dependency graph) =====
+CPACS_INPUTS = (
+    WINGS_XPATH,
+    FUSELAGES_XPATH,
+    PYLONS_XPATH,
+    ENGINES_XPATH,
+    AIRFOILS_XPATH,
+    GEOMETRY_MODE_XPATH,
+    MESH_XPATH,
+)
+CPACS_OUTPUTS = (SU2MESH_XPATH,)
+
 
 # Specific to CPACS2Gmsh module
 CONTROL_SURFACES_LIST = ["aileron", "rudder", "flap"]
@@ -48,6 +69,8 @@ GMSH_XZ_SYMMETRY_XPATH = GMSH_XPATH + "/xz_symmetry"
 GMSH_N_POWER_FACTOR_XPATH = GMSH_XPATH + "/n_power_factor"
 GMSH_N_POWER_FIELD_XPATH = GMSH_XPATH + "/n_power_field"
 GMSH_ADD_BOUNDARY_LAYER_XPATH = GMSH_XPATH + "/add_boundary_layer"
+GMSH_TETGEN_RACE_XPATH = GMSH_XPATH + "/tetgen_race"
+GMSH_MESH_CACHE_XPATH = GMSH_XPATH + "/use_mesh_cache"
 
 GMSH_MESH_SIZE_FUSELAGE_XPATH = GMSH_XPATH + "/mesh_size/fuselage"
 GMSH_MESH_SIZE_PYLON_XPATH = GMSH_XPATH + "/mesh_size/pylon"
@@ -41,6 +41,8 @@ from ceasiompy.cpacs2gmsh import (
     HAS_PENTAGROW,
     GMSH_XZ_SYMMETRY_XPATH,
     GMSH_ADD_BOUNDARY_LAYER_XPATH,
+    GMSH_TETGEN_RACE_XPATH,
+    GMSH_MESH_CACHE_XPATH,
     GMSH_MESH_SIZE_FARFIELD_XPATH,
     GMSH_MESH_SIZE_WING_XPATH,
     GMSH_MESH_SIZE_FUSELAGE_XPATH,
@@ -473,6 +475,28 @@ def gui_settings(cpacs: CPACS) -> None:
             help="Enable the refinement of truncated trailing edge.",
         )
 
+        bool_vartype(
+            tixi=tixi,
+            xpath=GMSH_TETGEN_RACE_XPATH,
+            default_value=False,
+            name="Race TetGen profiles",
+            key="tetgen_race",
+            help="""Run the TetGen refinement profiles and switch sets
+                concurrently and keep the most refined one that succeeds.
+            """,
+        )
+
+        bool_vartype(
+            tixi=tixi,
+            xpath=GMSH_MESH_CACHE_XPATH,
+            default_value=True,
+            name="Use mesh cache",
+            key="use_mesh_cache",
+            help="""Reuse the mesh of a previous run when the geometry
+                and all the mesh settings are identical.
+            """,
+        )
+
     # engines_config = aircraft_config.get_engines()
     # if engines_config:
     #     with st.expander(
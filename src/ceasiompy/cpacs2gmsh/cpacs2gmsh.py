@@ -13,6 +13,11 @@ from ceasiompy.utils.ceasiompyutils import call_main
 from ceasiompy.utils.progress import progress_update
 from ceasiompy.cpacs2gmsh.meshing.eulermesh import euler_mesh
 from ceasiompy.cpacs2gmsh.utility.exportbrep import export_brep
+from ceasiompy.cpacs2gmsh.utility.meshcache import (
+    store_mesh,
+    load_cached_mesh,
+    get_mesh_cache_key,
+)
 from ceasiompy.cpacs2gmsh.meshing.generate2dmesh import (
     generate_surface_mesh,
 )
@@ -25,9 +30,13 @@ from ceasiompy.cpacs2gmsh.utility.utils import (
 from pathlib import Path
 from typing import Callable
 from cpacspy.cpacspy import CPACS
+from cpacspy.cpacsfunctions import get_value_or_default
 
 from ceasiompy import log
-from ceasiompy.cpacs2gmsh import MODULE_NAME
+from ceasiompy.cpacs2gmsh import (
+    MODULE_NAME,
+    GMSH_MESH_CACHE_XPATH,
+)
 from ceasiompy.utils.commonxpaths import SU2MESH_XPATH
 from ceasiompy.utils.commonxpaths import GEOMETRY_MODE_XPATH
 
@@ -105,6 +114,26 @@ def main(
         mesh_settings = get_2d_mesh_settings(cpacs)
         farfield_settings = get_farfield_settings(tixi)
 
+        cache_key = None
+        if get_value_or_default(tixi, GMSH_MESH_CACHE_XPATH, True):
+            cache_key = get_mesh_cache_key(cpacs, mesh_settings, farfield_settings)
+            if load_cached_mesh(cache_key, results_dir) is not None:
+                su2mesh_path = Path(results_dir, "mesh.su2")
+                add_value(
+                    tixi=tixi,
+                    xpath=SU2MESH_XPATH,
+                    value=str(su2mesh_path),
+                )
+                log.info(f"{su2mesh_path=} has been loaded from the mesh cache.")
+                progress_update(
+                    progress_callback,
+                    detail="Mesh loaded from cache.",
+                    progress=1.0,
+                )
+                return None
+
+        existing_files = set(results_dir.iterdir())
+
         # Create corresponding brep directory.
         progress_update(
             progress_callback,
@@ -183,6 +212,16 @@ def main(
 
         log.info(f"{su2mesh_path=} has been correctly generated.")
 
+        if cache_key is not None:
+            store_mesh(
+                cache_key,
+                files=sorted(
+                    file
+                    for file in results_dir.iterdir()
+                    if file.is_file() and file not in existing_files
+                ),
+            )
+
         progress_update(
             progress_callback,
             detail="Mesh generation finished.",
@@ -10,14 +10,34 @@ Euler volume meshing from a staged surface mesh using TetGen.
 from __future__ import annotations
 
 # Imports
+import os
+import json
 import meshio
+import multiprocessing
+import hashlib
 import tetgen
 import numpy as np
 
 from pathlib import Path
 from numpy import ndarray
+from typing import Iterator
 from scipy.spatial import KDTree
-from collections import defaultdict
+from multiprocessing.connection import (
+    Connection,
+    wait,
+)
+from multiprocessing.process import BaseProcess
+from ceasiompy.utils.commonpaths import get_wkdir
+from ceasiompy.utils.ceasiompyutils import get_sane_max_cpu
+from ceasiompy.utils.cpugovernor import cpu_lease
+from ceasiompy.utils.profiling import (
+    profiled,
+    profile_span,
+)
+from ceasiompy.cpacs2gmsh.utility.su2writer import (
+    SU2MeshWriter,
+    write_su2_mesh,
+)
 from ceasiompy.cpacs2gmsh.utility.utils import (
     MeshSettings,
     FarfieldSettings,
@@ -40,6 +60,7 @@ BOUNDARY_QUALITY_SWITCHES = (
     "pQ",
 )
 ROBUST_SWITCH = "pQY"
+BOUNDARY_ONLY_PROFILE = {"name": "boundary_only"}
 REFINEMENT_PROFILES = (
     {
         "name": "ultra_wall_dense",
@@ -73,6 +94,11 @@ REFINEMENT_PROFILES = (
     },
 )
 
+# Winner of the TetGen candidates, in the results directory
+TETGEN_PROFILE_NAME = "tetgen_profile.json"
+# Winners of previous runs by surface mesh hash, in the working directory
+TETGEN_HISTORY_NAME = ".tetgen_profiles.json"
+
 
 # Methods
 
@@ -85,6 +111,7 @@ def _coord_key(point: ndarray) -> tuple[float, float, float]:
     )
 
 
+@profiled
 def _load_surface_triangles(
     surface_mesh_path: Path,
 ) -> tuple[ndarray, ndarray, ndarray | None, dict[int, str]]:
@@ -137,36 +164,20 @@ def _write_su2(
     output_su2_path: Path,
     tet_points: ndarray,
     tet_elements: ndarray,
-    marker_tris: dict[str, list[tuple[int, int, int]]],
-) -> None:
-    """Write an SU2 mesh from tetrahedra and boundary triangles."""
-    with open(output_su2_path, "w", encoding="utf-8") as f:
-        f.write("NDIME=3\n")
-        f.write(f"NELEM={len(tet_elements)}\n")
-        for tet_cell in tet_elements:
-            f.write(
-                "10 "
-                f"{int(tet_cell[0])} {int(tet_cell[1])} "
-                f"{int(tet_cell[2])} {int(tet_cell[3])}\n"
-            )
+    marker_tris: dict[str, ndarray],
+    background: bool = False,
+) -> SU2MeshWriter | None:
+    """Write an SU2 mesh from tetrahedra and boundary triangles.
 
-        # SU2 expects points/elements to be listed before marker sections.
-        f.write(f"NPOIN={len(tet_points)}\n")
-        for idx, point in enumerate(tet_points):
-            f.write(
-                f"{float(point[0]):.16e} "
-                f"{float(point[1]):.16e} "
-                f"{float(point[2]):.16e} {idx}\n"
-            )
+    With background=True the file is written in a thread which is returned (to join).
+    """
+    if background:
+        writer = SU2MeshWriter(output_su2_path, tet_points, tet_elements, marker_tris)
+        writer.start()
+        return writer
 
-        marker_names = sorted(name for name, tris in marker_tris.items() if tris)
-        f.write(f"NMARK={len(marker_names)}\n")
-        for marker_name in marker_names:
-            tris = marker_tris[marker_name]
-            f.write(f"MARKER_TAG={marker_name}\n")
-            f.write(f"MARKER_ELEMS={len(tris)}\n")
-            for a, b, c in tris:
-                f.write(f"5 {a} {b} {c}\n")
+    write_su2_mesh(output_su2_path, tet_points, tet_elements, marker_tris)
+    return None
 
 
 def _write_cgns(
@@ -186,22 +197,20 @@ def _write_cgns(
     )
 
 
+@profiled
 def _write_vtu(
     output_vtu_path: Path,
     tet_points: ndarray,
     tet_elements: ndarray,
-    marker_tris: dict[str, list[tuple[int, int, int]]] | None = None,
+    marker_tris: dict[str, ndarray] | None = None,
 ) -> None:
     """Write VTU with tetra volume and optional boundary triangles."""
     cells: list[tuple[str, ndarray]] = [("tetra", tet_elements)]
 
     if marker_tris:
         for _, tris in sorted(marker_tris.items()):
-            if not tris:
-                continue
-            tri_array = np.asarray(tris, dtype=int)
-            if len(tri_array) > 0:
-                cells.append(("triangle", tri_array))
+            if len(tris) > 0:
+                cells.append(("triangle", np.asarray(tris, dtype=int)))
 
     meshio.write(
         str(output_vtu_path),
@@ -210,29 +219,28 @@ def _write_vtu(
     )
 
 
+@profiled
 def _write_boundary_vtu(
     output_vtu_path: Path,
     tet_points: ndarray,
-    marker_tris: dict[str, list[tuple[int, int, int]]],
+    marker_tris: dict[str, ndarray],
     marker_filter: set[str] | None = None,
 ) -> None:
     """Write boundary triangles as standalone VTU for easy ParaView inspection."""
     tri_cells: list[ndarray] = []
-    marker_ids: list[int] = []
+    marker_ids: list[ndarray] = []
     marker_name_by_id: dict[int, str] = {}
     next_marker_id = 1
 
     for marker_name, tris in sorted(marker_tris.items()):
         if marker_filter is not None and marker_name not in marker_filter:
             continue
-        if not tris:
+        if len(tris) == 0:
             continue
         tri_array = np.asarray(tris, dtype=int)
-        if len(tri_array) == 0:
-            continue
         tri_cells.append(tri_array)
         marker_name_by_id[next_marker_id] = marker_name
-        marker_ids.extend([next_marker_id] * len(tri_array))
+        marker_ids.append(np.full(len(tri_array), next_marker_id, dtype=int))
         next_marker_id += 1
 
     if not tri_cells:
@@ -242,20 +250,21 @@ def _write_boundary_vtu(
     mesh = meshio.Mesh(
         points=tet_points,
         cells=[("triangle", tri_data)],
-        cell_data={"marker_id": [np.asarray(marker_ids, dtype=int)]},
+        cell_data={"marker_id": [np.concatenate(marker_ids)]},
         field_data={name: np.asarray([mid, 2], dtype=int) for mid, name in marker_name_by_id.items()},
     )
     meshio.write(str(output_vtu_path), mesh, file_format="vtu")
 
 
+@profiled
 def _write_surface_boundary_msh(
     surface_mesh_path: Path,
     tet_points: ndarray,
-    marker_tris: dict[str, list[tuple[int, int, int]]],
+    marker_tris: dict[str, ndarray],
 ) -> None:
     """Write TetGen boundary triangles as a gmsh surface mesh."""
 
-    marker_names = sorted(name for name, tris in marker_tris.items() if tris)
+    marker_names = sorted(name for name, tris in marker_tris.items() if len(tris) > 0)
     if not marker_names:
         return None
 
@@ -263,26 +272,20 @@ def _write_surface_boundary_msh(
         name: np.array([idx + 1, 2], dtype=int)
         for idx, name in enumerate(marker_names)
     }
-    marker_id_by_name = {name: int(field_data[name][0]) for name in marker_names}
-
-    tris: list[tuple[int, int, int]] = []
-    tri_phys: list[int] = []
-    seen_faces: set[tuple[int, int, int]] = set()
-    for marker_name in marker_names:
-        marker_id = marker_id_by_name[marker_name]
-        for a, b, c in marker_tris[marker_name]:
-            key = tuple(sorted((int(a), int(b), int(c))))
-            if key in seen_faces:
-                continue
-            seen_faces.add((int(a), int(b), int(c)))
-            tris.append((int(a), int(b), int(c)))
-            tri_phys.append(marker_id)
-
-    if not tris:
-        return None
 
-    triangles = np.asarray(tris, dtype=int)
-    tri_phys_arr = np.asarray(tri_phys, dtype=int)
+    all_tris = np.vstack([np.asarray(marker_tris[name], dtype=int) for name in marker_names])
+    all_phys = np.concatenate(
+        [
+            np.full(len(marker_tris[name]), int(field_data[name][0]), dtype=int)
+            for name in marker_names
+        ]
+    )
+
+    # Keep the first occurrence of each face (in marker order).
+    _, first_idx = np.unique(np.sort(all_tris, axis=1), axis=0, return_index=True)
+    keep = np.sort(first_idx)
+    triangles = all_tris[keep]
+    tri_phys_arr = all_phys[keep]
     meshio.write(
         str(surface_mesh_path),
         meshio.Mesh(
@@ -477,37 +480,56 @@ def _augment_points_for_volume_refinement(
     return np.vstack([points, seeded_points])
 
 
-def _infer_boundary_marker_name(
-    tri_points: ndarray,
-    mins: ndarray,
-    maxs: ndarray,
-    tol: ndarray,
+@profiled
+def _classify_boundary_faces(
+    tet_points: ndarray,
+    faces: ndarray,
     symmetry: bool,
-) -> str:
-    """Infer boundary marker from triangle position on fluid-domain planes."""
+) -> dict[str, ndarray]:
+    """Label all boundary faces from their position on the fluid-domain planes.
+
+    Returns marker name -> (n, 3) face connectivity ("SYMMETRY", "Farfield" or "wall").
+    """
+
+    faces = np.asarray(faces, dtype=int)
+    mins = tet_points.min(axis=0)
+    maxs = tet_points.max(axis=0)
+    span = np.maximum(maxs - mins, 1e-12)
+    tol = 1e-6 + 5e-4 * span
 
-    x = tri_points[:, 0]
-    y = tri_points[:, 1]
-    z = tri_points[:, 2]
+    # (n_faces, 3 nodes, 3 coordinates)
+    face_points = tet_points[faces]
 
-    on_x_min = np.all(np.abs(x - mins[0]) <= tol[0])
-    on_x_max = np.all(np.abs(x - maxs[0]) <= tol[0])
-    on_y_min = np.all(np.abs(y - mins[1]) <= tol[1])
-    on_y_max = np.all(np.abs(y - maxs[1]) <= tol[1])
-    on_z_min = np.all(np.abs(z - mins[2]) <= tol[2])
-    on_z_max = np.all(np.abs(z - maxs[2]) <= tol[2])
-    on_y_zero = np.all(np.abs(y) <= tol[1])
+    def _on_plane(axis: int, value: float) -> ndarray:
+        return np.all(np.abs(face_points[:, :, axis] - value) <= tol[axis], axis=1)
+
+    farfield = (
+        _on_plane(0, mins[0])
+        | _on_plane(0, maxs[0])
+        | _on_plane(1, maxs[1])
+        | _on_plane(2, mins[2])
+        | _on_plane(2, maxs[2])
+    )
 
     # In symmetric meshes, symmetry plane is y=0 regardless of kept side.
-    if symmetry and on_y_zero:
-        return "SYMMETRY"
-    if on_x_min or on_x_max or on_y_max or on_z_min or on_z_max:
-        return "Farfield"
-    if (not symmetry) and on_y_min:
-        return "Farfield"
-    return "wall"
+    if symmetry:
+        on_symmetry = _on_plane(1, 0.0)
+        farfield &= ~on_symmetry
+    else:
+        on_symmetry = np.zeros(len(faces), dtype=bool)
+        farfield |= _on_plane(1, mins[1])
 
+    wall = ~(on_symmetry | farfield)
 
+    marker_tris = {
+        "SYMMETRY": faces[on_symmetry],
+        "Farfield": faces[farfield],
+        "wall": faces[wall],
+    }
+    return {name: tris for name, tris in marker_tris.items() if len(tris) > 0}
+
+
+@profiled
 def _extract_boundary_faces_from_tetra(tet_elements: ndarray) -> ndarray:
     """Return unique tetra boundary faces (3 node ids) from connectivity."""
     tets = np.asarray(tet_elements, dtype=int)
@@ -524,6 +546,251 @@ def _extract_boundary_faces_from_tetra(tet_elements: ndarray) -> ndarray:
     return unique_faces[counts == 1]
 
 
+def _get_surface_hash(points: ndarray, triangles: ndarray) -> str:
+    """Hash of the surface mesh, used to recognise a geometry between runs."""
+
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(np.round(points, 12), dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(triangles, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _get_tetgen_history_path() -> Path:
+    return Path(get_wkdir(), TETGEN_HISTORY_NAME)
+
+
+def _load_tetgen_winner(surface_hash: str) -> tuple[str, str] | None:
+    """Return (profile, switches) which succeeded on this surface mesh in a previous run."""
+
+    history_path = _get_tetgen_history_path()
+    if not history_path.is_file():
+        return None
+
+    try:
+        entry = json.loads(history_path.read_text(encoding="utf-8")).get(surface_hash)
+    except (OSError, ValueError, AttributeError):
+        log.warning(f"Could not read TetGen profile history {history_path}.")
+        return None
+
+    if not isinstance(entry, dict) or "profile" not in entry or "switch" not in entry:
+        return None
+
+    return str(entry["profile"]), str(entry["switch"])
+
+
+def _save_tetgen_winner(
+    results_dir: Path,
+    surface_hash: str,
+    profile_name: str,
+    switch: str,
+    race: bool,
+) -> None:
+    """Record the winning (profile, switches) in results_dir and in the working directory."""
+
+    winner = {"surface_hash": surface_hash, "profile": profile_name, "switch": switch}
+    try:
+        Path(results_dir, TETGEN_PROFILE_NAME).write_text(
+            json.dumps({**winner, "race": race}, indent=4), encoding="utf-8"
+        )
+    except OSError:
+        log.warning(f"Could not write {TETGEN_PROFILE_NAME} in {results_dir}.")
+
+    history_path = _get_tetgen_history_path()
+    try:
+        history = json.loads(history_path.read_text(encoding="utf-8"))
+        if not isinstance(history, dict):
+            history = {}
+    except (OSError, ValueError):
+        history = {}
+
+    history[surface_hash] = {"profile": profile_name, "switch": switch}
+    tmp_path = history_path.with_name(f"{history_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(history, indent=4), encoding="utf-8")
+        os.replace(tmp_path, history_path)
+    except OSError:
+        log.warning(f"Could not update TetGen profile history {history_path}.")
+
+
+def _get_candidate_order(preferred: tuple[str, str] | None) -> list[tuple[dict, str]]:
+    """
+    Return the (profile, switches) candidates in priority order:
+    seeded refinement profiles (most refined first), then boundary-only points.
+    A candidate which succeeded previously on the same geometry is tried first.
+    """
+
+    order = [
+        (profile, switch)
+        for profile in REFINEMENT_PROFILES
+        for switch in SEEDED_QUALITY_SWITCHES
+    ]
+    order += [(BOUNDARY_ONLY_PROFILE, switch) for switch in BOUNDARY_QUALITY_SWITCHES]
+
+    if preferred is not None:
+        for i, (profile, switch) in enumerate(order):
+            if (profile["name"], switch) == preferred:
+                order.insert(0, order.pop(i))
+                log.info(
+                    f"Trying TetGen profile='{preferred[0]}' with switches='{preferred[1]}' "
+                    "first, it succeeded previously on this geometry."
+                )
+                break
+
+    return order
+
+
+def _iter_tetgen_candidates(
+    points: ndarray,
+    triangles: ndarray,
+    tri_phys: ndarray | None,
+    phys_name_by_id: dict[int, str],
+    mesh_settings: MeshSettings,
+    farfield_settings: FarfieldSettings,
+    preferred: tuple[str, str] | None,
+) -> Iterator[tuple[str, str, ndarray]]:
+    """
+    Yield (profile name, switches, TetGen input points) in priority order.
+    The refinement points of each profile are computed once, when first needed.
+    """
+
+    profile_points: dict[str, ndarray | None] = {BOUNDARY_ONLY_PROFILE["name"]: points}
+    for profile, switch in _get_candidate_order(preferred):
+        name = profile["name"]
+        if name not in profile_points:
+            tet_input_points = _augment_points_for_volume_refinement(
+                points=points,
+                triangles=triangles,
+                tri_phys=tri_phys,
+                phys_name_by_id=phys_name_by_id,
+                mesh_settings=mesh_settings,
+                farfield_settings=farfield_settings,
+                max_anchor_nodes=int(profile["max_anchor_nodes"]),
+                layer_multipliers=tuple(profile["layer_multipliers"]),
+                ratio_clip=tuple(profile["ratio_clip"]),
+                k_directions=int(profile.get("k_directions", 1)),
+                uniform_layers=int(profile.get("uniform_layers", 0)),
+                uniform_band_span_factor=float(profile.get("uniform_band_span_factor", 0.15)),
+                min_clearance_factor=float(profile["min_clearance_factor"]),
+            )
+            profile_points[name] = (
+                tet_input_points if len(tet_input_points) > len(points) else None
+            )
+
+        if profile_points[name] is not None:
+            yield name, switch, profile_points[name]
+
+
+@profiled
+def _tetrahedralize(
+    points: ndarray,
+    triangles: ndarray,
+    switch: str,
+) -> tuple[ndarray | None, ndarray | None]:
+    """Run TetGen and return its nodes and tetrahedra (top-level to run in a process pool)."""
+
+    tet = tetgen.TetGen(points, triangles)
+    tet.tetrahedralize(switches=switch)
+    return tet.node, tet.elem
+
+
+def _tetrahedralize_in_process(
+    points: ndarray,
+    triangles: ndarray,
+    switch: str,
+    conn: Connection,
+) -> None:
+    """Target of a TetGen candidate process: send its nodes and tetrahedra, or its error."""
+
+    try:
+        conn.send(_tetrahedralize(points, triangles, switch))
+    except Exception as err:
+        conn.send(err)
+    finally:
+        conn.close()
+
+
+@profiled
+def _race_tetgen_candidates(
+    candidates: list[tuple[str, str, ndarray]],
+    triangles: ndarray,
+    nb_proc: int,
+) -> tuple[str, str, ndarray | None, ndarray | None] | None:
+    """
+    Run the TetGen candidates concurrently (started in priority order)
+    and return the highest-priority success, or None if they all failed.
+    Lower-priority candidates still running are terminated.
+    """
+
+    nb_workers = max(1, min(nb_proc, len(candidates)))
+    log.info(f"Racing {len(candidates)} TetGen candidates on {nb_workers} processes.")
+
+    # Spawn: the parent may hold threads (status writer, log readers...)
+    mp_context = multiprocessing.get_context("spawn")
+    running: dict[Connection, tuple[int, BaseProcess]] = {}
+    results: dict[int, tuple[ndarray, ndarray] | None] = {}
+    next_idx = 0
+    try:
+        while True:
+            # Waiting in priority order: a success is only accepted
+            # once all the candidates preferred to it have failed.
+            for idx, (profile_name, switch, _) in enumerate(candidates):
+                if idx not in results:
+                    break
+                if results[idx] is not None:
+                    return profile_name, switch, *results[idx]
+            else:
+                return None
+
+            # Candidates after a success are not worth starting
+            success_idx = min(
+                [idx for idx, result in results.items() if result is not None],
+                default=len(candidates),
+            )
+            while len(running) < nb_workers and next_idx < min(success_idx, len(candidates)):
+                _, switch, tet_input_points = candidates[next_idx]
+                recv_conn, send_conn = mp_context.Pipe(duplex=False)
+                process = mp_context.Process(
+                    target=_tetrahedralize_in_process,
+                    args=(tet_input_points, triangles, switch, send_conn),
+                    daemon=True,
+                )
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (next_idx, process)
+                next_idx += 1
+
+            for recv_conn in wait(list(running)):
+                idx, process = running.pop(recv_conn)
+                profile_name, switch, _ = candidates[idx]
+                try:
+                    result = recv_conn.recv()
+                except EOFError:
+                    log.warning(
+                        f"TetGen process crashed with profile='{profile_name}' "
+                        f"and switches='{switch}'."
+                    )
+                    result = None
+                finally:
+                    recv_conn.close()
+                process.join()
+
+                if isinstance(result, RuntimeError):
+                    log.info(
+                        f"TetGen failed with profile='{profile_name}' and switches='{switch}'."
+                    )
+                    result = None
+                elif isinstance(result, Exception):
+                    log.warning(f"TetGen candidate profile='{profile_name}' failed: {result!r}")
+                    result = None
+                results[idx] = result
+    finally:
+        for recv_conn, (_, process) in running.items():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            recv_conn.close()
+
+
 def _run_tetgen_python(
     output_su2_path: Path,
     surface_mesh_path: Path,
@@ -534,76 +801,51 @@ def _run_tetgen_python(
     """Generate tetrahedra with tetgen Python module and write SU2."""
     points, triangles, tri_phys, phys_name_by_id = _load_surface_triangles(surface_mesh_path)
 
-    tet = None
-    used_seeds = False
-    used_switch = ""
-    for profile in REFINEMENT_PROFILES:
-        tet_input_points = _augment_points_for_volume_refinement(
-            points=points,
-            triangles=triangles,
-            tri_phys=tri_phys,
-            phys_name_by_id=phys_name_by_id,
-            mesh_settings=mesh_settings,
-            farfield_settings=farfield_settings,
-            max_anchor_nodes=int(profile["max_anchor_nodes"]),
-            layer_multipliers=tuple(profile["layer_multipliers"]),
-            ratio_clip=tuple(profile["ratio_clip"]),
-            k_directions=int(profile.get("k_directions", 1)),
-            uniform_layers=int(profile.get("uniform_layers", 0)),
-            uniform_band_span_factor=float(profile.get("uniform_band_span_factor", 0.15)),
-            min_clearance_factor=float(profile["min_clearance_factor"]),
-        )
-        if len(tet_input_points) <= len(points):
-            continue
+    surface_hash = _get_surface_hash(points, triangles)
+    candidates = _iter_tetgen_candidates(
+        points=points,
+        triangles=triangles,
+        tri_phys=tri_phys,
+        phys_name_by_id=phys_name_by_id,
+        mesh_settings=mesh_settings,
+        farfield_settings=farfield_settings,
+        preferred=_load_tetgen_winner(surface_hash),
+    )
 
-        for switch in SEEDED_QUALITY_SWITCHES:
+    winner = None
+    nb_proc = get_sane_max_cpu()
+    if mesh_settings.tetgen_race and nb_proc > 1:
+        with cpu_lease(nb_proc) as nb_proc:
+            winner = _race_tetgen_candidates(list(candidates), triangles, nb_proc)
+    else:
+        for profile_name, switch, tet_input_points in candidates:
             try:
-                candidate = tetgen.TetGen(tet_input_points, triangles)
-                candidate.tetrahedralize(switches=switch)
-                tet = candidate
-                used_seeds = True
-                used_switch = switch
+                winner = (
+                    profile_name,
+                    switch,
+                    *_tetrahedralize(tet_input_points, triangles, switch),
+                )
                 break
             except RuntimeError:
-                continue
-
-        if tet is not None:
-            log.info(
-                "TetGen seeded refinement succeeded with "
-                f"profile='{profile['name']}' and switches='{used_switch}'."
-            )
-            break
-
-        log.warning(
-            "TetGen failed with seeded refinement profile "
-            f"'{profile['name']}'; trying a less aggressive profile."
+                log.info(f"TetGen failed with profile='{profile_name}' and switches='{switch}'.")
+
+    if winner is not None:
+        used_profile, used_switch, tet_points, tet_elements = winner
+        _save_tetgen_winner(
+            results_dir=output_su2_path.parent,
+            surface_hash=surface_hash,
+            profile_name=used_profile,
+            switch=used_switch,
+            race=mesh_settings.tetgen_race,
         )
+        log.info(
+            f"TetGen tetrahedralization succeeded with profile='{used_profile}' "
+            f"and switches='{used_switch}'."
+        )
+    else:
+        log.warning("TetGen failed with all refinement profiles; using robust switch set.")
+        tet_points, tet_elements = _tetrahedralize(points, triangles, ROBUST_SWITCH)
 
-    if tet is None:
-        log.warning("TetGen failed with all seeded profiles; retrying boundary-only points.")
-        for switch in BOUNDARY_QUALITY_SWITCHES:
-            try:
-                candidate = tetgen.TetGen(points, triangles)
-                candidate.tetrahedralize(switches=switch)
-                tet = candidate
-                used_switch = switch
-                break
-            except RuntimeError:
-                continue
-
-    if tet is None:
-        tet = tetgen.TetGen(points, triangles)
-        tet.tetrahedralize(switches=ROBUST_SWITCH)
-        used_switch = ROBUST_SWITCH
-        log.warning("TetGen fell back to robust switch set.")
-
-    log.info(
-        f"TetGen tetrahedralization succeeded with switches='{used_switch}'"
-        f"{' (with refinement seeds)' if used_seeds else ''}."
-    )
-
-    tet_points = tet.node
-    tet_elements = tet.elem
     if tet_points is None or tet_elements is None:
         raise RuntimeError("TetGen backend failed to extract tetrahedral mesh arrays.")
     if len(tet_elements) == 0:
@@ -612,26 +854,12 @@ def _run_tetgen_python(
     tet_points = np.asarray(tet_points, dtype=float)
     tet_elements = np.asarray(tet_elements, dtype=int)
 
-    marker_tris: dict[str, list[tuple[int, int, int]]] = defaultdict(list)
-    bbox_mins = tet_points.min(axis=0)
-    bbox_maxs = tet_points.max(axis=0)
-    bbox_span = np.maximum(bbox_maxs - bbox_mins, 1e-12)
-    bbox_tol = 1e-6 + 5e-4 * bbox_span
     boundary_faces = _extract_boundary_faces_from_tetra(tet_elements)
-    for tri in boundary_faces:
-        a = int(tri[0])
-        b = int(tri[1])
-        c = int(tri[2])
-        tri_pts = tet_points[[a, b, c], :]
-        marker_name = _infer_boundary_marker_name(
-            tri_points=tri_pts,
-            mins=bbox_mins,
-            maxs=bbox_maxs,
-            tol=bbox_tol,
-            symmetry=mesh_settings.symmetry,
-        )
-
-        marker_tris[marker_name].append((a, b, c))
+    marker_tris = _classify_boundary_faces(
+        tet_points=tet_points,
+        faces=boundary_faces,
+        symmetry=mesh_settings.symmetry,
+    )
 
     _write_surface_boundary_msh(
         surface_mesh_path=surface_mesh_path,
@@ -639,7 +867,10 @@ def _run_tetgen_python(
         marker_tris=marker_tris,
     )
 
-    _write_su2(output_su2_path, tet_points, tet_elements, marker_tris)
+    # Format the SU2 mesh while the VTU exports proceed.
+    su2_writer = _write_su2(
+        output_su2_path, tet_points, tet_elements, marker_tris, background=True
+    )
     _write_vtu(
         output_su2_path.with_suffix(".vtu"),
         tet_points,
@@ -657,9 +888,12 @@ def _run_tetgen_python(
         marker_tris,
         marker_filter={"wall"},
     )
+    with profile_span("wait SU2 writer"):
+        su2_writer.join()
     return int(len(tet_elements))
 
 
+@profiled
 def euler_mesh(
     results_dir: Path,
     surface_mesh_path: Path,
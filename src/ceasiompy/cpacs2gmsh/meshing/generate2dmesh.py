@@ -12,6 +12,11 @@ import gmsh
 from ceasiompy.cpacs2gmsh.utility.utils import write_gmsh
 from ceasiompy.utils.progress import progress_update
 from ceasiompy.utils.ceasiompyutils import get_sane_max_cpu
+from ceasiompy.utils.cpugovernor import cpu_lease
+from ceasiompy.utils.profiling import (
+    profiled,
+    profile_span,
+)
 from ceasiompy.cpacs2gmsh.meshing.symmetryplane import generate_symmetry_plane
 from ceasiompy.cpacs2gmsh.utility.sanity import check_surfaces_with_open_loops
 from ceasiompy.cpacs2gmsh.utility.wingclassification import (
@@ -348,6 +353,7 @@ def _part_owner_rank(part_type: PartType) -> int:
     return 0
 
 
+@profiled
 def _fragment_parts_for_union(entries: list[FuseEntry]) -> list[FuseEntry]:
     """
     Fragment all input volumes together to imprint intersections globally.
@@ -872,6 +878,7 @@ def _refine_fuselage_nose_tail(
 
 # Functions
 
+@profiled
 def generate_surface_mesh(
     results_dir: Path,
     mesh_settings: MeshSettings,
@@ -1046,11 +1053,6 @@ def generate_surface_mesh(
     gmsh.option.setNumber("Mesh.MeshSizeExtendFromBoundary", 0)
     gmsh.option.setNumber("Mesh.Algorithm", 6)
     gmsh.option.setNumber("Mesh.LcIntegrationPrecision", 1e-6)
-    mesh_threads = get_sane_max_cpu()
-    gmsh.option.setNumber("General.NumThreads", mesh_threads)
-    gmsh.option.setNumber("Mesh.MaxNumThreads1D", mesh_threads)
-    gmsh.option.setNumber("Mesh.MaxNumThreads2D", mesh_threads)
-    gmsh.option.setNumber("Mesh.MaxNumThreads3D", mesh_threads)
     # Keep default STL solid behavior to avoid per-surface segmentation seams.
     gmsh.option.setNumber("Mesh.StlOneSolidPerSurface", 0)
 
@@ -1065,21 +1067,32 @@ def generate_surface_mesh(
     gmsh.option.setNumber("Mesh.Algorithm", 6)
     gmsh.logger.start()
 
-    log.info("Starting 1D Geometry.")
-    gmsh.model.mesh.generate(1)
-
-    log.info("Starting 2D Geometry.")
-    gmsh.model.mesh.generate(2)
-
-    log.info("Starting 2D Geometry Mesh Optimization.")
-    gmsh.model.occ.synchronize()
-    gmsh.model.mesh.optimize(
-        method="Laplace2D",
-        niter=5,
-    )
-    gmsh.model.occ.synchronize()
+    # gmsh threads only use the CPUs leased for the meshing (see cpugovernor.py)
+    with cpu_lease(get_sane_max_cpu()) as mesh_threads:
+        gmsh.option.setNumber("General.NumThreads", mesh_threads)
+        gmsh.option.setNumber("Mesh.MaxNumThreads1D", mesh_threads)
+        gmsh.option.setNumber("Mesh.MaxNumThreads2D", mesh_threads)
+        gmsh.option.setNumber("Mesh.MaxNumThreads3D", mesh_threads)
+
+        log.info("Starting 1D Geometry.")
+        with profile_span("gmsh 1D mesh"):
+            gmsh.model.mesh.generate(1)
+
+        log.info("Starting 2D Geometry.")
+        with profile_span("gmsh 2D mesh"):
+            gmsh.model.mesh.generate(2)
+
+        log.info("Starting 2D Geometry Mesh Optimization.")
+        with profile_span("gmsh 2D optimization"):
+            gmsh.model.occ.synchronize()
+            gmsh.model.mesh.optimize(
+                method="Laplace2D",
+                niter=5,
+            )
+            gmsh.model.occ.synchronize()
 
-    return write_gmsh(str(results_dir), "surface_mesh.msh")
+    with profile_span("write surface mesh"):
+        return write_gmsh(str(results_dir), "surface_mesh.msh")
 
 
 def generate_volume_mesh(
@@ -0,0 +1,233 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'cpacs2gmsh/meshing/eulermesh.py'
+"""
+
+# Imports
+
+import os
+import json
+import time
+import pytest
+import numpy as np
+
+from ceasiompy.cpacs2gmsh.meshing import eulermesh
+from ceasiompy.cpacs2gmsh.meshing.eulermesh import (
+    REFINEMENT_PROFILES,
+    TETGEN_PROFILE_NAME,
+    TETGEN_HISTORY_NAME,
+    SEEDED_QUALITY_SWITCHES,
+    _load_tetgen_winner,
+    _save_tetgen_winner,
+    _get_candidate_order,
+    _race_tetgen_candidates,
+    _classify_boundary_faces,
+)
+
+from pathlib import Path
+from numpy import ndarray
+
+_TETRAHEDRALIZE_IN_PROCESS = eulermesh._tetrahedralize_in_process
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _fake_tetrahedralize(points: ndarray, triangles: ndarray, switch: str) -> tuple:
+    """Stand-in for TetGen: switch is '<outcome>:<duration>'."""
+
+    outcome, duration = switch.split(":")
+    time.sleep(float(duration))
+    if outcome == "fail":
+        raise RuntimeError("Failed to tetrahedralize.")
+    if outcome == "crash":
+        os._exit(1)
+    return points, np.array([[0, 1, 2, 3]])
+
+
+def _fake_tetrahedralize_in_process(*args) -> None:
+    # Run in a spawned process, which imports the modules again
+    eulermesh._tetrahedralize = _fake_tetrahedralize
+    _TETRAHEDRALIZE_IN_PROCESS(*args)
+
+
+@pytest.fixture
+def fake_tetgen(monkeypatch):
+    monkeypatch.setattr(
+        eulermesh, "_tetrahedralize_in_process", _fake_tetrahedralize_in_process
+    )
+
+
+def _get_domain(symmetry: bool) -> tuple[ndarray, ndarray, list[str]]:
+    """
+    Points of a fluid domain (half domain y >= 0 with symmetry) around a body,
+    with boundary faces and their expected marker.
+    """
+
+    y_min = 0.0 if symmetry else -10.0
+    points = np.array([
+        # Farfield corners
+        [-10.0, y_min, -10.0], [10.0, y_min, -10.0], [10.0, 10.0, -10.0], [-10.0, 10.0, -10.0],
+        [-10.0, y_min, 10.0], [10.0, y_min, 10.0], [10.0, 10.0, 10.0], [-10.0, 10.0, 10.0],
+        # Body, its root is on the plane y=0
+        [-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.5], [0.0, 2.0, 0.1],
+        # Interior point on the plane y=0
+        [0.0, 0.0, 5.0],
+    ])
+
+    faces_markers = [
+        ([0, 1, 2], "Farfield"),   # z min
+        ([4, 5, 6], "Farfield"),   # z max
+        ([0, 3, 7], "Farfield"),   # x min
+        ([1, 2, 6], "Farfield"),   # x max
+        ([2, 3, 7], "Farfield"),   # y max
+        ([8, 9, 11], "wall"),
+        ([9, 10, 11], "wall"),
+        ([0, 3, 11], "wall"),      # Only two nodes on the x min plane
+    ]
+    if symmetry:
+        faces_markers += [
+            ([0, 1, 8], "SYMMETRY"),
+            ([8, 9, 12], "SYMMETRY"),
+            ([4, 5, 12], "SYMMETRY"),
+        ]
+    else:
+        faces_markers += [
+            ([0, 1, 5], "Farfield"),   # y min
+            ([8, 9, 10], "wall"),      # Body root: on y=0, inside the domain
+            ([8, 9, 12], "wall"),
+        ]
+
+    faces = np.array([face for face, _ in faces_markers])
+    return points, faces, [marker for _, marker in faces_markers]
+
+
+def _infer_boundary_marker_name(
+    tri_points: ndarray,
+    mins: ndarray,
+    maxs: ndarray,
+    tol: ndarray,
+    symmetry: bool,
+) -> str:
+    """Marker of one face, as computed before _classify_boundary_faces."""
+
+    on_planes = [
+        np.all(np.abs(tri_points[:, axis] - value) <= tol[axis])
+        for axis, value in ((0, mins[0]), (0, maxs[0]), (1, maxs[1]), (2, mins[2]), (2, maxs[2]))
+    ]
+    if symmetry and np.all(np.abs(tri_points[:, 1]) <= tol[1]):
+        return "SYMMETRY"
+    if any(on_planes):
+        return "Farfield"
+    if (not symmetry) and np.all(np.abs(tri_points[:, 1] - mins[1]) <= tol[1]):
+        return "Farfield"
+    return "wall"
+
+
+def _get_candidates(*switches: str) -> list[tuple[str, str, ndarray]]:
+    points = np.eye(4, 3)
+    return [(f"profile{i}", switch, points) for i, switch in enumerate(switches)]
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_race_tetgen_candidates_priority(fake_tetgen):
+
+    # The fastest success is not the highest-priority one
+    candidates = _get_candidates("fail:0.5", "ok:1.0", "ok:0.0", "crash:0.0")
+    winner = _race_tetgen_candidates(candidates, np.zeros((1, 3)), nb_proc=4)
+
+    profile_name, switch, tet_points, tet_elements = winner
+    assert (profile_name, switch) == ("profile1", "ok:1.0")
+    np.testing.assert_array_equal(tet_points, candidates[1][2])
+    np.testing.assert_array_equal(tet_elements, [[0, 1, 2, 3]])
+
+    # Less processes than candidates, a slow lower-priority candidate is terminated
+    start = time.monotonic()
+    candidates = _get_candidates("crash:0.0", "ok:0.0", "ok:60.0", "ok:0.0")
+    winner = _race_tetgen_candidates(candidates, np.zeros((1, 3)), nb_proc=3)
+    assert winner[:2] == ("profile1", "ok:0.0")
+    assert time.monotonic() - start < 30.0
+
+
+def test_race_tetgen_candidates_all_fail(fake_tetgen):
+
+    candidates = _get_candidates("fail:0.0", "crash:0.0", "fail:0.2")
+    assert _race_tetgen_candidates(candidates, np.zeros((1, 3)), nb_proc=2) is None
+
+
+def test_tetgen_winner(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(eulermesh, "get_wkdir", lambda: tmp_path)
+    results_dir = Path(tmp_path, "results")
+    results_dir.mkdir()
+
+    default_order = _get_candidate_order(None)
+    assert default_order[0] == (REFINEMENT_PROFILES[0], SEEDED_QUALITY_SWITCHES[0])
+    assert _load_tetgen_winner("surface") is None
+
+    _save_tetgen_winner(results_dir, "surface", "dense", "pq1.30Q", race=True)
+    _save_tetgen_winner(results_dir, "other_surface", "medium", "pQ", race=False)
+
+    # Winner of the last run in the results directory
+    assert json.loads(Path(results_dir, TETGEN_PROFILE_NAME).read_text()) == {
+        "surface_hash": "other_surface",
+        "profile": "medium",
+        "switch": "pQ",
+        "race": False,
+    }
+
+    # Winners of all the geometries in the working directory
+    assert set(json.loads(Path(tmp_path, TETGEN_HISTORY_NAME).read_text())) == {
+        "surface",
+        "other_surface",
+    }
+
+    # The previous winner is tried first, the other candidates keep their order
+    preferred = _load_tetgen_winner("surface")
+    assert preferred == ("dense", "pq1.30Q")
+    order = _get_candidate_order(preferred)
+    assert (order[0][0]["name"], order[0][1]) == preferred
+    assert order[1:] == [candidate for candidate in default_order if candidate != order[0]]
+
+    # Unknown winner (e.g. removed profile) and unreadable history
+    assert _get_candidate_order(("removed", "pQ")) == default_order
+    Path(tmp_path, TETGEN_HISTORY_NAME).write_text("not json")
+    assert _load_tetgen_winner("surface") is None
+
+
+@pytest.mark.parametrize("symmetry", [True, False])
+def test_classify_boundary_faces(symmetry):
+
+    points, faces, markers = _get_domain(symmetry)
+    marker_tris = _classify_boundary_faces(points, faces, symmetry=symmetry)
+
+    expected = {
+        marker: faces[[i for i, name in enumerate(markers) if name == marker]]
+        for marker in ("SYMMETRY", "Farfield", "wall")
+        if marker in markers
+    }
+    assert list(marker_tris) == list(expected)
+    for marker, tris in expected.items():
+        np.testing.assert_array_equal(marker_tris[marker], tris)
+
+    # Same markers as when the faces were labelled one by one
+    mins, maxs = points.min(axis=0), points.max(axis=0)
+    tol = 1e-6 + 5e-4 * np.maximum(maxs - mins, 1e-12)
+    rng = np.random.default_rng(0)
+    random_faces = np.vstack([faces, rng.integers(0, len(points), size=(200, 3))])
+    marker_tris = _classify_boundary_faces(points, random_faces, symmetry=symmetry)
+    labels = {
+        tuple(face): marker for marker, tris in marker_tris.items() for face in tris.tolist()
+    }
+    for face in random_faces:
+        assert labels[tuple(face)] == _infer_boundary_marker_name(
+            points[face], mins, maxs, tol, symmetry
+        )
@@ -0,0 +1,144 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'cpacs2gmsh/utility/meshcache.py'
+"""
+
+# Imports
+
+import os
+import pytest
+
+from ceasiompy.cpacs2gmsh.utility.meshcache import (
+    store_mesh,
+    evict_meshes,
+    load_cached_mesh,
+    get_mesh_cache_key,
+)
+
+from pathlib import Path
+from types import SimpleNamespace
+from ceasiompy.cpacs2gmsh.utility.utils import (
+    MeshSettings,
+    FarfieldSettings,
+)
+
+CPACS_TEMPLATE = """<cpacs>
+  <vehicles>
+    <aircraft><model uID="aircraft">
+      <wings><wing uID="wing"><span>{span}</span></wing></wings>
+      <analyses><mass>{mass}</mass></analyses>
+    </model></aircraft>
+    <profiles><wingAirfoils><wingAirfoil uID="naca0012"/></wingAirfoils></profiles>
+    <engines><engine uID="engine"><nacelle>{nacelle}</nacelle></engine></engines>
+  </vehicles>
+  <toolspecific><CEASIOMpy><mesh><gmshOptions>
+    <tetgen_race>{race}</tetgen_race>
+    <use_mesh_cache>True</use_mesh_cache>
+    <farfield_factor>{factor}</farfield_factor>
+  </gmshOptions></mesh></CEASIOMpy></toolspecific>
+</cpacs>
+"""
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = Path(tmp_path, "mesh_cache")
+    monkeypatch.setenv("CEASIOMPY_MESH_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+def _get_key(tetgen_race: bool = False, wing_mesh_size: float = 0.1, **cpacs_values) -> str:
+    values = {"span": 10.0, "mass": 5000.0, "nacelle": 1.0, "race": False, "factor": 10.0}
+    values.update(cpacs_values)
+    cpacs_text = CPACS_TEMPLATE.format(**values)
+    cpacs = SimpleNamespace(tixi=SimpleNamespace(exportDocumentAsString=lambda: cpacs_text))
+
+    mesh_settings = MeshSettings(
+        symmetry=False,
+        add_boundary_layer=False,
+        tetgen_race=tetgen_race,
+        wing_mesh_size={"wing": wing_mesh_size},
+        pylon_mesh_size={},
+        fuselage_mesh_size={},
+    )
+    farfield_settings = FarfieldSettings(
+        y_length=10.0,
+        z_length=10.0,
+        wake_length=20.0,
+        upstream_length=10.0,
+        farfield_mesh_size=5.0,
+    )
+
+    return get_mesh_cache_key(cpacs, mesh_settings, farfield_settings)
+
+
+def test_get_mesh_cache_key():
+
+    key = _get_key()
+    assert key == _get_key()
+
+    # Options which do not change the mesh
+    assert _get_key(mass=6000.0) == key
+    assert _get_key(race=True) == key
+    assert _get_key(tetgen_race=True) == key
+
+    # Geometry, engines and mesh options
+    assert _get_key(span=11.0) != key
+    assert _get_key(nacelle=1.2) != key
+    assert _get_key(factor=12.0) != key
+    assert _get_key(wing_mesh_size=0.2) != key
+
+
+def _write_mesh(mesh_dir: Path, content: str, size: int = 0) -> list[Path]:
+    mesh_dir.mkdir(parents=True, exist_ok=True)
+    mesh_path = Path(mesh_dir, "mesh.su2")
+    mesh_path.write_text(content + "x" * size)
+    info_path = Path(mesh_dir, "mesh.su2.info.json")
+    info_path.write_text('{"markers": []}')
+    return [mesh_path, info_path]
+
+
+def test_store_and_load_mesh(cache_dir, tmp_path):
+
+    results_dir = Path(tmp_path, "results")
+    assert load_cached_mesh("key", results_dir) is None
+
+    files = _write_mesh(Path(tmp_path, "mesh"), "NDIME= 3\n")
+    assert store_mesh("key", files) == Path(cache_dir, "key")
+
+    # A second store keeps the first entry
+    _write_mesh(Path(tmp_path, "mesh"), "NDIME= 2\n")
+    store_mesh("key", files)
+
+    results_dir.mkdir()
+    restored = load_cached_mesh("key", results_dir)
+    assert [file.name for file in restored] == ["mesh.su2", "mesh.su2.info.json"]
+    assert Path(results_dir, "mesh.su2").read_text() == "NDIME= 3\n"
+
+    # Restored files are copies: rewriting them does not change the cache
+    Path(results_dir, "mesh.su2").write_text("rewritten")
+    assert Path(cache_dir, "key", "mesh.su2").read_text() == "NDIME= 3\n"
+    assert not list(cache_dir.glob(".*.tmp"))
+
+
+def test_evict_meshes(cache_dir, tmp_path):
+
+    for i, key in enumerate(["old", "used", "new"]):
+        store_mesh(key, _write_mesh(Path(tmp_path, key), key, size=1000))
+        entry_path = Path(cache_dir, key, "entry.json")
+        os.utime(entry_path, (1000.0 + i, 1000.0 + i))
+
+    # Loading a mesh marks it as recently used
+    load_cached_mesh("used", Path(tmp_path, "used"))
+
+    assert evict_meshes(max_bytes=10**6) == []
+    assert evict_meshes(max_bytes=2500) == ["old"]
+    assert evict_meshes(max_bytes=0, keep="used") == ["new"]
+    assert sorted(entry.name for entry in cache_dir.iterdir()) == ["used"]
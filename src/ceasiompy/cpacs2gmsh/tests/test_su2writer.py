@@ -0,0 +1,119 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'cpacs2gmsh/utility/su2writer.py'
+"""
+
+# Imports
+
+import json
+import pytest
+import numpy as np
+
+from ceasiompy.cpacs2gmsh.utility.su2writer import (
+    SU2MeshWriter,
+    write_su2_mesh,
+)
+
+from pathlib import Path
+from numpy import ndarray
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _write_su2_baseline(
+    output_su2_path: Path,
+    tet_points: ndarray,
+    tet_elements: ndarray,
+    marker_tris: dict[str, list[tuple[int, int, int]]],
+) -> None:
+    """SU2 mesh written line by line, as before write_su2_mesh."""
+    with open(output_su2_path, "w", encoding="utf-8") as f:
+        f.write("NDIME=3\n")
+        f.write(f"NELEM={len(tet_elements)}\n")
+        for tet_cell in tet_elements:
+            f.write(
+                "10 "
+                f"{int(tet_cell[0])} {int(tet_cell[1])} "
+                f"{int(tet_cell[2])} {int(tet_cell[3])}\n"
+            )
+
+        f.write(f"NPOIN={len(tet_points)}\n")
+        for idx, point in enumerate(tet_points):
+            f.write(
+                f"{float(point[0]):.16e} "
+                f"{float(point[1]):.16e} "
+                f"{float(point[2]):.16e} {idx}\n"
+            )
+
+        marker_names = sorted(name for name, tris in marker_tris.items() if len(tris))
+        f.write(f"NMARK={len(marker_names)}\n")
+        for marker_name in marker_names:
+            tris = marker_tris[marker_name]
+            f.write(f"MARKER_TAG={marker_name}\n")
+            f.write(f"MARKER_ELEMS={len(tris)}\n")
+            for a, b, c in tris:
+                f.write(f"5 {a} {b} {c}\n")
+
+
+def _get_mesh() -> tuple[ndarray, ndarray, dict[str, ndarray]]:
+    rng = np.random.default_rng(0)
+    points = rng.normal(scale=1e3, size=(9, 3))
+    points[0] = [0.0, -0.0, 1e-300]
+    elements = rng.integers(0, len(points), size=(7, 4))
+    markers = {
+        "wall": rng.integers(0, len(points), size=(5, 3)),
+        "Farfield": rng.integers(0, len(points), size=(3, 3)),
+        "SYMMETRY": np.empty((0, 3), dtype=int),
+    }
+    return points, elements, markers
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_write_su2_mesh(tmp_path):
+
+    points, elements, markers = _get_mesh()
+    baseline_path = Path(tmp_path, "baseline.su2")
+    _write_su2_baseline(baseline_path, points, elements, markers)
+
+    # Less rows per chunk than elements, points and marker elements
+    su2_mesh_path = Path(tmp_path, "mesh.su2")
+    assert write_su2_mesh(su2_mesh_path, points, elements, markers, chunk_rows=2) == su2_mesh_path
+    assert su2_mesh_path.read_bytes() == baseline_path.read_bytes()
+
+    # Sidecar with the sizes and the (non empty) markers, in the order of the mesh
+    info = json.loads(Path(tmp_path, "mesh.su2.info.json").read_text())
+    assert info == {
+        "ndime": 3,
+        "nelem": 7,
+        "npoin": 9,
+        "markers": {"Farfield": 3, "wall": 5},
+        "mesh_size": su2_mesh_path.stat().st_size,
+    }
+
+
+def test_su2_mesh_writer(tmp_path):
+
+    points, elements, markers = _get_mesh()
+    su2_mesh_path = Path(tmp_path, "mesh.su2")
+
+    writer = SU2MeshWriter(su2_mesh_path, points, elements, markers)
+    writer.start()
+    assert writer.join() == su2_mesh_path
+
+    write_su2_mesh(Path(tmp_path, "direct.su2"), points, elements, markers)
+    assert su2_mesh_path.read_bytes() == Path(tmp_path, "direct.su2").read_bytes()
+
+    # Errors of the thread are raised by join
+    writer = SU2MeshWriter(Path(tmp_path, "missing", "mesh.su2"), points, elements, markers)
+    writer.start()
+    with pytest.raises(FileNotFoundError):
+        writer.join()
@@ -12,6 +12,7 @@ from __future__ import annotations
 
 from tigl3.import_export_helper import export_shapes
 from ceasiompy.cpacs2gmsh.utility.engineconversion import engine_conversion
+from ceasiompy.utils.profiling import profiled
 from cpacspy.cpacsfunctions import get_value
 
 from typing import Any
@@ -283,6 +284,7 @@ def _export_engine_brep(
 
 # Functions
 
+@profiled
 def export_brep(cpacs: CPACS) -> AircraftGeometry:
     """Generates with TiGL the airplane geometry of the .xml file.
     All airplane parts are exported in .brep format with their uid name
@@ -0,0 +1,223 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Content-addressed cache of CPACS2GMSH meshes.
+
+A mesh is stored under the hash of the geometry of the CPACS file
+and of all the meshing settings. The least recently used meshes are
+evicted when the cache gets larger than its size limit.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import os
+import json
+import time
+import shutil
+import hashlib
+
+import xml.etree.ElementTree as ET
+
+from ceasiompy.utils.commonpaths import get_mesh_cache_dir
+from ceasiompy.utils.livecpacs import (
+    find_element,
+    canonical_xml,
+)
+
+from pathlib import Path
+from cpacspy.cpacspy import CPACS
+from ceasiompy.cpacs2gmsh.utility.utils import (
+    MeshSettings,
+    FarfieldSettings,
+)
+
+from ceasiompy import log
+from ceasiompy.cpacs2gmsh import (
+    GMSH_XPATH,
+    GMSH_MESH_CACHE_XPATH,
+    GMSH_TETGEN_RACE_XPATH,
+)
+
+# Constants
+
+# Bump when the meshing changes in a way which invalidates the cached meshes
+MESH_CACHE_VERSION = "1"
+
+# Default size limit of the cache, can be set with CEASIOMPY_MESH_CACHE_MAX_GB
+MESH_CACHE_MAX_BYTES = 10 * 1024**3
+
+MESH_CACHE_ENTRY_NAME = "entry.json"
+
+# CPACS subtrees defining the geometry (and the mesh options) of the aircraft
+GEOMETRY_XPATHS = (
+    "/cpacs/vehicles/aircraft/model",
+    "/cpacs/vehicles/profiles",
+    "/cpacs/vehicles/engines",
+    GMSH_XPATH,
+)
+
+# Subtrees of the model and options of the meshing which do not change the mesh
+NON_GEOMETRY_TAGS = (
+    "analyses",
+    GMSH_TETGEN_RACE_XPATH.rsplit("/", 1)[-1],
+    GMSH_MESH_CACHE_XPATH.rsplit("/", 1)[-1],
+)
+
+# Mesh settings which do not change the mesh
+NON_MESH_SETTINGS = {"tetgen_race"}
+
+
+# Functions
+
+def _get_max_bytes() -> int:
+    max_gb = os.environ.get("CEASIOMPY_MESH_CACHE_MAX_GB")
+    if max_gb is None:
+        return MESH_CACHE_MAX_BYTES
+
+    try:
+        return int(float(max_gb) * 1024**3)
+    except ValueError:
+        log.warning(f"CEASIOMPY_MESH_CACHE_MAX_GB must be a number, got {max_gb!r}.")
+        return MESH_CACHE_MAX_BYTES
+
+
+def get_mesh_cache_key(
+    cpacs: CPACS,
+    mesh_settings: MeshSettings,
+    farfield_settings: FarfieldSettings,
+) -> str:
+    """
+    Return the cache key of a mesh: hash of the geometry subtrees of the CPACS file
+    and of the mesh and farfield settings, without the options which do not change the mesh.
+    """
+
+    root = ET.fromstring(cpacs.tixi.exportDocumentAsString())
+
+    digest = hashlib.sha256()
+    digest.update(f"version={MESH_CACHE_VERSION}\n".encode())
+    for xpath in GEOMETRY_XPATHS:
+        element = find_element(root, xpath)
+        subtree = "" if element is None else canonical_xml(element, NON_GEOMETRY_TAGS)
+        digest.update(f"{xpath}={subtree}\n".encode())
+
+    digest.update(mesh_settings.model_dump_json(exclude=NON_MESH_SETTINGS).encode())
+    digest.update(farfield_settings.model_dump_json().encode())
+
+    return digest.hexdigest()
+
+
+def _entry_size(entry_dir: Path) -> int:
+    return sum(file.stat().st_size for file in entry_dir.iterdir() if file.is_file())
+
+
+def load_cached_mesh(key: str, results_dir: Path) -> list[Path] | None:
+    """
+    Copy the files of the cached mesh 'key' into results_dir.
+
+    Returns:
+        List of restored files, or None if the mesh is not in the cache.
+
+    """
+
+    entry_dir = Path(get_mesh_cache_dir(), key)
+    entry_path = Path(entry_dir, MESH_CACHE_ENTRY_NAME)
+    if not entry_path.is_file():
+        return None
+
+    try:
+        files = json.loads(entry_path.read_text(encoding="utf-8"))["files"]
+        restored = []
+        for file_name in files:
+            dst = Path(results_dir, file_name)
+            # Unlink first: dst may be a hard link to a cached file (older caches)
+            if dst.exists():
+                dst.unlink()
+            # Copies, not links: rewriting a restored file must not change the cache
+            shutil.copyfile(Path(entry_dir, file_name), dst)
+            restored.append(dst)
+    except (OSError, ValueError, KeyError) as err:
+        log.warning(f"Could not load cached mesh {key}: {err}")
+        return None
+
+    # Mark the entry as recently used for the LRU eviction.
+    os.utime(entry_path)
+    log.info(f"Loaded mesh {key[:12]} from cache {entry_dir.parent}.")
+
+    return restored
+
+
+def store_mesh(key: str, files: list[Path]) -> Path | None:
+    """
+    Store the files of a mesh in the cache under 'key',
+    then evict least recently used meshes if the cache is too large.
+    """
+
+    cache_dir = get_mesh_cache_dir()
+    entry_dir = Path(cache_dir, key)
+    if entry_dir.exists():
+        return entry_dir
+
+    tmp_dir = Path(cache_dir, f".{key}.{os.getpid()}.tmp")
+    try:
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        for file in files:
+            shutil.copyfile(file, Path(tmp_dir, file.name))
+        Path(tmp_dir, MESH_CACHE_ENTRY_NAME).write_text(
+            json.dumps({"files": [file.name for file in files], "created": time.time()}),
+            encoding="utf-8",
+        )
+        # Rename is atomic: concurrent runs never see a partial entry.
+        os.rename(tmp_dir, entry_dir)
+    except OSError as err:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not entry_dir.exists():
+            log.warning(f"Could not store mesh {key} in cache: {err}")
+            return None
+
+    log.info(f"Stored mesh {key[:12]} in cache {cache_dir}.")
+    evict_meshes(max_bytes=_get_max_bytes(), keep=key)
+
+    return entry_dir
+
+
+def evict_meshes(max_bytes: int, keep: str | None = None) -> list[str]:
+    """
+    Remove least recently used meshes until the cache is smaller than max_bytes.
+    The mesh 'keep' is never removed.
+
+    Returns:
+        Keys of the removed meshes.
+
+    """
+
+    cache_dir = get_mesh_cache_dir()
+    if not cache_dir.is_dir():
+        return []
+
+    entries = []
+    for entry_dir in cache_dir.iterdir():
+        entry_path = Path(entry_dir, MESH_CACHE_ENTRY_NAME)
+        if not entry_path.is_file():
+            continue
+        entries.append((entry_path.stat().st_mtime, entry_dir.name, _entry_size(entry_dir)))
+
+    total_size = sum(size for _, _, size in entries)
+    removed = []
+    for _, key, size in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        if key == keep:
+            continue
+        shutil.rmtree(Path(cache_dir, key), ignore_errors=True)
+        total_size -= size
+        removed.append(key)
+
+    if removed:
+        log.info(f"Evicted {len(removed)} mesh(es) from cache {cache_dir}.")
+
+    return removed
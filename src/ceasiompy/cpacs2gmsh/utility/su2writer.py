@@ -0,0 +1,203 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Chunked writer of SU2 (ASCII) mesh files from NumPy arrays.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import json
+import threading
+
+import numpy as np
+
+from pathlib import Path
+from numpy import ndarray
+from typing import (
+    TextIO,
+    Mapping,
+    Sequence,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.commonnames import SU2_MESH_INFO_SUFFIX
+
+# Constants
+
+# Number of rows formatted at once, bounds the memory used by the text buffers
+SU2_WRITE_CHUNK_ROWS = 100_000
+
+# SU2 (VTK) element type identifiers
+SU2_LINE = 3
+SU2_TRIANGLE = 5
+SU2_QUADRILATERAL = 9
+SU2_TETRAHEDRON = 10
+
+
+# Functions
+
+def _write_rows(
+    f: TextIO,
+    rows: ndarray,
+    row_fmt: str,
+    chunk_rows: int = SU2_WRITE_CHUNK_ROWS,
+) -> None:
+    """
+    Write rows of a 2D array with row_fmt, formatting one block of rows per write call.
+    """
+
+    for start in range(0, len(rows), chunk_rows):
+        block = rows[start:start + chunk_rows]
+        f.write((row_fmt * len(block)) % tuple(block.ravel().tolist()))
+
+
+def write_su2_elements(
+    f: TextIO,
+    elements: ndarray,
+    element_type: int,
+    chunk_rows: int = SU2_WRITE_CHUNK_ROWS,
+) -> None:
+    """
+    Write element connectivity lines 'element_type n0 n1 ...'.
+    """
+
+    if not len(elements):
+        return None
+
+    elements = np.asarray(elements, dtype=np.int64).reshape(len(elements), -1)
+    row_fmt = f"{element_type}" + " %d" * elements.shape[1] + "\n"
+    _write_rows(f, elements, row_fmt, chunk_rows)
+
+
+def write_su2_points(
+    f: TextIO,
+    points: ndarray,
+    chunk_rows: int = SU2_WRITE_CHUNK_ROWS,
+) -> None:
+    """
+    Write point lines 'x y z index'.
+    """
+
+    points = np.asarray(points, dtype=np.float64)
+    rows = np.column_stack([points, np.arange(len(points), dtype=np.float64)])
+    row_fmt = " ".join(["%.16e"] * points.shape[1]) + " %d\n"
+    _write_rows(f, rows, row_fmt, chunk_rows)
+
+
+def write_su2_mesh_info(
+    su2_mesh_path: Path,
+    ndime: int,
+    nb_elements: int,
+    nb_points: int,
+    marker_counts: Mapping[str, int],
+) -> Path:
+    """
+    Write the JSON sidecar of a SU2 mesh (sizes and marker names with their
+    number of elements), so that downstream modules do not scan the mesh text.
+    The size of the mesh file is stored to detect an outdated sidecar.
+    """
+
+    su2_mesh_path = Path(su2_mesh_path)
+    info_path = su2_mesh_path.with_name(su2_mesh_path.name + SU2_MESH_INFO_SUFFIX)
+    info = {
+        "ndime": int(ndime),
+        "nelem": int(nb_elements),
+        "npoin": int(nb_points),
+        "markers": {name: int(count) for name, count in marker_counts.items()},
+        "mesh_size": su2_mesh_path.stat().st_size,
+    }
+    info_path.write_text(json.dumps(info, indent=4), encoding="utf-8")
+
+    return info_path
+
+
+def write_su2_mesh(
+    su2_mesh_path: Path,
+    points: ndarray,
+    elements: ndarray,
+    markers: Mapping[str, ndarray | Sequence[tuple[int, ...]]],
+    element_type: int = SU2_TETRAHEDRON,
+    marker_element_type: int = SU2_TRIANGLE,
+    chunk_rows: int = SU2_WRITE_CHUNK_ROWS,
+) -> Path:
+    """
+    Write an SU2 mesh from volume elements, points and boundary markers,
+    and its JSON sidecar (see write_su2_mesh_info).
+    Empty markers are skipped and markers are written in sorted order.
+
+    Args:
+        su2_mesh_path (Path): Path of the SU2 mesh to write.
+        points (ndarray): (n, 3) point coordinates.
+        elements (ndarray): (m, k) volume element connectivity.
+        markers (Mapping): Marker name -> (l, 3) boundary element connectivity.
+        element_type (int): SU2 type of the volume elements.
+        marker_element_type (int): SU2 type of the boundary elements.
+        chunk_rows (int): Number of lines formatted at once.
+
+    """
+
+    points = np.asarray(points, dtype=np.float64)
+    marker_arrays = {
+        name: np.asarray(elems, dtype=np.int64).reshape(len(elems), -1)
+        for name, elems in markers.items()
+        if len(elems)
+    }
+
+    with open(su2_mesh_path, "w", encoding="utf-8") as f:
+        f.write(f"NDIME={points.shape[1]}\n")
+        f.write(f"NELEM={len(elements)}\n")
+        write_su2_elements(f, elements, element_type, chunk_rows)
+
+        # SU2 expects points/elements to be listed before marker sections.
+        f.write(f"NPOIN={len(points)}\n")
+        write_su2_points(f, points, chunk_rows)
+
+        f.write(f"NMARK={len(marker_arrays)}\n")
+        for marker_name in sorted(marker_arrays):
+            marker_elems = marker_arrays[marker_name]
+            f.write(f"MARKER_TAG={marker_name}\n")
+            f.write(f"MARKER_ELEMS={len(marker_elems)}\n")
+            write_su2_elements(f, marker_elems, marker_element_type, chunk_rows)
+
+    write_su2_mesh_info(
+        su2_mesh_path,
+        ndime=points.shape[1],
+        nb_elements=len(elements),
+        nb_points=len(points),
+        marker_counts={name: len(marker_arrays[name]) for name in sorted(marker_arrays)},
+    )
+
+    return Path(su2_mesh_path)
+
+
+class SU2MeshWriter(threading.Thread):
+    """
+    Write an SU2 mesh in a background thread (see write_su2_mesh),
+    e.g. while other mesh formats are exported.
+    Call join() to wait for the file and re-raise a possible writing error.
+    """
+
+    def __init__(self, su2_mesh_path: Path, *args, **kwargs) -> None:
+        super().__init__(name=f"SU2MeshWriter-{Path(su2_mesh_path).name}", daemon=True)
+        self.su2_mesh_path = Path(su2_mesh_path)
+        self.mesh_args = args
+        self.mesh_kwargs = kwargs
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        try:
+            write_su2_mesh(self.su2_mesh_path, *self.mesh_args, **self.mesh_kwargs)
+        except BaseException as err:
+            self.error = err
+
+    def join(self, timeout: float | None = None) -> Path:
+        super().join(timeout)
+        if self.error is not None:
+            log.error(f"Could not write SU2 mesh {self.su2_mesh_path}: {self.error}")
+            raise self.error
+        return self.su2_mesh_path
@@ -16,7 +16,10 @@ import tempfile
 
 import numpy as np
 
-from cpacspy.cpacsfunctions import get_value
+from cpacspy.cpacsfunctions import (
+    get_value,
+    get_value_or_default,
+)
 from tigl3.import_export_helper import export_shapes
 
 from enum import StrEnum
@@ -36,6 +39,7 @@ from ceasiompy.cpacs2gmsh import (
     GMSH_MESH_SIZE_WING_XPATH,
     GMSH_MESH_SIZE_PYLON_XPATH,
     GMSH_XZ_SYMMETRY_XPATH,
+    GMSH_TETGEN_RACE_XPATH,
     GMSH_REFINE_FACTOR_ANGLED_LINES_XPATH,
     GMSH_NUMBER_LAYER_XPATH,
     GMSH_H_FIRST_LAYER_XPATH,
@@ -175,6 +179,7 @@ class AircraftGeometry:
 class MeshSettings(BaseModel):
     symmetry: bool
     add_boundary_layer: bool
+    tetgen_race: bool = False
 
     wing_mesh_size: dict[str, float]
     pylon_mesh_size: dict[str, float]
@@ -262,6 +267,7 @@ def get_2d_mesh_settings(cpacs: CPACS) -> MeshSettings:
     mesh_settings = MeshSettings(
         symmetry=get_value(tixi, xpath=GMSH_XZ_SYMMETRY_XPATH),
         add_boundary_layer=get_value(tixi, xpath=GMSH_ADD_BOUNDARY_LAYER_XPATH),
+        tetgen_race=bool(get_value_or_default(tixi, GMSH_TETGEN_RACE_XPATH, False)),
 
         # Set Mesh Sizes
         wing_mesh_size=_get_mesh_size_by_uid(
@@ -11,7 +11,11 @@ from ceasiompy.utils import get_module_status
 
 from pathlib import Path
 
-from ceasiompy.utils.commonxpaths import CEASIOMPY_XPATH
+from ceasiompy.utils.commonxpaths import (
+    CEASIOMPY_XPATH,
+    AEROPERFORMANCE_XPATH,
+    SELECTED_AEROMAP_XPATH,
+)
 
 # ==============================================================================
 #   INITIALIZATION
@@ -31,6 +35,15 @@ It is a vortex lattice method (VLM) solver for low-fidelity aerodynamic computat
 # ===== Add a Results Directory =====
 RES_DIR = True
 
+# ===== CPACS xpaths read and written (workflow dependency graph) =====
+CPACS_INPUTS = (
+    "/cpacs/header",
+    "/cpacs/vehicles",
+    CEASIOMPY_XPATH + "/avl",
+    SELECTED_AEROMAP_XPATH,
+)
+CPACS_OUTPUTS = (AEROPERFORMANCE_XPATH,)
+
 # ===== Name of Software used =====
 SOFTWARE_NAME = "avl"
 
@@ -14,7 +14,7 @@ import os
 from pydantic import validate_call
 from cpacspy.cpacsfunctions import get_value
 from ceasiompy.utils.ceasiompyutils import (
-    has_display,
+    graphics_enabled,
     get_selected_aeromap_values,
 )
 from ceasiompy.pyavl.func.data import create_case_dir
@@ -80,6 +80,53 @@ def get_command_path(from_case_dir: Path) -> Path:
     return from_case_dir / "avl_commands.txt"
 
 
+def get_mass_path() -> Path:
+    """Template file for mass."""
+    return Path(MODULE_DIR, "files", "template.mass")
+
+
+def get_oper_commands(avl_data: AVLData) -> list[str]:
+    """
+    Returns the AVL commands setting and executing the operating point of avl_data,
+    from the main menu of AVL (geometry and mass already loaded).
+    """
+
+    command = [
+        "oper\n",
+        "a a " + str(avl_data.alpha) + "\n",
+        "b b " + str(avl_data.beta) + "\n",
+        "r r " + str(avl_data.p_star) + "\n",
+        "p p " + str(avl_data.q_star) + "\n",
+        "y y " + str(avl_data.r_star) + "\n",
+        "d2 d2 " + str(avl_data.aileron) + "\n",
+        "d3 d3 " + str(avl_data.elevator) + "\n",
+        "d4 d4 " + str(avl_data.rudder) + "\n",
+        "m\n",
+        "mn " + str(avl_data.mach) + "\n",
+        "g " + str(avl_data.g_acceleration) + "\n",
+        "d " + str(avl_data.ref_density) + "\n",
+        "v " + str(avl_data.ref_velocity) + "\n\n",
+        "x\n",
+    ]
+
+    return command
+
+
+def get_force_file_commands(force_dir: str = "") -> list[str]:
+    """
+    Returns the AVL commands writing the force files (st.txt, fe.txt...) in force_dir,
+    relative to the working directory of AVL, and going back to the main menu of AVL.
+    """
+
+    command = []
+    for force_file in FORCE_FILES:
+        command.append(force_file + "\n")
+        command.append(force_dir + force_file + ".txt\n")
+    command.append("\n\n\n")
+
+    return command
+
+
 def write_command_file(
     i_case: int,
     avl_path: Path,
@@ -118,45 +165,23 @@ def write_command_file(
     case_dir_path = Path(case_dir_path).resolve()
     avl_path_for_cmd = Path(os.path.relpath(avl_path, case_dir_path))
 
-    # Retrieve template file for mass
-    mass_path = Path(MODULE_DIR, "files", "template.mass")
-
     command = [
         "load " + str(avl_path_for_cmd) + "\n",
-        "mass " + str(mass_path) + "\n",
-        "oper\n",
-        "a a " + str(avl_data.alpha) + "\n",
-        "b b " + str(avl_data.beta) + "\n",
-        "r r " + str(avl_data.p_star) + "\n",
-        "p p " + str(avl_data.q_star) + "\n",
-        "y y " + str(avl_data.r_star) + "\n",
-        "d2 d2 " + str(avl_data.aileron) + "\n",
-        "d3 d3 " + str(avl_data.elevator) + "\n",
-        "d4 d4 " + str(avl_data.rudder) + "\n",
-        "m\n",
-        "mn " + str(avl_data.mach) + "\n",
-        "g " + str(avl_data.g_acceleration) + "\n",
-        "d " + str(avl_data.ref_density) + "\n",
-        "v " + str(avl_data.ref_velocity) + "\n\n",
+        "mass " + str(get_mass_path()) + "\n",
     ]
+    command += get_oper_commands(avl_data)
 
     with open(command_path, "w") as command_file:
         command_file.writelines(command)
-        command_file.write("x\n")
 
-        if has_display():
+        if graphics_enabled():
             command_file.writelines(["t\n", "h\n\n"])
             command_file.writelines(["g\n", "lo\n", "h\n\n"])
         else:
-            log.info("No Display available, can not generate plot.ps file.")
+            log.info("No Display available (or graphics disabled), no plot.ps file.")
 
         command_file.write("x\n")
-
-        for force_file in FORCE_FILES:
-            command_file.write(force_file + "\n")
-            command_file.write(force_file + ".txt\n")
-
-        command_file.write("\n\n\n")
+        command_file.writelines(get_force_file_commands())
         command_file.write("quit")
 
     return Path(case_dir_path)
@@ -0,0 +1,278 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Persistent AVL sessions: long-lived AVL processes driven through their stdin/stdout,
+which load the geometry and the mass file once and then run many operating points.
+Each case still gets its force files (st.txt, fe.txt...) and its logfile in its own
+case directory, as with the command files run by one AVL process per case.
+
+AVL writes the force files under short names in its working directory (file names are
+limited in AVL), they are then moved to the case directory.
+
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import os
+import queue
+import signal
+import itertools
+import threading
+import subprocess
+
+from ceasiompy.utils.softwarepaths import get_install_path
+from ceasiompy.utils.ceasiompyutils import with_xvfb
+from ceasiompy.pyavl.func.config import (
+    get_mass_path,
+    get_oper_commands,
+    get_force_file_commands,
+)
+
+from pathlib import Path
+from ceasiompy.pyavl.func.data import AVLData
+
+from ceasiompy import log
+from ceasiompy.pyavl.func import FORCE_FILES
+from ceasiompy.pyavl import SOFTWARE_NAME
+
+# Constants
+
+# Unknown command sent after each block of commands: AVL answers
+# "ZEND command not recognized" once the previous commands are done.
+# AVL echoes (upper case) the first 4 letters of a rejected command, so the answer
+# differs from the ones to other rejected commands (e.g. d4 without 4th control surface).
+END_COMMAND = "zend"
+END_ANSWER = f"{END_COMMAND} command not recognized".upper()
+
+# Time (s) given to AVL to load the geometry and the mass file
+STARTUP_TIMEOUT = 60.0
+
+_SESSION_IDS = itertools.count(1)
+
+
+# Classes
+
+class AVLSession:
+    """One AVL process, in which the geometry is loaded once for all the cases."""
+
+    def __init__(
+        self: AVLSession,
+        avl_path: Path,
+        wkdir: Path,
+        xvfb: bool = True,
+        timeout: float = 300.0,
+    ) -> None:
+        self.avl_path = Path(avl_path).resolve()
+        self.wkdir = Path(wkdir).resolve()
+        self.xvfb = xvfb
+        self.timeout = timeout
+
+        # Prefix of the force files written by AVL in wkdir
+        self.prefix = f"session{next(_SESSION_IDS)}_"
+
+        self._proc: subprocess.Popen | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+
+    @property
+    def is_running(self: AVLSession) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self: AVLSession) -> None:
+        """Start AVL and load the geometry and the mass file."""
+
+        command_line = [str(get_install_path(SOFTWARE_NAME))]
+        if self.xvfb:
+            command_line = with_xvfb(command_line)
+
+        # AVL (gfortran) only flushes its output on line ends when it is not buffered
+        env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED="y")
+        self._proc = subprocess.Popen(
+            command_line,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=self.wkdir,
+            env=env,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            start_new_session=True,
+        )
+
+        # Fresh queue: lines of a killed process are not mixed with the new ones
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_output,
+            args=(self._proc.stdout, self._lines),
+            name=f"{SOFTWARE_NAME} session {self._proc.pid}",
+            daemon=True,
+        ).start()
+
+        avl_path_for_cmd = os.path.relpath(self.avl_path, self.wkdir)
+        self._run_commands(
+            ["load " + avl_path_for_cmd + "\n", "mass " + str(get_mass_path()) + "\n"],
+            timeout=STARTUP_TIMEOUT,
+        )
+        log.info(f"{SOFTWARE_NAME} session started (pid {self._proc.pid}).")
+
+    @staticmethod
+    def _read_output(stdout, lines: queue.Queue) -> None:
+        for line in stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _run_commands(
+        self: AVLSession,
+        commands: list[str],
+        timeout: float,
+        logfile=None,
+    ) -> None:
+        """Send commands to AVL and wait until they are all done."""
+
+        # Drop the output left by previous commands, if any
+        while True:
+            try:
+                line = self._lines.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                raise RuntimeError(
+                    f"{SOFTWARE_NAME} session stopped (exit code {self._proc.wait()})."
+                )
+
+        try:
+            self._proc.stdin.writelines(commands + [END_COMMAND + "\n"])
+            self._proc.stdin.flush()
+        except OSError as err:
+            raise RuntimeError(f"{SOFTWARE_NAME} session is not running: {err}") from err
+
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"{SOFTWARE_NAME} did not answer within {timeout}s.")
+
+            if line is None:
+                raise RuntimeError(
+                    f"{SOFTWARE_NAME} session stopped (exit code {self._proc.wait()})."
+                )
+            if END_ANSWER in line.upper():
+                return None
+            if logfile is not None:
+                logfile.write(line)
+                logfile.flush()
+
+    def run_case(self: AVLSession, case_dir: Path) -> None:
+        """Run the operating point saved in case_dir (avldata.json)."""
+
+        case_dir = Path(case_dir).resolve()
+        avl_data = AVLData.load_json(case_dir / "avldata.json")
+
+        # AVL asks before overwriting a file
+        for force_file in FORCE_FILES:
+            Path(self.wkdir, self.prefix + force_file + ".txt").unlink(missing_ok=True)
+
+        commands = get_oper_commands(avl_data) + ["x\n"] + get_force_file_commands(self.prefix)
+
+        with open(case_dir / f"logfile_{SOFTWARE_NAME}.log", "w") as logfile:
+            self._run_commands(commands, timeout=self.timeout, logfile=logfile)
+
+        if not Path(self.wkdir, self.prefix + "st.txt").exists():
+            raise RuntimeError(f"{SOFTWARE_NAME} did not write the force files of {case_dir}.")
+
+        for force_file in FORCE_FILES:
+            session_file = Path(self.wkdir, self.prefix + force_file + ".txt")
+            if session_file.exists():
+                session_file.replace(Path(case_dir, force_file + ".txt"))
+
+    def close(self: AVLSession) -> None:
+        """Quit AVL, or kill it (and xvfb-run) if it does not answer."""
+
+        if self._proc is None:
+            return None
+
+        proc, self._proc = self._proc, None
+        try:
+            proc.stdin.write("\n\n\nquit\n")
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (AttributeError, ProcessLookupError):
+                proc.kill()
+            proc.wait()
+
+
+class AVLSessionPool:
+    """
+    Sessions sharing one AVL geometry, used by the threads running the cases.
+    A session is started when no idle session is left, so there are as many
+    sessions as cases run concurrently.
+    """
+
+    def __init__(
+        self: AVLSessionPool,
+        avl_path: Path,
+        wkdir: Path,
+        xvfb: bool = True,
+        timeout: float = 300.0,
+    ) -> None:
+        self.avl_path = avl_path
+        self.wkdir = wkdir
+        self.xvfb = xvfb
+        self.timeout = timeout
+
+        self._idle: queue.Queue[AVLSession] = queue.Queue()
+        self._sessions: list[AVLSession] = []
+        self._lock = threading.Lock()
+
+    def _get_session(self: AVLSessionPool) -> AVLSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        session = AVLSession(self.avl_path, self.wkdir, self.xvfb, self.timeout)
+        with self._lock:
+            self._sessions.append(session)
+
+        return session
+
+    def run_case(self: AVLSessionPool, case_dir: Path) -> None:
+        """Run a case in an idle session, restarting the session once if it hangs or dies."""
+
+        session = self._get_session()
+        try:
+            try:
+                if not session.is_running:
+                    session.start()
+                session.run_case(case_dir)
+            except (TimeoutError, RuntimeError) as err:
+                log.warning(f"{err} Restarting the {SOFTWARE_NAME} session for {case_dir}.")
+                session.close()
+                session.start()
+                session.run_case(case_dir)
+        except BaseException:
+            # Started again by the next case
+            session.close()
+            raise
+        finally:
+            self._idle.put(session)
+
+    def close(self: AVLSessionPool) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def __enter__(self: AVLSessionPool) -> AVLSessionPool:
+        return self
+
+    def __exit__(self: AVLSessionPool, *exc_info) -> None:
+        self.close()
@@ -10,16 +10,22 @@ AVL allows to perform aerodynamic analyses using the vortex-lattice method (VLM)
 # Imports
 import time
 
+from contextlib import ExitStack
 from concurrent.futures import wait
+from ceasiompy.pyavl.func.session import AVLSessionPool
 from ceasiompy.pyavl.func.plot import convert_ps_to_pdf
 from ceasiompy.pyavl.func.results import get_avl_results
 from ceasiompy.utils.referencevalues import get_ref_values
 from ceasiompy.pyavl.func.avllog import estimate_case_progress_from_log
 from ceasiompy.utils.ceasiompyutils import (
-    has_display,
     run_software,
+    graphics_enabled,
     get_sane_max_cpu,
 )
+from ceasiompy.utils.cpugovernor import (
+    cpu_lease,
+    init_worker_lease,
+)
 from ceasiompy.pyavl.func.utils import (
     duplicate_elements,
 )
@@ -33,7 +39,10 @@ from pathlib import Path
 from typing import Callable
 from cpacspy.cpacspy import CPACS
 from ceasiompy.pyavl.func.data import AVLData
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+)
 
 from concurrent.futures import FIRST_COMPLETED
 from ceasiompy.pyavl import (
@@ -46,17 +55,19 @@ from ceasiompy.pyavl import (
 def run_case(case_dir_path: Path) -> None:
     '''
     Runs the created avl cases separately on 1 CPU.
+    Without graphics, the command file has no plot commands and no X server is needed.
     '''
+    graphics = graphics_enabled()
     run_software(
         software_name=SOFTWARE_NAME,
         arguments=[""],
         wkdir=case_dir_path,
         with_mpi=False,
         stdin=open(str(get_command_path(case_dir_path)), "r"),
-        xvfb=True,
+        xvfb=graphics,
         timeout=300,  # 5 min max per AVL case; kills hanging xvfb-run/avl processes
     )
-    if has_display():
+    if graphics:
         convert_ps_to_pdf(case_dir_path)
 
 
@@ -191,8 +202,26 @@ def main(
 
     start_t = time.monotonic()
     completed = 0
-    with ProcessPoolExecutor(max_workers=get_sane_max_cpu()) as executor:
-        future_to_args = {executor.submit(run_case, args): args for args in case_args}
+    # Inside a worker of a pool (e.g. SMTrain), only the CPUs of the worker are used
+    with cpu_lease(get_sane_max_cpu()) as nb_workers, ExitStack() as stack:
+        if graphics_enabled():
+            # AVL writes the plots in its working directory: one process per case
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=nb_workers,
+                initializer=init_worker_lease,
+                initargs=(1,),
+            ))
+            run = run_case
+        else:
+            # Geometry loaded once per AVL process, which then runs many cases.
+            # No plot commands are sent: AVL runs without (virtual) X server.
+            session_pool = stack.enter_context(
+                AVLSessionPool(avl_path, results_dir, xvfb=False)
+            )
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=nb_workers))
+            run = session_pool.run_case
+
+        future_to_args = {executor.submit(run, args): args for args in case_args}
 
         while future_to_args:
             done, not_done = wait(
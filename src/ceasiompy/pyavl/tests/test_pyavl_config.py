@@ -12,6 +12,7 @@ from cpacspy.cpacsfunctions import create_branch
 from ceasiompy.utils.decorators import log_test
 from ceasiompy.pyavl.func.config import (
     retrieve_gui_values,
+    get_force_file_commands,
 )
 from ceasiompy.utils.ceasiompyutils import (
     current_workflow_dir,
@@ -102,6 +103,15 @@ class TestPyAVLConfig(CeasiompyTest):
             expected=([1000.0], [0.3], [5.0], [0.0]),
         )
 
+    @log_test
+    def test_get_force_file_commands(self) -> None:
+        command = get_force_file_commands("session1_")
+
+        assert command[:2] == ["ft\n", "session1_ft.txt\n"]
+        assert "st\n" in command
+        assert "session1_st.txt\n" in command
+        assert command[-1] == "\n\n\n"
+
 
 # Main
 
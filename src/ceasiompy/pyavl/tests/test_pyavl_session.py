@@ -0,0 +1,167 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'pyavl/func/session.py'
+"""
+
+# Imports
+
+import sys
+import pytest
+
+from ceasiompy.pyavl.func import session
+from ceasiompy.pyavl.func.session import (
+    AVLSession,
+    AVLSessionPool,
+)
+
+from pathlib import Path
+from ceasiompy.pyavl.func.data import AVLData
+
+from ceasiompy.pyavl.func import FORCE_FILES
+from ceasiompy.pyavl import SOFTWARE_NAME
+
+# Stand-in for AVL: answers the commands on stdin as AVL does and writes the force files.
+# A "hang" (or "die") file in its working directory makes it hang (or exit) once in OPER.
+AVL_STUB = '''
+import sys
+import time
+from pathlib import Path
+
+FORCE_FILES = {force_files!r}
+
+print(" AVL stub")
+force_file = None
+for line in sys.stdin:
+    command = line.split()[0] if line.split() else ""
+    if force_file is not None:
+        Path(command).write_text(force_file + " forces\\n")
+        force_file = None
+    elif command in FORCE_FILES:
+        force_file = command
+    elif command == "oper":
+        for name, action in (("hang", lambda: time.sleep(3600)), ("die", lambda: sys.exit(3))):
+            if Path(name).exists():
+                Path(name).unlink()
+                action()
+        print(" Operation of run case 1/1")
+    elif command == "d4":
+        # No 4th control surface
+        print(" D4   command not recognized.  Type a \\"?\\" for list")
+    elif command == "quit":
+        break
+    elif command not in ("", "load", "mass", "a", "b", "r", "p", "y", "d2", "d3", "m", "mn",
+                         "g", "d", "v", "x"):
+        print(f" {{command[:4].upper()}} command not recognized.  Type a \\"?\\" for list")
+    sys.stdout.flush()
+'''
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@pytest.fixture
+def avl_stub(tmp_path, monkeypatch):
+    avl_stub_path = Path(tmp_path, "avl")
+    avl_stub_path.write_text(
+        f"#!{sys.executable}\n" + AVL_STUB.format(force_files=FORCE_FILES)
+    )
+    avl_stub_path.chmod(0o755)
+
+    wkdir = Path(tmp_path, "results")
+    wkdir.mkdir()
+    avl_path = Path(wkdir, "aircraft.avl")
+    avl_path.touch()
+
+    monkeypatch.setattr(session, "get_install_path", lambda software_name: avl_stub_path)
+    monkeypatch.setattr(session, "get_mass_path", lambda: Path(tmp_path, "template.mass"))
+
+    return avl_path, wkdir
+
+
+def _write_case(wkdir: Path, name: str) -> Path:
+    case_dir = Path(wkdir, name)
+    AVLData(
+        ref_area=10.0, ref_length=1.0, altitude=1000.0, mach=0.3, alpha=2.0, beta=0.0,
+    ).save_json(case_dir / "avldata.json")
+    return case_dir
+
+
+def test_session_run_case(avl_stub):
+
+    avl_path, wkdir = avl_stub
+    session = AVLSession(avl_path, wkdir, xvfb=False, timeout=10.0)
+    try:
+        session.start()
+        for name in ("Case00_alt1000_mach0.3", "Case01_alt1000_mach0.3"):
+            case_dir = _write_case(wkdir, name)
+            session.run_case(case_dir)
+
+            # The force files are moved from the working directory to the case directory
+            for force_file in FORCE_FILES:
+                assert Path(case_dir, force_file + ".txt").read_text() == force_file + " forces\n"
+            assert not list(wkdir.glob(session.prefix + "*"))
+
+            # The rejected d4 command does not end the case
+            log = Path(case_dir, f"logfile_{SOFTWARE_NAME}.log").read_text()
+            assert "D4   command not recognized" in log
+            assert "Operation of run case" in log
+            assert "ZEND" not in log
+    finally:
+        session.close()
+
+    assert not session.is_running
+
+
+def test_session_timeout(avl_stub):
+
+    avl_path, wkdir = avl_stub
+    session = AVLSession(avl_path, wkdir, xvfb=False, timeout=1.0)
+    try:
+        session.start()
+        Path(wkdir, "hang").touch()
+        with pytest.raises(TimeoutError):
+            session.run_case(_write_case(wkdir, "Case00_alt1000_mach0.3"))
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("failure", ["hang", "die"])
+def test_session_pool_restarts(avl_stub, failure):
+
+    avl_path, wkdir = avl_stub
+    with AVLSessionPool(avl_path, wkdir, xvfb=False, timeout=1.0) as session_pool:
+        Path(wkdir, failure).touch()
+        case_dir = _write_case(wkdir, "Case00_alt1000_mach0.3")
+        session_pool.run_case(case_dir)
+
+        # Run in a new AVL process, which is then used for the next case
+        assert not Path(wkdir, failure).exists()
+        assert Path(case_dir, "st.txt").exists()
+        assert len(session_pool._sessions) == 1
+
+        case_dir = _write_case(wkdir, "Case01_alt1000_mach0.3")
+        session_pool.run_case(case_dir)
+        assert Path(case_dir, "st.txt").exists()
+        assert len(session_pool._sessions) == 1
+
+    assert not session_pool._sessions
+
+
+def test_session_pool_fails_twice(avl_stub):
+
+    avl_path, wkdir = avl_stub
+    with AVLSessionPool(avl_path, wkdir, xvfb=False, timeout=1.0) as session_pool:
+        # The session dies again after its restart
+        Path(wkdir, "die").touch()
+        Path(wkdir, "hang").touch()
+        with pytest.raises((TimeoutError, RuntimeError)):
+            session_pool.run_case(_write_case(wkdir, "Case00_alt1000_mach0.3"))
+
+        # Started again by the next case
+        case_dir = _write_case(wkdir, "Case01_alt1000_mach0.3")
+        session_pool.run_case(case_dir)
+        assert Path(case_dir, "st.txt").exists()
@@ -10,18 +10,22 @@ Get settings from GUI. Manage data_frames and perform LHS when required.
 
 import numpy as np
 
-from shutil import copyfile
 from cpacspy.cpacsfunctions import (
     get_value,
-    create_branch,
     get_string_vector,
 )
-from scipy.optimize import differential_evolution
+from scipy.optimize import (
+    minimize,
+    differential_evolution,
+)
 from ceasiompy.utils.geometryfunctions import get_xpath_for_param
+from ceasiompy.utils.cpugovernor import cpu_lease
+from ceasiompy.utils.profiling import profiled
 from ceasiompy.smtrain.func.utils import (
     get_columns,
     domain_converter,
     get_model_typename,
+    write_patched_cpacs,
 )
 from ceasiompy.utils.ceasiompyutils import (
     aircraft_name,
@@ -31,6 +35,8 @@ from ceasiompy.utils.ceasiompyutils import (
 
 from pathlib import Path
 from numpy import ndarray
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from pandas import DataFrame
 from smt.applications import MFK
 from scipy.optimize import Bounds
@@ -40,6 +46,7 @@ from scipy.optimize import OptimizeResult
 from ceasiompy.database.func.storing import CeasiompyDb
 from ceasiompy.smtrain.func.utils import (
     GeomBounds,
+    GeomVariant,
     TrainingSettings,
 )
 from smt.surrogate_models import (
@@ -210,6 +217,7 @@ def design_of_experiment(cpacs: CPACS) -> tuple[int, dict[str, list[float]]]:
     return n_samples, range_params_aeromap
 
 
+@profiled
 def get_params_to_optimise(cpacs: CPACS) -> GeomBounds:
 
     """
@@ -298,16 +306,12 @@ def get_params_to_optimise(cpacs: CPACS) -> GeomBounds:
 
 
 def update_geometry_cpacs(cpacs_path_in: Path, cpacs_path_out: Path, geom_params: dict) -> CPACS:
-    cpacs_in = CPACS(cpacs_path_in)
-    tixi = cpacs_in.tixi
+    patch = {}
     for param_name, param_info in geom_params.items():
         values = param_info["values"]
         xpaths = param_info["xpath"]
 
         for val, xp in zip(values, xpaths):
-            # create the branch if it does not exist
-            create_branch(tixi, xp)
-
             # check that val is a single value
             if hasattr(val, "__len__") and not isinstance(val, (str, bytes)):
                 if len(val) == 1:
@@ -318,72 +322,70 @@ def update_geometry_cpacs(cpacs_path_in: Path, cpacs_path_out: Path, geom_params
                         "than one element, need a scalar value."
                     )
 
-            tixi.updateDoubleElement(xp, float(val), "%g")
+            patch[xp] = float(val)
 
-    cpacs_in.save_cpacs(cpacs_path_out, overwrite=True)
+    write_patched_cpacs(cpacs_path_in, cpacs_path_out, patch)
     return CPACS(cpacs_path_out)
 
 
+@profiled
 def create_list_cpacs_geometry(
     cpacs: CPACS,
     results_dir: Path,
     sampled_geom: DataFrame,
-) -> list[CPACS]:
-    log.info("Creating CPACS file from LHS samples.")
+) -> list[GeomVariant]:
+    """
+    Returns the geometry variants of the LHS samples,
+    their CPACS files are written by the workers (see GeomVariant.materialize).
+    """
+    log.info("Creating geometry variants from LHS samples.")
 
     # Constants
     tixi = cpacs.tixi
 
     cpacs_name = cpacs.ac_name
-    cpacs_path_in = cpacs.cpacs_file
+    cpacs_path_in = Path(cpacs.cpacs_file)
 
     generated_cpacs_dir = results_dir / "generated_cpacs"
     generated_cpacs_dir.mkdir(exist_ok=True)
 
+    # Same xpath for a column in all the samples
+    xpaths = {}
+    for col in sampled_geom.columns:
+        if "_of_" not in col:
+            raise ValueError(f"Syntax: _of_ i.e. {col=} is not a valid parameter.")
+
+        # SYNTAX: {comp}_of_{section}_of_{param}
+        col_parts = col.split('_of_')
+        xpaths[col] = get_xpath_for_param(
+            tixi=tixi,
+            param=col_parts[0],
+            wing_uid=col_parts[2],
+            section_uid=col_parts[1],
+        )
+
     # Variables
     cpacs_list = []
 
     # Loop for each configuration
     for i, geom_row in sampled_geom.iterrows():
         cpacs_out = generated_cpacs_dir / f"{cpacs_name}_{i + 1:03d}.xml"
-        copyfile(cpacs.cpacs_file, cpacs_out)
-
-        params_to_update = {}
-        for col in sampled_geom.columns:
-            if "_of_" not in col:
-                raise ValueError(f"Syntax: _of_ i.e. {col=} is not a valid parameter.")
-
-            # SYNTAX: {comp}_of_{section}_of_{param}
-            col_parts = col.split('_of_')
-            param = col_parts[0]
-            wing_uid = col_parts[2]
-            section_uid = col_parts[1]
-            val = geom_row[col]
-
-            xpath = get_xpath_for_param(
-                tixi=tixi,
-                param=param,
-                wing_uid=wing_uid,
-                section_uid=section_uid,
-            )
 
-            if param not in params_to_update:
-                params_to_update[param] = {'values': [], 'xpath': []}
+        # A previous run may have left a file of another sample
+        cpacs_out.unlink(missing_ok=True)
 
-            params_to_update[param]['values'].append(val)
-            params_to_update[param]['xpath'].append(xpath)
-
-        # Update CPACS file
-        cpacs_obj = update_geometry_cpacs(
-            cpacs_path_in=cpacs_path_in,
-            cpacs_path_out=cpacs_out,
-            geom_params=params_to_update,
+        cpacs_list.append(
+            GeomVariant(
+                base_cpacs=cpacs_path_in,
+                cpacs_file=cpacs_out,
+                patch={xpaths[col]: float(geom_row[col]) for col in sampled_geom.columns},
+            )
         )
-        cpacs_list.append(cpacs_obj)
 
     return cpacs_list
 
 
+@profiled
 def normalize_data(
     cpacs: CPACS,
     data_frame: DataFrame,
@@ -516,10 +518,16 @@ def optimize_surrogate(
     geom_bounds: GeomBounds,
     aeromap_norm_df: DataFrame,
     training_settings: TrainingSettings,
+    workers: int = 1,
+    n_starts: int = 4,
 ) -> tuple[OptimizeResult, float]:
     """
     Run global optimization on a surrogate model.
     Returns optimal normalized/physical parameters.
+
+    The whole population of the differential evolution is predicted at once
+    (split between workers threads if workers > 1), then the n_starts best members
+    of the last population are polished with a local (L-BFGS-B) optimization.
     """
 
     model_name = get_model_typename(model)
@@ -534,19 +542,28 @@ def optimize_surrogate(
                 dtype=float, copy=False
             )
 
-    def build_x_full(x_norm_row: ndarray) -> ndarray:
+    def build_x_full(x_norm_rows: ndarray) -> ndarray:
         if aeromap_values is None or aeromap_values.size == 0:
-            return x_norm_row
+            return x_norm_rows
         n = aeromap_values.shape[0]
-        geom_block = np.repeat(x_norm_row, repeats=n, axis=0)
-        return np.concatenate([geom_block, aeromap_values], axis=1)
+        geom_block = np.repeat(x_norm_rows, repeats=n, axis=0)
+        aero_block = np.tile(aeromap_values, (x_norm_rows.shape[0], 1))
+        return np.concatenate([geom_block, aero_block], axis=1)
+
+    def predict_mean(x_norm_rows: ndarray) -> ndarray:
+        """Mean prediction over the aeromap of each geometry (row)."""
+        y_pred = model.predict_values(build_x_full(x_norm_rows)).ravel()
+        return y_pred.reshape(x_norm_rows.shape[0], -1).mean(axis=1)
 
-    def surrogate_objective(x_norm: ndarray) -> float:
+    def surrogate_objective(x_norm: ndarray) -> ndarray:
+        # Vectorized: x_norm is (n_params, n_candidates)
         try:
-            x_norm = np.asarray(x_norm).reshape(1, -1)
-            x_full = build_x_full(x_norm)
-            y_pred_vec = model.predict_values(x_full).ravel()
-            y_pred = float(np.mean(y_pred_vec))
+            x_rows = np.asarray(x_norm).reshape(len(geom_bounds.bounds.lb), -1).T
+            if executor is not None and x_rows.shape[0] > 1:
+                chunks = np.array_split(x_rows, min(workers, x_rows.shape[0]))
+                y_pred = np.concatenate(list(executor.map(predict_mean, chunks)))
+            else:
+                y_pred = predict_mean(x_rows)
 
             # TODO: use a loss function
             return direction * y_pred
@@ -557,20 +574,41 @@ def optimize_surrogate(
 
     log.info(f"Starting best geometry search on {model_name} surrogate ---")
 
-    opt_result = differential_evolution(
-        func=surrogate_objective,
-        bounds=geom_bounds.bounds,
-        tol=1e-3,
-        maxiter=1000,
-        polish=True,
-    )
+    with ExitStack() as stack:
+        executor = None
+        if workers > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+
+        opt_result = differential_evolution(
+            func=surrogate_objective,
+            bounds=geom_bounds.bounds,
+            tol=1e-3,
+            maxiter=1000,
+            polish=False,
+            vectorized=True,
+            updating="deferred",
+        )
+
+        # Multi-start polishing from the best distinct members of the last population
+        population = getattr(opt_result, "population", np.atleast_2d(opt_result.x))
+        energies = getattr(opt_result, "population_energies", np.array([opt_result.fun]))
+        population = population[np.argsort(energies)]
+        _, first_idx = np.unique(population, axis=0, return_index=True)
+        for x_start in population[np.sort(first_idx)][:n_starts]:
+            local_result = minimize(
+                fun=lambda x: float(surrogate_objective(x.reshape(-1, 1))[0]),
+                x0=x_start,
+                method="L-BFGS-B",
+                bounds=geom_bounds.bounds,
+            )
+            if local_result.success and local_result.fun < opt_result.fun:
+                opt_result.x, opt_result.fun = local_result.x, local_result.fun
 
     log.info("Finished finding best geometry from surrogate model functional space.")
 
     # Compute f(x_opt) = y_opt
     x_opt = np.array(opt_result.x).reshape(1, -1)
-    x_full = build_x_full(x_opt)
-    y_opt = float(np.mean(model.predict_values(x_full).ravel()))
+    y_opt = float(predict_mean(x_opt)[0])
 
     return opt_result, y_opt
 
@@ -588,10 +626,13 @@ def save_best_surrogate_geometry(
     """
     _ = get_model_typename(best_model)
 
-    _, _ = optimize_surrogate(
-        model=best_model,
-        geom_bounds=geom_bounds,
-        aeromap_norm_df=aeromap_norm_df,
-        training_settings=training_settings,
-    )
+    # The surrogate predictions are split between the leased CPUs
+    with cpu_lease() as workers:
+        _, _ = optimize_surrogate(
+            model=best_model,
+            geom_bounds=geom_bounds,
+            aeromap_norm_df=aeromap_norm_df,
+            training_settings=training_settings,
+            workers=workers,
+        )
     raise NotImplementedError
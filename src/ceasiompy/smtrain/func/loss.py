@@ -25,7 +25,7 @@ from smt.surrogate_models import (
 # Methods
 
 def _compute_loss(
-    model: KRG | MFK,
+    model: KRG | MFK | RBF,
     x_: ndarray,
     y_: ndarray,
     lambda_penalty: float = 0.0,
@@ -38,6 +38,23 @@ def _compute_loss(
 
 # Functions
 
+def get_model_loss(
+    model: KRG | MFK | RBF,
+    x_: ndarray,
+    y_: ndarray,
+    lambda_penalty: float = 0.0,
+) -> float:
+    """
+    Returns the loss of an already trained model on the x_, y_ set.
+    """
+    return _compute_loss(
+        x_=x_,
+        y_=y_,
+        model=model,
+        lambda_penalty=lambda_penalty,
+    )
+
+
 def compute_rbf_loss(
     params: tuple,
     x_: ndarray,
@@ -13,9 +13,17 @@ import numpy as np
 from copy import deepcopy
 from sklearn.model_selection import train_test_split
 from ceasiompy.smtrain.func.utils import get_val_fraction
+from ceasiompy.utils.profiling import profiled
 
 from numpy import ndarray
 from pandas import DataFrame
+from scipy.spatial.distance import cdist
+from scipy.linalg import (
+    lu_solve,
+    lu_factor,
+    cho_solve,
+    cho_factor,
+)
 from smt.applications import MFK
 from smt.sampling_methods import LHS
 from smt.surrogate_models import (
@@ -33,6 +41,7 @@ from ceasiompy import log
 
 # Functions
 
+@profiled
 def sample_geom(
     geom_bounds: GeomBounds,
     training_settings: TrainingSettings,
@@ -97,6 +106,7 @@ def sample_geom(
     })
 
 
+@profiled
 def get_high_variance_points(
     model: KRG | MFK,
     level1_split: DataSplit,
@@ -154,6 +164,114 @@ def get_high_variance_points(
     return DataFrame(x[high_idx], columns=columns)
 
 
+def _rbf_kernel_matrix(model: RBF, x: ndarray, xt: ndarray) -> ndarray:
+    """
+    Matrix of the RBF basis (gaussian kernels and polynomial terms) of the
+    SMT RBF model centred on xt, evaluated at x.
+    """
+
+    d0 = np.broadcast_to(np.asarray(model.options["d0"], dtype=float), (x.shape[1],))
+    columns = [np.exp(-cdist(x / d0, xt / d0, "sqeuclidean"))]
+
+    poly_degree = int(model.options["poly_degree"])
+    if poly_degree >= 0:
+        columns.append(np.ones((x.shape[0], 1)))
+    if poly_degree >= 1:
+        columns.append(x)
+
+    return np.hstack(columns)
+
+
+def get_rbf_loo_residuals(model: RBF, x: ndarray, y: ndarray) -> ndarray | None:
+    """
+    Exact leave-one-out residuals y_i - s_{-i}(x_i) of an SMT RBF model trained on (x, y),
+    for all the samples and outputs, from a single factorisation of the RBF system
+    (Rippa, 1999): e_i = c_i / (A^-1)_ii with c = A^-1 [y, 0].
+
+    Returns None if the closed form does not reproduce the SMT model
+    (the brute-force LOO is then used).
+    """
+
+    y = y.reshape(x.shape[0], -1)
+    n_samples = x.shape[0]
+
+    mtx = _rbf_kernel_matrix(model, x, x)
+    n_poly = mtx.shape[1] - n_samples
+    mtx = np.vstack([mtx, np.hstack([mtx[:, n_samples:].T, np.zeros((n_poly, n_poly))])])
+    mtx[np.arange(n_samples), np.arange(n_samples)] += float(model.options["reg"])
+
+    # Without polynomial terms the system is symmetric positive definite
+    identity = np.eye(mtx.shape[0])
+    try:
+        if n_poly == 0:
+            mtx_inv = cho_solve(cho_factor(mtx), identity)
+        else:
+            mtx_inv = lu_solve(lu_factor(mtx), identity)
+    except (np.linalg.LinAlgError, ValueError) as err:
+        log.warning(f"RBF system could not be factorised for the closed-form LOO: {err}")
+        return None
+
+    rhs = np.vstack([y, np.zeros((n_poly, y.shape[1]))])
+    coefs = mtx_inv @ rhs
+
+    # Same interpolant as SMT? (kernel definition, options). Loose tolerance:
+    # the RBF systems are ill-conditioned, the two solvers do not agree exactly.
+    model_all = deepcopy(model)
+    model_all.set_training_values(x, y)
+    model_all.train()
+    x_probe = 0.5 * (x[:-1] + x[1:])[:5]
+    y_probe = _rbf_kernel_matrix(model, x_probe, x) @ coefs
+    y_smt = np.asarray(model_all.predict_values(x_probe)).reshape(y_probe.shape)
+    scale = max(float(np.max(np.abs(y))), 1.0)
+    if not np.allclose(y_probe, y_smt, rtol=1e-3, atol=1e-3 * scale):
+        log.warning("Closed-form LOO does not reproduce the RBF model, using brute-force LOO.")
+        return None
+
+    diag = np.diag(mtx_inv)[:n_samples, None]
+    return coefs[:n_samples] / diag
+
+
+def _get_brute_force_loo_residuals(model: RBF | KRG, x: ndarray, y: ndarray) -> ndarray:
+    """
+    Leave-one-out residuals of all the outputs (same shape as get_rbf_loo_residuals),
+    retraining the model without each sample.
+    """
+
+    y = y.reshape(x.shape[0], -1)
+    residuals = np.full(y.shape, np.nan, dtype=float)
+
+    for i in range(x.shape[0]):
+        x_loo = np.delete(x, i, axis=0)
+        y_loo = np.delete(y, i, axis=0)
+        try:
+            model_loo = deepcopy(model)
+            model_loo.set_training_values(x_loo, y_loo)
+            model_loo.train()
+            y_pred_i = np.asarray(model_loo.predict_values(x[i].reshape(1, -1))).ravel()
+            residuals[i] = y[i] - y_pred_i
+        except Exception as e:
+            log.warning(f"LOO failed at idx {i}: {e}")
+
+    return residuals
+
+
+def get_loo_errors(model: RBF | KRG, x: ndarray, y: ndarray) -> ndarray:
+    """
+    Absolute leave-one-out error of each sample (largest over the outputs).
+    Closed form for RBF models, brute-force retraining for the other models.
+    """
+
+    residuals = None
+    if isinstance(model, RBF) and x.shape[0] > 1:
+        residuals = get_rbf_loo_residuals(model, x, y)
+
+    if residuals is None:
+        residuals = _get_brute_force_loo_residuals(model, x, y)
+
+    return np.abs(residuals).max(axis=1)
+
+
+@profiled
 def get_loo_points(
     model: RBF,
     level1_split: DataSplit,
@@ -170,20 +288,7 @@ def get_loo_points(
         log.warning("Not enough samples for LOO.")
         return DataFrame()
 
-    loo_error = np.full(n_samples, np.nan, dtype=float)
-
-    for i in range(n_samples):
-        x_loo = np.delete(x, i, axis=0)
-        y_loo = np.delete(y, i, axis=0)
-        try:
-            model_loo = deepcopy(model)
-            model_loo.set_training_values(x_loo, y_loo)
-            model_loo.train()
-            y_pred_i = model_loo.predict_values(x[i].reshape(1, -1)).ravel()[0]
-            loo_error[i] = abs(y_pred_i - y[i])
-        except Exception as e:
-            log.warning(f"LOO failed at idx {i}: {e}")
-            loo_error[i] = np.nan
+    loo_error = get_loo_errors(model, x, y)
 
     finite_mask = np.isfinite(loo_error)
     if not np.any(finite_mask):
@@ -225,6 +330,7 @@ def get_loo_points(
     return DataFrame(x[high_idx], columns=columns)
 
 
+@profiled
 def split_data(
     data_frame: DataFrame,
     training_settings: TrainingSettings,
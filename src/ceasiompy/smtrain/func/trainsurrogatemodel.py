@@ -7,26 +7,37 @@ Functions related to the training of the surrogate model.
 """
 
 # Imports
+import os
 import time
 import numpy as np
 import pandas as pd
+import multiprocessing
 import concurrent.futures
 
-from skopt import gp_minimize
+from contextlib import ExitStack
+
+from skopt import Optimizer
 from ceasiompy.pyavl.pyavl import main as run_avl
 from ceasiompy.utils.ceasiompyutils import get_sane_max_cpu
+from ceasiompy.utils.cpugovernor import (
+    cpu_lease,
+    init_worker_lease,
+)
+from ceasiompy.utils.profiling import profiled
 from ceasiompy.staticstability.staticstability import main as run_staticstability
 from ceasiompy.smtrain.func.hyperparameters import (
     get_hyperparam_space_rbf,
     get_hyperparam_space_kriging,
 )
 from ceasiompy.smtrain.func.loss import (
+    get_model_loss,
     compute_rbf_loss,
     compute_kriging_loss,
 )
 from ceasiompy.smtrain.func.createdata import (
     launch_gmsh_su2,
 )
+from ceasiompy.su2run.func.runconfigfiles import get_su2_job_layout
 from ceasiompy.smtrain.func.utils import (
     log_params_krg,
     log_params_rbf,
@@ -36,11 +47,15 @@ from ceasiompy.smtrain.func.config import (
 )
 from pathlib import Path
 from typing import Callable
+from numpy import ndarray
 from pandas import DataFrame
 from smt.applications import MFK
 from cpacspy.cpacspy import CPACS
 from scipy.optimize import OptimizeResult
-from ceasiompy.smtrain.func.utils import DataSplit
+from ceasiompy.smtrain.func.utils import (
+    DataSplit,
+    GeomVariant,
+)
 from ceasiompy.smtrain.func.config import TrainingSettings
 from smt.surrogate_models import (
     KRG,
@@ -54,15 +69,18 @@ from ceasiompy.su2run import MODULE_NAME as SU2RUN
 
 # Functions
 
+@profiled
 def get_best_krg_model(
     level1_split: DataSplit,
     level2_split: DataSplit | None = None,
     level3_split: DataSplit | None = None,
     n_calls: int = 10,
     random_state: int = 42,
+    n_jobs: int | None = None,
 ) -> tuple[KRG | MFK, float]:
     """
     Trains a multi-fidelity kriging model (with 2/3 fidelity levels).
+    The hyperparameters are searched with n_jobs concurrent fits (see search_hyper_parameters).
     """
     hyperparam_space = get_hyperparam_space_kriging(
         level1_split=level1_split,
@@ -93,35 +111,17 @@ def get_best_krg_model(
         axis=0,
     )
 
-    successful_params: list[tuple[list, float]] = []
-
-    def objective(params) -> float:
-        try:
-            _, loss = compute_kriging_loss(
-                params=params,
-                level1_split=level1_split,
-                level2_split=level2_split,
-                level3_split=level3_split,
-                x_=x_val,
-                y_=y_val,
-            )
-        except Exception as exc:
-            # Keep BO running when SMT fails on ill-conditioned combinations.
-            log.warning(f"KRG hyperparameter set failed ({params=}): {exc!r}")
-            return 1e30
-
-        loss = float(loss)
-        if not np.isfinite(loss):
-            return 1e30
-
-        successful_params.append((list(params), loss))
-        return loss
-
-    best_result = optimize_hyper_parameters(
-        objective=objective,
+    best_result, fitted_models = search_hyper_parameters(
+        model_type="KRG",
+        hyperparam_space=hyperparam_space,
+        level1_split=level1_split,
+        level2_split=level2_split,
+        level3_split=level3_split,
+        x_val=x_val,
+        y_val=y_val,
         n_calls=n_calls,
         random_state=random_state,
-        hyperparam_space=hyperparam_space,
+        n_jobs=n_jobs,
     )
     log_params_krg(best_result)
 
@@ -129,26 +129,31 @@ def get_best_krg_model(
     if getattr(best_result, "x", None) is not None:
         candidate_params.append(list(best_result.x))
     candidate_params.extend(
-        [params for params, _ in sorted(successful_params, key=lambda x: x[1])]
+        [list(key) for key, _ in sorted(fitted_models.items(), key=lambda x: x[1][1])]
     )
 
     best_model = None
     best_loss = None
     seen = set()
     for params in candidate_params:
-        key = tuple(map(str, params))
+        key = tuple(params)
         if key in seen:
             continue
         seen.add(key)
         try:
-            model, loss = compute_kriging_loss(
-                params=params,
-                level1_split=level1_split,
-                level2_split=level2_split,
-                level3_split=level3_split,
-                x_=x_test,
-                y_=y_test,
-            )
+            if key in fitted_models:
+                # Same training set, only the test loss is missing
+                model = fitted_models[key][0]
+                loss = get_model_loss(model, x_test, y_test, lambda_penalty=params[6])
+            else:
+                model, loss = compute_kriging_loss(
+                    params=params,
+                    level1_split=level1_split,
+                    level2_split=level2_split,
+                    level3_split=level3_split,
+                    x_=x_test,
+                    y_=y_test,
+                )
         except Exception as exc:
             log.warning(f"KRG candidate failed during final fit ({params=}): {exc!r}")
             continue
@@ -167,8 +172,9 @@ def get_best_krg_model(
     return best_model, best_loss
 
 
+@profiled
 def run_first_level_simulations(
-    cpacs_list: list[CPACS],
+    cpacs_list: list[GeomVariant],
     results_dir: Path,
     sampled_geom: DataFrame,
     training_settings: TrainingSettings,
@@ -198,9 +204,9 @@ def run_first_level_simulations(
         )
 
     if max_workers <= 1:
-        for i, cpacs in enumerate(cpacs_list):
+        for i, geom_variant in enumerate(cpacs_list):
             result, err_msg = _run_first_level_simulation_task(
-                cpacs_path=Path(cpacs.cpacs_file),
+                geom_variant=geom_variant,
                 row_geom=sampled_geom.iloc[i].to_dict(),
                 idx=i,
                 results_dir=results_dir,
@@ -231,13 +237,17 @@ def run_first_level_simulations(
     # a concern here.
     _PER_SIM_TIMEOUT = 600.0  # seconds
 
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+    # One CPU per worker, the AVL runs of a worker draw from it (see cpugovernor.py)
+    with cpu_lease(max_workers) as max_workers, concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_simulation_worker,
+    ) as executor:
         futures: dict[concurrent.futures.Future, int] = {}
         submit_times: dict[concurrent.futures.Future, float] = {}
-        for i, cpacs in enumerate(cpacs_list):
+        for i, geom_variant in enumerate(cpacs_list):
             future = executor.submit(
                 _run_first_level_simulation_task,
-                Path(cpacs.cpacs_file),
+                geom_variant,
                 sampled_geom.iloc[i].to_dict(),
                 i,
                 results_dir,
@@ -305,8 +315,15 @@ def run_first_level_simulations(
     return pd.concat(final_dfs, axis=0, ignore_index=True)
 
 
+def _init_simulation_worker() -> None:
+    """One CPU per worker, and no plots for the training simulations."""
+
+    init_worker_lease(1)
+    os.environ["CEASIOMPY_NO_GRAPHICS"] = "1"
+
+
 def _run_first_level_simulation_task(
-    cpacs_path: Path,
+    geom_variant: GeomVariant,
     row_geom: dict,
     idx: int,
     results_dir: Path,
@@ -318,7 +335,7 @@ def _run_first_level_simulation_task(
     pyavl_local_dir.mkdir(exist_ok=True)
 
     try:
-        cpacs = CPACS(cpacs_path)
+        cpacs = CPACS(geom_variant.materialize())
         run_avl(
             cpacs=cpacs,
             results_dir=pyavl_local_dir,
@@ -359,14 +376,42 @@ def _run_first_level_simulation_task(
         return None, msg
 
 
+def _run_high_fidelity_task(
+    geom_variant: GeomVariant,
+    row_geom: dict,
+    high_fidelity_dir: Path,
+    training_settings: TrainingSettings,
+) -> DataFrame | None:
+    """Mesh and run SU2 on one geometry, in a worker process."""
+
+    level2_df = launch_gmsh_su2(
+        cpacs=CPACS(geom_variant.materialize()),
+        results_dir=high_fidelity_dir,
+        training_settings=training_settings,
+    )
+    if level2_df is None or len(level2_df) == 0:
+        return None
+
+    # Duplicate per AeroMap entries (same geometry, different aeromap values)
+    local_df_geom = DataFrame([row_geom] * len(level2_df)).reset_index(drop=True)
+
+    return pd.concat(
+        objs=[local_df_geom, level2_df.reset_index(drop=True)],
+        axis=1,
+    )
+
+
+@profiled
 def run_adapt_refinement_geom(
-    cpacs_list: list[CPACS],
+    cpacs_list: list[GeomVariant],
     unvalid_pts: DataFrame,
     results_dir: Path,
     training_settings: TrainingSettings,
 ) -> DataFrame:
     """
     Iterative improvement using SU2 data.
+    The points are meshed and computed concurrently, the CPUs being split between
+    the SU2 runs. Failed points are skipped.
     """
 
     # Define Variables
@@ -374,93 +419,206 @@ def run_adapt_refinement_geom(
     if not cpacs_list:
         raise ValueError("cpacs_list is empty; cannot run adaptive refinement.")
 
-    final_dfs = []
+    jobs: list[tuple[int, GeomVariant, dict]] = []
     for i, high_var in enumerate(unvalid_pts.iterrows()):
-        try:
-            idx = int(high_var[0])
-            cpacs_idx = idx if 0 <= idx < len(cpacs_list) else i
-            if cpacs_idx >= len(cpacs_list):
-                raise IndexError(
-                    f"Adaptive point index {idx} (fallback {i}) out of range for "
-                    f"cpacs_list size {len(cpacs_list)}."
-                )
-            cpacs = cpacs_list[cpacs_idx]
-
-            high_fidelity_dir = results_dir / f"{SU2RUN}_{i + 1}"
-            high_fidelity_dir.mkdir(parents=True, exist_ok=True)
-
-            level2_df = launch_gmsh_su2(
-                cpacs=cpacs,
-                results_dir=high_fidelity_dir,
-                training_settings=training_settings,
+        idx = int(high_var[0])
+        cpacs_idx = idx if 0 <= idx < len(cpacs_list) else i
+        if cpacs_idx >= len(cpacs_list):
+            log.error(
+                f"Adaptive point index {idx} (fallback {i}) out of range for "
+                f"cpacs_list size {len(cpacs_list)}. Skipping..."
             )
+            continue
 
-            if level2_df is None or len(level2_df) == 0:
-                log.error(f"No data retrieved for simulation {i + 1}, skipping...")
-                continue
-
-            # Duplicate per AeroMap entries (same geometry, different aeromap values)
-            n = len(level2_df)
-            row_df = unvalid_pts.iloc[i].to_dict()
-            # Keep only geometry variables to avoid duplicate aeromap columns
-            # when concatenating with level2_df (which already contains aeromap features).
-            row_geom = {k: v for k, v in row_df.items() if "_of_" in k}
-            if not row_geom:
-                row_geom = row_df
-            local_df_geom = DataFrame([row_geom] * n).reset_index(drop=True)
-
-            level2_df_combined = pd.concat(
-                objs=[local_df_geom, level2_df.reset_index(drop=True)],
-                axis=1,
+        row_df = unvalid_pts.iloc[i].to_dict()
+        # Keep only geometry variables to avoid duplicate aeromap columns
+        # when concatenating with level2_df (which already contains aeromap features).
+        row_geom = {k: v for k, v in row_df.items() if "_of_" in k}
+        if not row_geom:
+            row_geom = row_df
+
+        jobs.append((i, cpacs_list[cpacs_idx], row_geom))
+
+    results: dict[int, DataFrame] = {}
+    if jobs:
+        with cpu_lease(get_sane_max_cpu()) as nb_proc:
+            nb_workers, nb_cpu = get_su2_job_layout(len(jobs), nb_proc)
+            log.info(
+                f"Running {len(jobs)} high-fidelity simulations on {nb_workers} "
+                f"processes with {nb_cpu} cpu(s) each."
             )
-            final_dfs.append(level2_df_combined)
-        except Exception as e:
-            log.error(f"Error in SU2 simulation {i + 1}: {e=}. Skipping...")
-            continue  # Skip to next iteration, don't add to final_dfs
+
+            # Spawn fresh interpreters: forking a process with an initialized gmsh is unsafe.
+            # The meshing and SU2 run of a worker draw from its CPUs (see cpugovernor.py).
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=nb_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker_lease,
+                initargs=(nb_cpu,),
+            ) as executor:
+                futures = {}
+                for i, geom_variant, row_geom in jobs:
+                    high_fidelity_dir = results_dir / f"{SU2RUN}_{i + 1}"
+                    high_fidelity_dir.mkdir(parents=True, exist_ok=True)
+                    future = executor.submit(
+                        _run_high_fidelity_task,
+                        geom_variant,
+                        row_geom,
+                        high_fidelity_dir,
+                        training_settings,
+                    )
+                    futures[future] = i
+
+                for future in concurrent.futures.as_completed(futures):
+                    i = futures[future]
+                    try:
+                        level2_df = future.result()
+                    except Exception as e:
+                        log.error(f"Error in SU2 simulation {i + 1}: {e=}. Skipping...")
+                        continue
+
+                    if level2_df is None:
+                        log.error(f"No data retrieved for simulation {i + 1}, skipping...")
+                        continue
+
+                    results[i] = level2_df
+                    log.info(f"SU2 simulation {i + 1} done ({len(results)}/{len(jobs)}).")
 
     # Check if any successful simulations
-    if not final_dfs:
+    if not results:
         raise ValueError(
             "No successful SU2 simulations. Cannot proceed with surrogate model training."
         )
 
-    return pd.concat(final_dfs, axis=0, ignore_index=True)
+    return pd.concat([results[i] for i in sorted(results)], axis=0, ignore_index=True)
+
+
+def _fit_hyper_parameters(
+    model_type: str,
+    params: list,
+    level1_split: DataSplit,
+    level2_split: DataSplit | None,
+    level3_split: DataSplit | None,
+    x_val: ndarray,
+    y_val: ndarray,
+) -> tuple[KRG | MFK | RBF | None, float, float]:
+    """
+    Fit one hyperparameter set (in a worker process).
+    Returns the model (None if the fit failed), its validation loss and the wall time.
+    """
+
+    start_time = time.perf_counter()
+    compute_loss = compute_kriging_loss if model_type == "KRG" else compute_rbf_loss
+    try:
+        model, loss = compute_loss(
+            params=params,
+            level1_split=level1_split,
+            level2_split=level2_split,
+            level3_split=level3_split,
+            x_=x_val,
+            y_=y_val,
+        )
+    except Exception as exc:
+        # Keep BO running when SMT fails on ill-conditioned combinations.
+        log.warning(f"{model_type} hyperparameter set failed ({params=}): {exc!r}")
+        return None, float("inf"), time.perf_counter() - start_time
+
+    return model, float(loss), time.perf_counter() - start_time
 
 
-def optimize_hyper_parameters(
-    objective: Callable,
+def search_hyper_parameters(
+    model_type: str,
+    hyperparam_space,
+    level1_split: DataSplit,
+    level2_split: DataSplit | None,
+    level3_split: DataSplit | None,
+    x_val: ndarray,
+    y_val: ndarray,
     n_calls: int,
     random_state: int,
-    hyperparam_space,
-) -> OptimizeResult:
+    n_jobs: int | None = None,
+) -> tuple[OptimizeResult, dict[tuple, tuple[KRG | MFK | RBF, float]]]:
     """
-    Using Bayesian Optimization.
+    Using Bayesian Optimization, with batches of candidates fitted concurrently.
+
+    Each batch of n_jobs candidates is proposed with the constant liar strategy
+    (the pending candidates are assumed to get the lowest loss observed so far).
+
+    Returns:
+        The optimization result and the fitted models with their validation loss,
+        by hyperparameters (as a tuple).
+
     """
     log.info("Starting Bayesian Optimization Algorithm.")
 
-    # Perform Bayesian optimization
-    start_time = time.time()
-    result: OptimizeResult = gp_minimize(
-        func=objective,
-        n_calls=n_calls,
+    optimizer = Optimizer(
         dimensions=hyperparam_space,
+        base_estimator="GP",
         random_state=random_state,
     )
+    fitted_models: dict[tuple, tuple[KRG | MFK | RBF, float]] = {}
+    fit_args = (level1_split, level2_split, level3_split, x_val, y_val)
+
+    start_time = time.time()
+    with ExitStack() as stack:
+        n_jobs = stack.enter_context(cpu_lease(min(n_jobs or get_sane_max_cpu(), n_calls)))
+        executor = None
+        if n_jobs > 1:
+            executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker_lease,
+                initargs=(1,),
+            ))
+        log.info(f"Fitting {model_type} candidates by batches of {n_jobs}.")
+
+        n_trials = 0
+        while n_trials < n_calls:
+            batch = optimizer.ask(n_points=min(n_jobs, n_calls - n_trials), strategy="cl_min")
+            if executor is None:
+                fits = [_fit_hyper_parameters(model_type, params, *fit_args) for params in batch]
+            else:
+                fits = list(executor.map(
+                    _fit_hyper_parameters,
+                    [model_type] * len(batch),
+                    batch,
+                    *[[arg] * len(batch) for arg in fit_args],
+                ))
+
+            losses = []
+            for params, (model, loss, trial_time) in zip(batch, fits):
+                n_trials += 1
+                log.info(
+                    f"{model_type} trial {n_trials}/{n_calls}: loss {loss:.6g} "
+                    f"in {trial_time:.2f}s ({params=})"
+                )
+                if model is None or not np.isfinite(loss):
+                    losses.append(1e30)
+                    continue
+                fitted_models[tuple(params)] = (model, loss)
+                losses.append(loss)
+
+            optimizer.tell(batch, losses)
+
     total_time = time.time() - start_time
     log.info(f"Total optimization time: {total_time:.2f} seconds ({total_time / 60:.2f} minutes)")
     log.info("Best hyperparameters found:")
-    return result
+
+    return optimizer.get_result(), fitted_models
 
 
+@profiled
 def get_best_rbf_model(
     level1_split: DataSplit,
     level2_split: DataSplit | None = None,
     level3_split: DataSplit | None = None,
     n_calls: int = 10,
     random_state: int = 42,
+    n_jobs: int | None = None,
 ) -> tuple[RBF, float]:
     """
     Train either single-fidelity or multi-fidelity RBF model.
+    The hyperparameters are searched with n_jobs concurrent fits (see search_hyper_parameters).
     """
     hyperparam_space = get_hyperparam_space_rbf(
         level1_split=level1_split,
@@ -491,34 +649,34 @@ def get_best_rbf_model(
         axis=0,
     )
 
-    # Objective function for Bayesian optimization
-    def objective(params) -> float:
-        _, loss = compute_rbf_loss(
-            params=params,
-            level1_split=level1_split,
-            level2_split=level2_split,
-            level3_split=level3_split,
-            x_=x_val,
-            y_=y_val,
-        )
-        return loss
-
-    best_result = optimize_hyper_parameters(
-        objective=objective,
-        n_calls=n_calls,
-        random_state=random_state,
+    best_result, fitted_models = search_hyper_parameters(
+        model_type="RBF",
         hyperparam_space=hyperparam_space,
-    )
-    log_params_rbf(best_result)
-
-    best_model, best_loss = compute_rbf_loss(
-        params=best_result.x,
         level1_split=level1_split,
         level2_split=level2_split,
         level3_split=level3_split,
-        x_=x_test,
-        y_=y_test,
+        x_val=x_val,
+        y_val=y_val,
+        n_calls=n_calls,
+        random_state=random_state,
+        n_jobs=n_jobs,
     )
+    log_params_rbf(best_result)
+
+    key = tuple(best_result.x)
+    if key in fitted_models:
+        # Same training set, only the test loss is missing
+        best_model = fitted_models[key][0]
+        best_loss = get_model_loss(best_model, x_test, y_test)
+    else:
+        best_model, best_loss = compute_rbf_loss(
+            params=best_result.x,
+            level1_split=level1_split,
+            level2_split=level2_split,
+            level3_split=level3_split,
+            x_=x_test,
+            y_=y_test,
+        )
 
     log.info(f"Final RMSE on test set: {best_loss:.6f}")
 
@@ -5,12 +5,18 @@ Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
 """
 
 # Imports
+import os
 import shutil
 import joblib
 import numpy as np
 import pandas as pd
 
+from cpacspy.cpacsfunctions import (
+    open_tixi,
+    create_branch,
+)
 from ceasiompy.utils.guiobjects import add_value
+from ceasiompy.utils.profiling import profiled
 from ceasiompy.utils.ceasiompyutils import (
     get_selected_aeromap,
     get_conditions_from_aeromap,
@@ -81,8 +87,49 @@ class DataSplit(BaseModel):
         return np.concatenate([self.y_train, self.y_val, self.y_test], axis=0)
 
 
+class GeomVariant(BaseModel):
+    """
+    Sampled geometry: the base CPACS file with the values to write at some xpaths.
+    No CPACS is kept in memory, the CPACS file of the variant (cpacs_file)
+    is only written when a worker needs it (see materialize).
+    """
+    base_cpacs: Path
+    cpacs_file: Path
+    patch: dict[str, float]
+
+    def materialize(self) -> Path:
+        """Write cpacs_file if it does not exist yet and return its path."""
+        if not self.cpacs_file.exists():
+            write_patched_cpacs(self.base_cpacs, self.cpacs_file, self.patch)
+        return self.cpacs_file
+
+
 # Functions
 
+def write_patched_cpacs(
+    cpacs_path_in: Path,
+    cpacs_path_out: Path,
+    patch: dict[str, float],
+) -> None:
+    """
+    Write cpacs_path_in with the values of patch (by xpath) to cpacs_path_out,
+    in one Tixi pass (no TiGL handle is created).
+    """
+    tixi = open_tixi(cpacs_path_in)
+    try:
+        for xpath, value in patch.items():
+            # create the branch if it does not exist
+            create_branch(tixi, xpath)
+            tixi.updateDoubleElement(xpath, float(value), "%g")
+
+        # Never leave a partial file behind, it would be taken as written
+        tmp_path = cpacs_path_out.with_name(f"{cpacs_path_out.stem}_{os.getpid()}.tmp")
+        tixi.save(str(tmp_path))
+    finally:
+        tixi.close()
+    os.replace(tmp_path, cpacs_path_out)
+
+
 def domain_converter(
     t: float | ndarray,
     from_domain: tuple[float, float],
@@ -147,6 +194,7 @@ def get_aero_bounds(cpacs: CPACS) -> Bounds:
     )
 
 
+@profiled
 def save_model(
     cpacs: CPACS,
     model: KRG | MFK | RBF,
@@ -180,9 +228,10 @@ def save_model(
     log.info(f"Model saved to {model_path}")
 
 
+@profiled
 def store_best_geom_from_training(
     dataframe: DataFrame,
-    cpacs_list: list[CPACS],
+    cpacs_list: list[GeomVariant],
     results_dir: Path,
     geom_bounds: GeomBounds,
     sampled_geom: DataFrame,
@@ -208,7 +257,7 @@ def store_best_geom_from_training(
         raise ValueError("Could not match best geometry to a CPACS file. Skipping copy.")
 
     best_cpacs_idx = int(mask.idxmax())
-    best_cpacs_path = cpacs_list[best_cpacs_idx].cpacs_file
+    best_cpacs_path = cpacs_list[best_cpacs_idx].materialize()
 
     best_cpacs_path_results = results_dir / f"best_geom_{best_cpacs_idx + 1:03d}.xml"
     shutil.copyfile(
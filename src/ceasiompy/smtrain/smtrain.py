@@ -84,7 +84,7 @@ def _geometry_exploration(
         training_settings=training_settings,
     )
 
-    # Create the list of CPACS files (in function of geometry values of lh_smapling)
+    # Create the geometry variants (in function of geometry values of lh_smapling)
     progress_update(
         detail=f"Creating {len(sampled_geom)} cpacs geometries.",
         progress=0.05,
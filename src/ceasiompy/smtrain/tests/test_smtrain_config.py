@@ -0,0 +1,97 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'smtrain/func/config.py'
+"""
+
+# Imports
+
+import pytest
+import numpy as np
+
+from ceasiompy.smtrain.func import config
+from ceasiompy.smtrain.func.config import optimize_surrogate
+
+from pandas import DataFrame
+from scipy.optimize import Bounds
+from smt.surrogate_models import RBF
+from ceasiompy.smtrain.func.utils import (
+    GeomBounds,
+    TrainingSettings,
+)
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _get_trained_rbf(n_aeromap_features: int) -> RBF:
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1.0, 1.0, size=(60, 2 + n_aeromap_features))
+    y = (x[:, 0] - 0.3) ** 2 + (x[:, 1] + 0.2) ** 2 + 0.1 * x[:, 2:].sum(axis=1)
+
+    model = RBF(d0=2.0, poly_degree=1, reg=1e-10, print_global=False)
+    model.set_training_values(x, y)
+    model.train()
+    return model
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@pytest.mark.parametrize("aeromap_norm_df", [
+    DataFrame(),
+    DataFrame({"angleOfAttack": [-0.5, 0.0, 0.5], "machNumber": [0.1, 0.2, 0.3]}),
+])
+def test_optimize_surrogate(aeromap_norm_df, monkeypatch):
+
+    model = _get_trained_rbf(n_aeromap_features=aeromap_norm_df.shape[1])
+    geom_bounds = GeomBounds(bounds=Bounds([-1.0, -1.0], [1.0, 1.0]), param_names=["a", "b"])
+    training_settings = TrainingSettings(
+        sm_models=["RBF"],
+        objective="cl",
+        direction="Minimize",
+        n_samples=10,
+        fidelity_level="One level",
+        sampling_method="LHS",
+        data_repartition=0.7,
+    )
+
+    # Objective evaluated on the populations, (n_params, S) -> (S,)
+    grid = np.stack(np.meshgrid(np.linspace(-1, 1, 41), np.linspace(-1, 1, 41))).reshape(2, -1)
+    grid_objectives = []
+
+    def differential_evolution(func, **kwargs):
+        for nb_candidates in (1, 7):
+            x_norm = np.zeros((2, nb_candidates))
+            assert func(x_norm).shape == (nb_candidates,)
+        grid_objectives.append(func(grid))
+        return differential_evolution_scipy(func=func, **kwargs)
+
+    differential_evolution_scipy = config.differential_evolution
+    monkeypatch.setattr(config, "differential_evolution", differential_evolution)
+
+    results = []
+    for workers in (1, 3):
+        np.random.seed(0)
+        results.append(optimize_surrogate(
+            model=model,
+            geom_bounds=geom_bounds,
+            aeromap_norm_df=aeromap_norm_df,
+            training_settings=training_settings,
+            workers=workers,
+        ))
+
+    # Same optimum with and without worker threads
+    (result, y_opt), (result_workers, y_opt_workers) = results
+    np.testing.assert_allclose(result_workers.x, result.x, atol=1e-8)
+    assert y_opt_workers == pytest.approx(y_opt)
+
+    # At least as good as the best point of a grid of the bounds
+    np.testing.assert_allclose(grid_objectives[1], grid_objectives[0])
+    assert result.fun <= grid_objectives[0].min() + 1e-9
+    assert abs(result.fun) == pytest.approx(abs(y_opt))
@@ -0,0 +1,74 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'smtrain/func/sampling.py'
+"""
+
+# Imports
+
+import pytest
+import numpy as np
+
+from ceasiompy.smtrain.func.sampling import (
+    get_loo_errors,
+    get_rbf_loo_residuals,
+    _get_brute_force_loo_residuals,
+)
+
+from smt.surrogate_models import RBF
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _get_samples() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1.0, 1.0, size=(20, 2))
+    y = np.column_stack([
+        np.sin(3.0 * x[:, 0]) + x[:, 1] ** 2,
+        np.cos(2.0 * x[:, 1]) + x[:, 0],
+    ])
+    return x, y
+
+
+def _get_trained_rbf(x: np.ndarray, y: np.ndarray, poly_degree: int, reg: float) -> RBF:
+    model = RBF(d0=1.0, poly_degree=poly_degree, reg=reg, print_global=False)
+    model.set_training_values(x, y)
+    model.train()
+    return model
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@pytest.mark.parametrize("poly_degree", [-1, 0, 1])
+@pytest.mark.parametrize("reg", [1e-10, 1e-3])
+def test_rbf_loo_residuals(poly_degree, reg):
+
+    x, y = _get_samples()
+    model = _get_trained_rbf(x, y, poly_degree, reg)
+
+    residuals = get_rbf_loo_residuals(model, x, y)
+    assert residuals is not None
+    assert residuals.shape == y.shape
+
+    brute_force = _get_brute_force_loo_residuals(model, x, y)
+    np.testing.assert_allclose(residuals, brute_force, rtol=1e-6, atol=1e-8)
+
+
+def test_loo_errors_outputs():
+
+    x, y = _get_samples()
+
+    # Largest error over the outputs, with the closed form and with brute force
+    model = _get_trained_rbf(x, y, poly_degree=0, reg=1e-3)
+    brute_force = np.abs(_get_brute_force_loo_residuals(model, x, y)).max(axis=1)
+    np.testing.assert_allclose(get_loo_errors(model, x, y), brute_force, rtol=1e-6, atol=1e-8)
+
+    # Single output
+    model = _get_trained_rbf(x, y[:, 0], poly_degree=0, reg=1e-3)
+    assert get_loo_errors(model, x, y[:, 0]).shape == (x.shape[0],)
@@ -0,0 +1,126 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'smtrain/func/trainsurrogatemodel.py'
+"""
+
+# Imports
+
+import os
+import time
+import pytest
+import numpy as np
+
+from ceasiompy.smtrain.func import trainsurrogatemodel
+from ceasiompy.smtrain.func.hyperparameters import get_hyperparam_space_rbf
+from ceasiompy.smtrain.func.trainsurrogatemodel import (
+    search_hyper_parameters,
+    run_adapt_refinement_geom,
+)
+
+from pathlib import Path
+from pandas import DataFrame
+from ceasiompy.smtrain.func.utils import DataSplit
+from ceasiompy.su2run import MODULE_NAME as SU2RUN
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _fake_high_fidelity_task(geom_variant, row_geom, high_fidelity_dir, training_settings):
+    """Stand-in for _run_high_fidelity_task, run in the worker processes."""
+
+    if geom_variant == "fails":
+        raise RuntimeError("SU2 diverged.")
+    if geom_variant == "empty":
+        return None
+
+    # The first point finishes last
+    if row_geom["span_of_wing"] == 10.0:
+        time.sleep(1.0)
+    return DataFrame({**row_geom, "angleOfAttack": [0.0, 2.0], "cl": [0.1, 0.3]})
+
+
+def _get_data_split() -> DataSplit:
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1.0, 1.0, size=(30, 2))
+    y = (np.sin(2.0 * x[:, 0]) + x[:, 1] ** 2).reshape(-1, 1)
+    return DataSplit(
+        columns=["x0", "x1"],
+        x_train=x[:20], y_train=y[:20],
+        x_val=x[20:25], y_val=y[20:25],
+        x_test=x[25:], y_test=y[25:],
+    )
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_run_adapt_refinement_geom(monkeypatch, tmp_path):
+
+    monkeypatch.setattr(trainsurrogatemodel, "_run_high_fidelity_task", _fake_high_fidelity_task)
+    unvalid_pts = DataFrame({
+        "span_of_wing": [10.0, 11.0, 12.0, 13.0],
+        "angleOfAttack": [0.0, 0.0, 0.0, 0.0],
+    })
+
+    # Failed and empty points are skipped, the others are kept in point order
+    level2_df = run_adapt_refinement_geom(
+        cpacs_list=["ok", "fails", "empty", "ok"],
+        unvalid_pts=unvalid_pts,
+        results_dir=tmp_path,
+        training_settings=None,
+    )
+    assert list(level2_df["span_of_wing"]) == [10.0, 10.0, 13.0, 13.0]
+    assert list(level2_df["cl"]) == [0.1, 0.3, 0.1, 0.3]
+    assert list(level2_df.columns) == ["span_of_wing", "angleOfAttack", "cl"]
+    assert Path(tmp_path, f"{SU2RUN}_1").is_dir()
+
+    # At least one successful point
+    with pytest.raises(ValueError, match="No successful SU2 simulations"):
+        run_adapt_refinement_geom(
+            cpacs_list=["fails", "empty"],
+            unvalid_pts=unvalid_pts.iloc[:2],
+            results_dir=tmp_path,
+            training_settings=None,
+        )
+
+
+@pytest.mark.parametrize("n_jobs", [1, 4])
+def test_search_hyper_parameters(n_jobs, monkeypatch, tmp_path):
+
+    # Budget of 4 CPUs, whatever the host
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    monkeypatch.setenv("MAX_CPUS", "4")
+    monkeypatch.setenv("CEASIOMPY_CPU_TOKENS_DIR", str(tmp_path))
+
+    data_split = _get_data_split()
+    n_calls = 3
+
+    best_result, fitted_models = search_hyper_parameters(
+        model_type="RBF",
+        hyperparam_space=get_hyperparam_space_rbf(data_split),
+        level1_split=data_split,
+        level2_split=None,
+        level3_split=None,
+        x_val=data_split.x_val,
+        y_val=data_split.y_val,
+        n_calls=n_calls,
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+
+    assert len(best_result.x_iters) == n_calls
+    assert len(fitted_models) == n_calls
+
+    # The final fit reuses the model of the best hyperparameters
+    assert set(fitted_models) == {tuple(params) for params in best_result.x_iters}
+    best_model, best_loss = fitted_models[tuple(best_result.x)]
+    assert best_loss == pytest.approx(best_result.fun)
+    assert best_loss == min(loss for _, loss in fitted_models.values())
+    assert best_model.predict_values(data_split.x_test).shape == data_split.y_test.shape
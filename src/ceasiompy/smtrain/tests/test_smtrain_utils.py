@@ -0,0 +1,82 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'smtrain/func/utils.py'
+"""
+
+# Imports
+
+import shutil
+
+from cpacspy.cpacsfunctions import open_tixi
+from ceasiompy.smtrain.func.utils import (
+    GeomVariant,
+    write_patched_cpacs,
+)
+
+from pathlib import Path
+from ceasiompy.utils.commonpaths import CPACS_FILES_PATH
+
+AREA_XPATH = "/cpacs/vehicles/aircraft/model/reference/area"
+MISSING_XPATH = "/cpacs/toolspecific/CEASIOMpy/geometry/span_of_wing"
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _get_values(cpacs_path: Path) -> dict[str, float | None]:
+    tixi = open_tixi(cpacs_path)
+    try:
+        return {
+            xpath: tixi.getDoubleElement(xpath) if tixi.checkElement(xpath) else None
+            for xpath in (AREA_XPATH, MISSING_XPATH)
+        }
+    finally:
+        tixi.close()
+
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_write_patched_cpacs(tmp_path):
+
+    base_cpacs = Path(tmp_path, "d150.xml")
+    shutil.copy(Path(CPACS_FILES_PATH, "d150.xml"), base_cpacs)
+    base_content = base_cpacs.read_bytes()
+
+    # Existing value and missing branch
+    cpacs_out = Path(tmp_path, "variant.xml")
+    write_patched_cpacs(base_cpacs, cpacs_out, {AREA_XPATH: 130.5, MISSING_XPATH: 34.2})
+    assert _get_values(cpacs_out) == {AREA_XPATH: 130.5, MISSING_XPATH: 34.2}
+
+    # The base CPACS is unchanged and no temporary file is left
+    assert base_cpacs.read_bytes() == base_content
+    assert _get_values(base_cpacs) == {AREA_XPATH: 122.4, MISSING_XPATH: None}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["d150.xml", "variant.xml"]
+
+
+def test_geom_variant_materialize(tmp_path):
+
+    base_cpacs = Path(tmp_path, "d150.xml")
+    shutil.copy(Path(CPACS_FILES_PATH, "d150.xml"), base_cpacs)
+
+    variant = GeomVariant(
+        base_cpacs=base_cpacs,
+        cpacs_file=Path(tmp_path, "variant.xml"),
+        patch={AREA_XPATH: 110.0},
+    )
+
+    # Written on first use only
+    assert not variant.cpacs_file.exists()
+    assert variant.materialize() == variant.cpacs_file
+    assert _get_values(variant.cpacs_file)[AREA_XPATH] == 110.0
+
+    # An existing file is not rewritten
+    variant.cpacs_file.write_text("already written")
+    variant.materialize()
+    assert variant.cpacs_file.read_text() == "already written"
@@ -10,6 +10,12 @@ Initialization for StaticStability module.
 
 from pathlib import Path
 
+from ceasiompy.utils.commonxpaths import (
+    REF_XPATH,
+    AEROPERFORMANCE_XPATH,
+    SELECTED_AEROMAP_XPATH,
+)
+
 # ==============================================================================
 #   INITIALIZATION
 # ==============================================================================
@@ -25,6 +31,14 @@ RES_DIR = False
 MODULE_DIR = Path(__file__).parent
 MODULE_NAME = MODULE_DIR.name
 
+# ===== CPACS xpaths read and written (workflow dependency graph) =====
+CPACS_INPUTS = (
+    REF_XPATH,
+    AEROPERFORMANCE_XPATH,
+    SELECTED_AEROMAP_XPATH,
+)
+CPACS_OUTPUTS = ()
+
 # Specific to StaticStability module
 STABILITY_DICT = {True: "Stable", False: "Unstable"}
 
@@ -44,6 +44,10 @@ EULER_OR_RANS = ["EULER", "RANS"]
 SOFTWARE_NAME = "SU2_CFD"
 REQUIRED_VERSION = "8.1.0"
 
+# Minimum number of MPI ranks for one SU2 calculation is
+# (mesh file size / SU2_MESH_BYTES_PER_CPU), about 250k ASCII elements per rank
+SU2_MESH_BYTES_PER_CPU = 20_000_000
+
 # ===== Module Status =====
 MODULE_STATUS = get_module_status(
     default=True,
@@ -62,6 +66,7 @@ SU2_CFL_ADAPT_PARAM_UP_XPATH = SU2_XPATH + "/settings/cflNumber/adaptation/facto
 SU2_CFL_MIN_XPATH = SU2_XPATH + "/settings/cflNumber/adaptation/min"
 SU2_CFL_MAX_XPATH = SU2_XPATH + "/settings/cflNumber/adaptation/max"
 SU2_MG_LEVEL_XPATH = SU2_XPATH + "/settings/multigridLevel"
+SU2_WARM_START_XPATH = SU2_XPATH + "/settings/warmStart"
 
 SU2_BC_WALL_XPATH = SU2_XPATH + "/boundaryConditions/wall"
 SU2_BC_FARFIELD_XPATH = SU2_XPATH + "/boundaryConditions/farfield"
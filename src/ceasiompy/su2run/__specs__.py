@@ -37,6 +37,7 @@ from ceasiompy.su2run import (
     SU2_CFL_MIN_XPATH,
     SU2_CFL_MAX_XPATH,
     SU2_MG_LEVEL_XPATH,
+    SU2_WARM_START_XPATH,
     SU2_ACTUATOR_DISK_XPATH,
     SU2_DYNAMICDERIVATIVES_BOOL_XPATH,
     SU2_DYNAMICDERIVATIVES_TIMESIZE_XPATH,
@@ -92,6 +93,18 @@ def gui_settings(cpacs: CPACS) -> None:
             help="Multi-grid level (0 = no multigrid)",
         )
 
+    bool_vartype(
+        tixi=tixi,
+        xpath=SU2_WARM_START_XPATH,
+        default_value=False,
+        name="Warm start sweep",
+        key=f"{cpacs.ac_name}_su2run_warm_start",
+        help=(
+            "Run the aeromap points along a continuation path and restart each one "
+            "from the closest converged point (cold start if it diverged)."
+        ),
+    )
+
     st.markdown("---")
     st.markdown("**CFL Settings**")
     left_col, mid_col, right_col = st.columns(3)
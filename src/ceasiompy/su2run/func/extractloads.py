@@ -24,6 +24,10 @@ from vtkmodules.util.numpy_support import (
 from pathlib import Path
 from numpy import ndarray
 from scipy.sparse import csr_matrix
+from ceasiompy.su2run.func.su2mesh import (
+    read_marker_nodes,
+    get_point_marker_index,
+)
 from ceasiompy.utils.configfiles import ConfigFile
 from typing import (
     Dict,
@@ -123,22 +127,17 @@ def compute_forces(
         mesh.GetPointData().SetActiveVectors(name)
 
     # Write CSV force file
-    ids = range(len(coord))
+    ids = np.arange(len(coord))
 
+    # Find which marker corresponds to which ids
     su2_mesh_path = config_dict.get("MESH_FILENAME")
-    marker_dict = get_mesh_markers_ids(su2_mesh_path)
-    mesh_maker = []
-
-    # Find which marker corespond to which ids
-    for i in range(len(coord)):
-        id_to_test = ids[i]
+    marker_names, point_marker = get_point_marker_index(su2_mesh_path)
+    marker_idx = np.full(len(coord), -1, dtype=np.int32)
+    nb_indexed = min(len(coord), len(point_marker))
+    marker_idx[:nb_indexed] = point_marker[:nb_indexed]
 
-        find = False
-        for marker, ids_list in marker_dict.items():
-            if not find:
-                if id_to_test in ids_list:
-                    mesh_maker.append(marker)
-                    find = True
+    # Index -1 (point without marker) maps to the trailing empty name
+    mesh_maker = np.array(marker_names + [""], dtype=object)[marker_idx]
 
     df = pd.DataFrame(
         data={
@@ -211,9 +210,6 @@ def write_updated_mesh(mesh: vtk.vtkXMLUnstructuredGridWriter, new_vtu_file_path
     writer.Update()
 
 
-# TODO: maybe create some exteral function to cope with SU2Mesh, get coord, get marker ...
-
-
 def get_mesh_markers_ids(su2_mesh_path: str) -> Dict:
     """
     Create dictionary which contains for each mesh marker (keys)
@@ -228,35 +224,12 @@ def get_mesh_markers_ids(su2_mesh_path: str) -> Dict:
     """
 
     marker_dict = {}
-    ids_list = []
-    start_line_nb = 1e14
-
-    with open(su2_mesh_path) as f:
-        for line_nb, line in enumerate(f.readlines()):
-
-            if "Farfield" in line:
-                start_line_nb = 1e14
-
-            if "NPERIODIC" in line:
-                start_line_nb = 1e14
-
-            if "MARKER_TAG" in line and "Farfield" not in line:
-                new_marker = line.split("=")[1][:-1]  # -1 to remove "\n"
-                marker_dict[new_marker] = []
-                start_line_nb = line_nb
-                log.info("Mesh marker " + new_marker + " start at line: " + str(start_line_nb))
-
-            if line_nb > start_line_nb + 1:
-                line_ids = line.split("\n")[0].split()
-                marker_dict[new_marker].append(int(line_ids[1]))
-                marker_dict[new_marker].append(int(line_ids[2]))
-                marker_dict[new_marker].append(int(line_ids[3]))
-
-    # Remove double elements and replace ids by coordinates
-    for key, ids_list in marker_dict.items():
-        new_ids_list = list(dict.fromkeys(ids_list))
-        marker_dict[key] = new_ids_list
-        log.info("Mesh marker " + key + " contains " + str(len(marker_dict[key])) + " points.")
+    for marker, nodes in read_marker_nodes(su2_mesh_path).items():
+        # Farfield points are not part of the surface results
+        if "Farfield" in marker:
+            continue
+        marker_dict[marker] = nodes.tolist()
+        log.info("Mesh marker " + marker + " contains " + str(len(nodes)) + " points.")
 
     if not marker_dict:
         log.warning('No "MARKER_TAG" has been found in the mesh!')
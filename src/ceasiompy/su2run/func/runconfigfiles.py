@@ -14,13 +14,31 @@ Module to run SU2 configuration files in CEASIOMpy.
 
 import os
 import re
+import threading
+import contextvars
 
 from ceasiompy.utils.ceasiompyutils import run_software
+from ceasiompy.su2run.func.warmstart import (
+    set_restart,
+    is_converged,
+    get_flight_point,
+    find_restart_source,
+    order_continuation_path,
+    split_continuation_path,
+)
 
 from pathlib import Path
 from typing import Callable
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
 
-from ceasiompy.su2run import SOFTWARE_NAME
+from ceasiompy import log
+from ceasiompy.su2run import (
+    SOFTWARE_NAME,
+    SU2_MESH_BYTES_PER_CPU,
+)
 from ceasiompy.utils.commonnames import (
     CONFIG_CFD_NAME,
     CONFIG_DYNSTAB_NAME,
@@ -28,6 +46,11 @@ from ceasiompy.utils.commonnames import (
     SU2_DYNSTAB_FORCES_BREAKDOWN_NAME,
 )
 
+# Constants
+
+# Line of the SU2 convergence table, starting with the iteration number
+_ITERATION_LINE = re.compile(r"^\|\s*(\d+)\s*\|")
+
 # Functions
 
 
@@ -60,18 +83,6 @@ def check_force_files_exists(config_dir: Path) -> None:
         )
 
 
-def _tail_text(log_path: Path, max_bytes: int = 8192) -> str:
-    try:
-        with open(log_path, "rb") as fh:
-            fh.seek(0, 2)
-            size = fh.tell()
-            fh.seek(max(size - max_bytes, 0))
-            data = fh.read()
-        return data.decode(errors="replace")
-    except FileNotFoundError:
-        return ""
-
-
 def _parse_total_iterations(config_path: Path) -> int | None:
     pattern = re.compile(r"^\s*(INNER_ITER|ITER)\s*=\s*(\d+)", re.IGNORECASE)
     inner_iter = None
@@ -89,54 +100,32 @@ def _parse_total_iterations(config_path: Path) -> int | None:
     return inner_iter if inner_iter is not None else iter_count
 
 
-def _parse_current_iteration(log_text: str) -> int | None:
-    current = None
-    for line in log_text.splitlines():
-        match = re.match(r"^\|\s*(\d+)\s*\|", line)
-        if match:
-            value = int(match.group(1))
-            if current is None or value > current:
-                current = value
-    return current
-
+def _parse_current_iteration(line: str) -> int | None:
+    """Return the iteration of a line of the SU2 convergence table (e.g. '|  42 | ...')."""
 
-def _parse_current_iteration_from_history(history_path: Path) -> int | None:
-    if not history_path.exists():
-        return None
+    match = _ITERATION_LINE.match(line)
+    return int(match.group(1)) if match else None
 
-    try:
-        lines = history_path.read_text(errors="replace").splitlines()
-    except Exception:
-        return None
-
-    # Find last non-empty data line and parse first column as INNER_ITER.
-    for line in reversed(lines):
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if stripped.startswith("%"):
-            continue
-        first_col = stripped.split(",")[0].strip().strip('"')
-        if first_col.isdigit():
-            return int(first_col)
 
+def _get_mesh_path(config_path: Path) -> Path | None:
+    """
+    Return the mesh referenced by MESH_FILENAME in a SU2 configuration file.
+    """
+    pattern = re.compile(r"^\s*MESH_FILENAME\s*=\s*(.+?)\s*$", re.IGNORECASE)
+    for line in config_path.read_text(errors="replace").splitlines():
+        match = pattern.match(line)
+        if match:
+            mesh_path = Path(match.group(1))
+            if not mesh_path.is_absolute():
+                mesh_path = Path(config_path.parent, mesh_path)
+            return mesh_path
     return None
 
 
-def run_su2_multi(
-    wkdir: Path,
-    nb_proc: int = 1,
-    *,
-    progress_callback: Callable[..., None] | None = None,
-) -> None:
+def get_su2_job_list(wkdir: Path) -> list[tuple[Path, Path, str]]:
     """
-    Run in the given working directory SU2 calculations.
+    Returns (config_dir, config_file, label) for every SU2 calculation in wkdir.
     The working directory must have a folder structure created by 'SU2Config' module.
-
-    Args:
-        wkdir (Path): Path to the working directory.
-        nb_proc (int): Number of processor that should be used to run the calculation in parallel.
-
     """
 
     case_dir_list = sorted(
@@ -153,7 +142,7 @@ def run_su2_multi(
             f"No Case directory has been found in the working directory: {wkdir}."
         )
 
-    # Iterate through different cases.
+    jobs = []
     for case_dir in case_dir_list:
         config_dirs = sorted([d for d in case_dir.iterdir() if d.is_dir()], key=lambda p: p.name)
         if not config_dirs:
@@ -170,50 +159,329 @@ def run_su2_multi(
 
             check_config_file_exists(config_file, config_dir)
 
-            total_iter = _parse_total_iterations(config_file[0])
             label = (
                 case_dir.name
                 if config_dir == case_dir
                 else f"{case_dir.name}/{config_dir.name}"
             )
-            history_path = Path(config_dir, "history.csv")
-
-            def _progress_parser(log_path: Path):
-                # Prefer history.csv (updated every INNER_ITER), fallback to logfile tail parsing.
-                current_iter = _parse_current_iteration_from_history(history_path)
-                if current_iter is None:
-                    log_text = _tail_text(log_path)
-                    current_iter = _parse_current_iteration(log_text)
-
-                if total_iter and total_iter > 0 and current_iter is not None:
-                    ratio = min(max(current_iter / total_iter, 0.0), 1.0)
-                    progress = ratio
-                    detail = (
-                        f"{label} · SU2 iterations: "
-                        f"{current_iter}/{total_iter} ({ratio * 100:.1f}%)"
-                    )
-                else:
-                    progress = None
-                    detail = f"{label} · SU2 running..."
-                return progress, detail, None
-
-            cloud = os.environ.get("CEASIOMPY_CLOUD", "False").lower() in {"1", "true", "yes"}
-            nb_proc = 1 if cloud else nb_proc
-            run_software(
-                software_name=SOFTWARE_NAME,
-                arguments=[config_file[0]],
-                wkdir=config_dir,
-                with_mpi=True,
-                nb_cpu=1,
-                log_bool=True,
-                progress_callback=progress_callback,
-                progress_parser=_progress_parser if progress_callback is not None else None,
+            jobs.append((config_dir, config_file[0], label))
+
+    return jobs
+
+
+def get_su2_job_layout(
+    nb_jobs: int,
+    nb_proc: int,
+    mesh_size: int = 0,
+) -> tuple[int, int]:
+    """
+    Split nb_proc CPUs between nb_jobs independent SU2 calculations.
+
+    The minimum number of MPI ranks per calculation is derived from the mesh size
+    (in bytes), then as many calculations as possible are run side by side and the
+    remaining CPUs are spread evenly between them.
+
+    Args:
+        nb_jobs (int): Number of SU2 calculations to run.
+        nb_proc (int): Total number of CPUs available.
+        mesh_size (int): Size of the largest mesh file in bytes.
+
+    Returns:
+        (nb_workers, nb_cpu): Number of concurrent calculations and MPI ranks for each.
+
+    """
+
+    nb_proc = max(int(nb_proc), 1)
+    if nb_jobs < 1:
+        return 1, nb_proc
+
+    min_cpu = -(-int(mesh_size) // SU2_MESH_BYTES_PER_CPU) if mesh_size > 0 else 1
+    min_cpu = min(max(min_cpu, 1), nb_proc)
+
+    nb_workers = min(nb_jobs, max(nb_proc // min_cpu, 1))
+    nb_cpu = max(nb_proc // nb_workers, min_cpu)
+
+    return nb_workers, nb_cpu
+
+
+def _make_progress_parser(
+    config_file: Path,
+    label: str,
+) -> Callable[[str], tuple | None]:
+    total_iter = _parse_total_iterations(config_file)
+
+    def _progress_parser(line: str) -> tuple | None:
+        # Called with each line of the SU2 output, as it is written
+        current_iter = _parse_current_iteration(line)
+        if current_iter is None:
+            return None
+
+        if total_iter and total_iter > 0:
+            ratio = min(max(current_iter / total_iter, 0.0), 1.0)
+            detail = (
+                f"{label} · SU2 iterations: "
+                f"{current_iter}/{total_iter} ({ratio * 100:.1f}%)"
             )
+            return ratio, detail
+
+        return None, f"{label} · SU2 iteration {current_iter}"
+
+    return _progress_parser
+
+
+class _SU2MultiProgress:
+    """
+    Aggregates the progress of concurrent SU2 calculations into one progress_callback.
+    """
 
-            if progress_callback is not None:
-                progress_callback(
-                    detail=f"{label} · SU2 completed.",
-                    progress=1.0,
+    def __init__(self, labels: list[str], progress_callback: Callable[..., None]) -> None:
+        self.labels = labels
+        self.progress_callback = progress_callback
+        self.case_progress: dict[str, float] = {label: 0.0 for label in labels}
+        self.running: dict[str, str] = {}
+        self.completed = 0
+        self.lock = threading.Lock()
+
+    def _report(self, log_path: str | None = None, log_tail: str | None = None) -> None:
+        total = len(self.labels)
+        progress = sum(self.case_progress.values()) / total if total else 1.0
+        if len(self.running) == 1:
+            detail = next(iter(self.running.values()))
+        else:
+            detail = f"SU2 cases completed: {self.completed}/{total}"
+            if self.running:
+                detail += " · Running: " + ", ".join(
+                    f"{label} ({self.case_progress[label] * 100:.0f}%)"
+                    for label in self.running
                 )
+        self.progress_callback(
+            detail=detail,
+            progress=progress,
+            log_path=log_path,
+            log_tail=log_tail,
+        )
+
+    def case_callback(self, label: str) -> Callable[..., None]:
+        def _callback(
+            *,
+            detail: str | None = None,
+            progress: float | None = None,
+            log_path: str | None = None,
+            log_tail: str | None = None,
+            **_,
+        ) -> None:
+            with self.lock:
+                if progress is not None:
+                    self.case_progress[label] = min(max(float(progress), 0.0), 1.0)
+                self.running[label] = detail or f"{label} · SU2 running..."
+                self._report(log_path=log_path, log_tail=log_tail)
+
+        return _callback
+
+    def done(self, label: str) -> None:
+        with self.lock:
+            self.case_progress[label] = 1.0
+            self.running.pop(label, None)
+            self.completed += 1
+            self._report()
+
+
+def run_su2_case(
+    config_dir: Path,
+    config_file: Path,
+    label: str,
+    nb_cpu: int = 1,
+    progress_callback: Callable[..., None] | None = None,
+) -> None:
+    """
+    Run one SU2 configuration file and check that it produced its force files.
+    """
+
+    run_software(
+        software_name=SOFTWARE_NAME,
+        arguments=[config_file],
+        wkdir=config_dir,
+        with_mpi=True,
+        nb_cpu=nb_cpu,
+        log_bool=True,
+        progress_callback=progress_callback,
+        progress_parser=(
+            _make_progress_parser(config_file, label)
+            if progress_callback is not None
+            else None
+        ),
+    )
+
+    check_force_files_exists(config_dir)
+
+
+def get_warm_start_chains(
+    jobs: list[tuple[Path, Path, str]],
+    nb_chains: int,
+) -> list[list[tuple[Path, Path, str]]]:
+    """
+    Group SU2 jobs into chains that are run sequentially along a continuation path.
+    Cases that can not be warm started (unsteady) are left in chains of their own.
+    """
+
+    chains = []
+    warm_jobs = []
+    points = []
+    for job in jobs:
+        flight_point = get_flight_point(job[1])
+        if flight_point is None:
+            chains.append([job])
+        else:
+            warm_jobs.append(job)
+            points.append(flight_point)
+
+    # Keep flight points on the same mesh next to each other on the path
+    order = []
+    for mesh in sorted({mesh for mesh, _ in points}):
+        idx = [i for i, (other_mesh, _) in enumerate(points) if other_mesh == mesh]
+        order += [idx[i] for i in order_continuation_path([points[i][1] for i in idx])]
+
+    for chain in split_continuation_path(order, nb_chains):
+        chains.append([warm_jobs[i] for i in chain])
+
+    return [chain for chain in chains if chain]
+
+
+def _run_su2_chain(
+    chain: list[tuple[Path, Path, str]],
+    nb_cpu: int,
+    converged: dict[Path, tuple[str, tuple[float, ...]]],
+    lock: threading.Lock,
+    multi_progress: "_SU2MultiProgress | None",
+) -> None:
+    """
+    Run a chain of SU2 jobs, each one restarted from the closest converged flight point.
+    If a warm started calculation fails, it is run again from freestream.
+    """
+
+    for config_dir, config_file, label in chain:
+        flight_point = get_flight_point(config_file)
+        source_dir = None
+        if flight_point is not None:
+            with lock:
+                source_dir = find_restart_source(*flight_point, converged)
+        set_restart(config_file, source_dir)
+
+        case_callback = multi_progress.case_callback(label) if multi_progress else None
+        try:
+            run_su2_case(config_dir, config_file, label, nb_cpu, case_callback)
+        except Exception:
+            if source_dir is None:
+                raise
+            log.warning(f"Warm start of {label} failed, running it again from freestream.")
+            set_restart(config_file, None)
+            run_su2_case(config_dir, config_file, label, nb_cpu, case_callback)
+
+        if flight_point is not None and is_converged(config_dir):
+            with lock:
+                converged[config_dir] = flight_point
+
+        if multi_progress is not None:
+            multi_progress.done(label)
+
+
+def run_su2_multi(
+    wkdir: Path,
+    nb_proc: int = 1,
+    *,
+    warm_start: bool = False,
+    progress_callback: Callable[..., None] | None = None,
+) -> None:
+    """
+    Run in the given working directory SU2 calculations.
+    The working directory must have a folder structure created by 'SU2Config' module.
+
+    Independent cases are run concurrently: the nb_proc CPUs are split between
+    several SU2 calculations, each one using a number of MPI ranks
+    sized from its mesh (see get_su2_job_layout).
+
+    With warm_start, flight points are sorted along a continuation path and each
+    one is restarted from the closest converged flight point on the same mesh.
+
+    Args:
+        wkdir (Path): Path to the working directory.
+        nb_proc (int): Number of processor that should be used to run the calculation in parallel.
+        warm_start (bool): Restart flight points from their converged neighbours.
+
+    """
+
+    jobs = get_su2_job_list(wkdir)
+
+    cloud = os.environ.get("CEASIOMPY_CLOUD", "False").lower() in {"1", "true", "yes"}
+    nb_proc = 1 if cloud else nb_proc
+
+    mesh_size = 0
+    for _, config_file, _ in jobs:
+        mesh_path = _get_mesh_path(config_file)
+        if mesh_path is not None and mesh_path.exists():
+            mesh_size = max(mesh_size, mesh_path.stat().st_size)
+
+    nb_workers, nb_cpu = get_su2_job_layout(len(jobs), nb_proc, mesh_size)
+    log.info(
+        f"Running {len(jobs)} SU2 case(s): {nb_workers} at a time "
+        f"with {nb_cpu} cpu(s) each."
+    )
+
+    multi_progress = (
+        _SU2MultiProgress([label for _, _, label in jobs], progress_callback)
+        if progress_callback is not None
+        else None
+    )
+
+    if warm_start:
+        chains = get_warm_start_chains(jobs, nb_workers)
+        converged: dict[Path, tuple[str, tuple[float, ...]]] = {}
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+            # Run in the context of the caller: the SU2 runs lease from its CPUs
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    _run_su2_chain,
+                    chain,
+                    nb_cpu,
+                    converged,
+                    lock,
+                    multi_progress,
+                )
+                for chain in chains
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return None
 
-            check_force_files_exists(config_dir)
+    with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+        future_to_label = {
+            executor.submit(
+                contextvars.copy_context().run,
+                run_su2_case,
+                config_dir,
+                config_file,
+                label,
+                nb_cpu,
+                multi_progress.case_callback(label) if multi_progress is not None else None,
+            ): label
+            for config_dir, config_file, label in jobs
+        }
+
+        try:
+            for future in as_completed(future_to_label):
+                label = future_to_label[future]
+                future.result()
+                if multi_progress is not None:
+                    multi_progress.done(label)
+        except Exception:
+            # Do not start remaining cases, running ones are left to finish.
+            for future in future_to_label:
+                future.cancel()
+            raise
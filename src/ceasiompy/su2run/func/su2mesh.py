@@ -0,0 +1,224 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Functions to read the markers of SU2 mesh files into NumPy arrays.
+
+"""
+
+# Imports
+
+import json
+
+import numpy as np
+
+from pathlib import Path
+from numpy import ndarray
+
+from ceasiompy import log
+from ceasiompy.utils.commonnames import SU2_MESH_INFO_SUFFIX
+
+# Constants
+
+# Number of nodes of the SU2 (VTK) element types found in marker sections
+SU2_ELEMENT_NODES = {
+    3: 2,  # Line
+    5: 3,  # Triangle
+    9: 4,  # Quadrilateral
+}
+
+MARKER_INDEX_SUFFIX = ".markers.npz"
+
+
+# Functions
+
+def _rows_to_nodes(rows: list[str]) -> ndarray:
+    """
+    Convert the element lines of a marker section to the array of their node ids.
+    """
+
+    if not rows:
+        return np.empty(0, dtype=np.int64)
+
+    tokens = [row.split() for row in rows]
+    row_lengths = {len(row_tokens) for row_tokens in tokens}
+
+    # Fast path: all elements of the marker have the same type
+    if len(row_lengths) == 1:
+        elements = np.array(tokens, dtype=np.int64)
+        nb_nodes = SU2_ELEMENT_NODES.get(int(elements[0, 0]), elements.shape[1] - 1)
+        return elements[:, 1:1 + nb_nodes].ravel()
+
+    nodes = []
+    for row_tokens in tokens:
+        nb_nodes = SU2_ELEMENT_NODES.get(int(row_tokens[0]), len(row_tokens) - 1)
+        nodes.extend(row_tokens[1:1 + nb_nodes])
+
+    return np.array(nodes, dtype=np.int64)
+
+
+def _unique_in_order(nodes: ndarray) -> ndarray:
+    _, first_idx = np.unique(nodes, return_index=True)
+    return nodes[np.sort(first_idx)]
+
+
+def read_marker_nodes(su2_mesh_path: Path) -> dict[str, ndarray]:
+    """
+    Read the SU2 mesh file once (line by line) and return, for each marker,
+    the array of the (unique) node ids of its elements, in order of appearance.
+
+    Args:
+        su2_mesh_path (Path): Path to the SU2 mesh file.
+
+    Returns:
+        marker_nodes (dict): Dictionary of marker name and node ids.
+
+    """
+
+    marker_nodes = {}
+    marker = None
+    rows = []
+
+    with open(su2_mesh_path) as f:
+        for line in f:
+            if "=" in line:
+                key, value = line.split("=", 1)
+                key = key.strip()
+
+                # Header of the marker section, its elements follow
+                if key == "MARKER_ELEMS":
+                    continue
+
+                # Any other header (next MARKER_TAG, NMARK, NPOIN...) closes the section
+                if marker is not None:
+                    marker_nodes[marker] = _unique_in_order(_rows_to_nodes(rows))
+                marker, rows = None, []
+
+                if key == "MARKER_TAG":
+                    marker = value.strip()
+
+            elif marker is not None and line.strip() and not line.startswith("%"):
+                rows.append(line)
+
+    if marker is not None:
+        marker_nodes[marker] = _unique_in_order(_rows_to_nodes(rows))
+
+    return marker_nodes
+
+
+def read_su2_mesh_info(su2_mesh_path: Path) -> dict | None:
+    """
+    Return the JSON sidecar written next to a SU2 mesh (see su2writer.write_su2_mesh_info),
+    or None if there is none or if it does not match the mesh file anymore.
+    """
+
+    su2_mesh_path = Path(su2_mesh_path)
+    info_path = su2_mesh_path.with_name(su2_mesh_path.name + SU2_MESH_INFO_SUFFIX)
+    if not info_path.is_file():
+        return None
+
+    try:
+        info = json.loads(info_path.read_text(encoding="utf-8"))
+        if info["mesh_size"] != su2_mesh_path.stat().st_size:
+            log.warning(f"{info_path.name} does not match {su2_mesh_path.name}, ignoring it.")
+            return None
+        info["markers"] = dict(info["markers"])
+    except (OSError, ValueError, KeyError, TypeError):
+        log.warning(f"Could not read SU2 mesh sidecar {info_path}.")
+        return None
+
+    return info
+
+
+def read_marker_names(su2_mesh_path: Path) -> list[str]:
+    """
+    Return the marker names of a SU2 mesh, from its sidecar if available,
+    otherwise by streaming the mesh file.
+    """
+
+    info = read_su2_mesh_info(su2_mesh_path)
+    if info is not None:
+        return list(info["markers"])
+
+    marker_names = []
+    with open(su2_mesh_path) as f:
+        for line in f:
+            if line.startswith("MARKER_TAG"):
+                marker_names.append(line.split("=", 1)[1].strip())
+
+    return marker_names
+
+
+def build_point_marker_index(marker_nodes: dict[str, ndarray]) -> tuple[list[str], ndarray]:
+    """
+    Build the point -> marker index from the node ids of each marker.
+    A point shared between several markers belongs to the first one.
+
+    Returns:
+        marker_names (list): Names of the markers.
+        point_marker (ndarray): Index in marker_names of the marker of each point (-1 if None).
+
+    """
+
+    marker_names = list(marker_nodes)
+    nb_points = max(
+        (int(nodes.max()) + 1 for nodes in marker_nodes.values() if nodes.size),
+        default=0,
+    )
+
+    point_marker = np.full(nb_points, -1, dtype=np.int32)
+    for i in reversed(range(len(marker_names))):
+        point_marker[marker_nodes[marker_names[i]]] = i
+
+    return marker_names, point_marker
+
+
+def get_point_marker_index(
+    su2_mesh_path: Path,
+    exclude: tuple[str, ...] = ("Farfield",),
+) -> tuple[list[str], ndarray]:
+    """
+    Return the point -> marker index of a SU2 mesh (see build_point_marker_index).
+
+    The index is cached next to the mesh in a '.markers.npz' file
+    and only rebuilt when the mesh file has been modified.
+
+    Args:
+        su2_mesh_path (Path): Path to the SU2 mesh file.
+        exclude (tuple): Markers containing these names are ignored.
+
+    """
+
+    su2_mesh_path = Path(su2_mesh_path)
+    cache_path = su2_mesh_path.with_name(su2_mesh_path.name + MARKER_INDEX_SUFFIX)
+    mesh_stat = su2_mesh_path.stat()
+    key = np.array([mesh_stat.st_mtime_ns, mesh_stat.st_size], dtype=np.int64)
+
+    if cache_path.exists():
+        try:
+            with np.load(cache_path) as cache:
+                if np.array_equal(cache["key"], key) and list(cache["exclude"]) == list(exclude):
+                    return [str(name) for name in cache["marker_names"]], cache["point_marker"]
+        except (OSError, KeyError, ValueError):
+            log.warning(f"Could not read marker index {cache_path}, rebuilding it.")
+
+    marker_nodes = {
+        marker: nodes
+        for marker, nodes in read_marker_nodes(su2_mesh_path).items()
+        if not any(name in marker for name in exclude)
+    }
+    marker_names, point_marker = build_point_marker_index(marker_nodes)
+
+    try:
+        np.savez(
+            cache_path,
+            key=key,
+            exclude=np.array(exclude, dtype=str),
+            marker_names=np.array(marker_names, dtype=str),
+            point_marker=point_marker,
+        )
+    except OSError:
+        log.warning(f"Could not write marker index cache {cache_path}.")
+
+    return marker_names, point_marker
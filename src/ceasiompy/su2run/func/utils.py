@@ -16,6 +16,7 @@ Functions to manipulate SU2 configuration and results.
 
 
 from cpacspy.cpacsfunctions import get_value
+from ceasiompy.su2run.func.su2mesh import read_marker_names
 
 from pathlib import Path
 from tixi3.tixi3wrapper import Tixi3
@@ -210,36 +211,30 @@ def get_mesh_markers(su2_mesh_path: Path) -> Dict:
         "wall": [],
     }
 
-    with open(su2_mesh_path) as f:
-
-        for line in f.readlines():
-            if "MARKER_TAG" not in line:
-                continue
-
-            marker = line.split("=")[1].strip()
-
-            if "farfield" in marker.lower():
-                mesh_markers["farfield"].append(marker)
-                log.info(f"'{marker}' marker has been marked as farfield.")
-            elif "symmetry" in marker.lower():
-                mesh_markers["symmetry"].append(marker)
-                log.info(f"'{marker}' marker has been marked as symmetry.")
-            elif marker.endswith(ENGINE_INTAKE_SUFFIX):
-                mesh_markers["engine_intake"].append(marker)
-                log.info(f"'{marker}' marker has been marked as engine_intake.")
-            elif marker.endswith(ENGINE_EXHAUST_SUFFIX):
-                mesh_markers["engine_exhaust"].append(marker)
-                log.info(f"'{marker}' marker has been marked as engine_exhaust.")
-            elif marker.endswith(ACTUATOR_DISK_INLET_SUFFIX):
-                mesh_markers["actuator_disk_inlet"].append(marker)
-                log.info(f"'{marker}' marker has been marked as actuator_disk_inlet.")
-            elif marker.endswith(ACTUATOR_DISK_OUTLET_SUFFIX):
-                mesh_markers["actuator_disk_outlet"].append(marker)
-                log.info(f"'{marker}' marker has been marked as actuator_disk_outlet.")
-            else:
-                # In SU2 wings and fuselages are marked as wall.
-                mesh_markers["wall"].append(marker)
-                log.info(f"'{marker}' marker has been marked as wall.")
+    # Marker names come from the mesh sidecar when CPACS2GMSH wrote one.
+    for marker in read_marker_names(su2_mesh_path):
+        if "farfield" in marker.lower():
+            mesh_markers["farfield"].append(marker)
+            log.info(f"'{marker}' marker has been marked as farfield.")
+        elif "symmetry" in marker.lower():
+            mesh_markers["symmetry"].append(marker)
+            log.info(f"'{marker}' marker has been marked as symmetry.")
+        elif marker.endswith(ENGINE_INTAKE_SUFFIX):
+            mesh_markers["engine_intake"].append(marker)
+            log.info(f"'{marker}' marker has been marked as engine_intake.")
+        elif marker.endswith(ENGINE_EXHAUST_SUFFIX):
+            mesh_markers["engine_exhaust"].append(marker)
+            log.info(f"'{marker}' marker has been marked as engine_exhaust.")
+        elif marker.endswith(ACTUATOR_DISK_INLET_SUFFIX):
+            mesh_markers["actuator_disk_inlet"].append(marker)
+            log.info(f"'{marker}' marker has been marked as actuator_disk_inlet.")
+        elif marker.endswith(ACTUATOR_DISK_OUTLET_SUFFIX):
+            mesh_markers["actuator_disk_outlet"].append(marker)
+            log.info(f"'{marker}' marker has been marked as actuator_disk_outlet.")
+        else:
+            # In SU2 wings and fuselages are marked as wall.
+            mesh_markers["wall"].append(marker)
+            log.info(f"'{marker}' marker has been marked as wall.")
 
     # Check if markers were found
     if not any(mesh_markers.values()):
@@ -0,0 +1,191 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Warm start of SU2 sweeps: each flight point is restarted
+from the closest already converged flight point on the same mesh.
+
+"""
+
+# Imports
+
+import os
+import math
+import shutil
+
+from pathlib import Path
+from ceasiompy.utils.configfiles import ConfigFile
+
+from ceasiompy import log
+from ceasiompy.utils.commonnames import (
+    CONFIG_DYNSTAB_NAME,
+    SU2_FORCES_BREAKDOWN_NAME,
+)
+
+# Constants
+
+SU2_RESTART_NAME = "restart_flow.dat"
+SU2_SOLUTION_NAME = "solution_flow.dat"
+
+# Flight point differences considered as "one step" along the continuation path:
+# (Mach, angle of attack [deg], angle of sideslip [deg], log of freestream pressure)
+FLIGHT_POINT_SCALES = (0.05, 1.0, 1.0, 0.1)
+
+
+# Functions
+
+def _to_float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_flight_point(config_file: Path) -> tuple[str, tuple[float, ...]] | None:
+    """
+    Return (mesh, scaled flight point) of a SU2 configuration file,
+    or None if the case can not be warm started (unsteady calculation).
+    """
+
+    if config_file.name == CONFIG_DYNSTAB_NAME:
+        return None
+
+    cfg = ConfigFile(config_file)
+    if str(cfg.data.get("TIME_DOMAIN", "NO")).upper() == "YES":
+        return None
+
+    pressure = max(_to_float(cfg.data.get("FREESTREAM_PRESSURE"), 101325.0), 1.0)
+    point = (
+        _to_float(cfg.data.get("MACH_NUMBER")),
+        _to_float(cfg.data.get("AOA")),
+        _to_float(cfg.data.get("SIDESLIP_ANGLE")),
+        math.log(pressure),
+    )
+    scaled_point = tuple(value / scale for value, scale in zip(point, FLIGHT_POINT_SCALES))
+
+    return str(cfg.data.get("MESH_FILENAME", "")), scaled_point
+
+
+def _distance(point_a: tuple[float, ...], point_b: tuple[float, ...]) -> float:
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(point_a, point_b)))
+
+
+def order_continuation_path(points: list[tuple[float, ...]]) -> list[int]:
+    """
+    Order flight points along a continuation path (greedy nearest neighbour),
+    starting from the smallest (Mach, alpha, beta) point.
+
+    Returns:
+        Indices of points in the order in which they should be run.
+
+    """
+
+    if not points:
+        return []
+
+    remaining = set(range(len(points)))
+    current = min(remaining, key=lambda i: points[i])
+    order = [current]
+    remaining.remove(current)
+
+    while remaining:
+        current = min(remaining, key=lambda i: (_distance(points[current], points[i]), i))
+        order.append(current)
+        remaining.remove(current)
+
+    return order
+
+
+def split_continuation_path(order: list[int], nb_chains: int) -> list[list[int]]:
+    """
+    Split a continuation path into at most nb_chains contiguous chains of similar length.
+    Each chain is meant to be run sequentially, chains are run concurrently.
+    """
+
+    nb_chains = max(1, min(nb_chains, len(order)))
+    size, extra = divmod(len(order), nb_chains)
+
+    chains = []
+    start = 0
+    for i in range(nb_chains):
+        end = start + size + (1 if i < extra else 0)
+        chains.append(order[start:end])
+        start = end
+
+    return chains
+
+
+def is_converged(config_dir: Path) -> bool:
+    """
+    Check that a SU2 calculation ended correctly and wrote a restart file
+    without NaN residuals.
+    """
+
+    if not Path(config_dir, SU2_RESTART_NAME).exists():
+        return False
+    if not Path(config_dir, SU2_FORCES_BREAKDOWN_NAME).exists():
+        return False
+
+    history_path = Path(config_dir, "history.csv")
+    if history_path.exists():
+        lines = [
+            line
+            for line in history_path.read_text(errors="replace").splitlines()
+            if line.strip()
+        ]
+        if lines and "nan" in lines[-1].lower():
+            return False
+
+    return True
+
+
+def find_restart_source(
+    mesh: str,
+    point: tuple[float, ...],
+    converged: dict[Path, tuple[str, tuple[float, ...]]],
+) -> Path | None:
+    """
+    Return the directory of the closest converged flight point on the same mesh.
+    """
+
+    candidates = [
+        (_distance(point, other_point), str(config_dir), config_dir)
+        for config_dir, (other_mesh, other_point) in converged.items()
+        if other_mesh == mesh
+    ]
+    if not candidates:
+        return None
+
+    return min(candidates)[2]
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def set_restart(config_file: Path, source_dir: Path | None) -> None:
+    """
+    Restart the calculation of config_file from the solution in source_dir,
+    or cold start it from freestream if source_dir is None.
+    """
+
+    cfg = ConfigFile(config_file)
+
+    if source_dir is None:
+        cfg["RESTART_SOL"] = "NO"
+    else:
+        _link_or_copy(
+            Path(source_dir, SU2_RESTART_NAME),
+            Path(config_file.parent, SU2_SOLUTION_NAME),
+        )
+        cfg["RESTART_SOL"] = "YES"
+        cfg["SOLUTION_FILENAME"] = SU2_SOLUTION_NAME
+        log.info(f"Warm start of {config_file.parent.name} from {source_dir.name}.")
+
+    cfg.write_file(config_file, overwrite=True)
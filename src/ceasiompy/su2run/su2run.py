@@ -14,9 +14,13 @@ Module to run SU2 Calculation in CEASIOMpy
 
 # Imports
 
-from cpacspy.cpacsfunctions import get_value
+from cpacspy.cpacsfunctions import (
+    get_value,
+    get_value_or_default,
+)
 from ceasiompy.su2run.func.results import get_su2_results
 from ceasiompy.utils.ceasiompyutils import get_sane_max_cpu
+from ceasiompy.utils.cpugovernor import cpu_lease
 from ceasiompy.su2run.func.runconfigfiles import run_su2_multi
 from ceasiompy.su2run.func.config import (
     define_markers,
@@ -32,6 +36,7 @@ from ceasiompy import log
 from ceasiompy.cpacs2gmsh import GMSH_XZ_SYMMETRY_XPATH
 from ceasiompy.utils.commonxpaths import GEOMETRY_MODE_XPATH
 from ceasiompy.su2run import (
+    SU2_WARM_START_XPATH,
     SU2_CONFIG_RANS_XPATH,
     SU2_DYNAMICDERIVATIVES_BOOL_XPATH,
 )
@@ -173,7 +178,14 @@ def main(
             log_tail=log_tail,
         )
 
-    run_su2_multi(results_dir, nb_proc, progress_callback=_su2_progress_update)
+    # The SU2 runs split the CPUs leased here between them (see cpugovernor.py)
+    with cpu_lease(nb_proc) as nb_proc:
+        run_su2_multi(
+            results_dir,
+            nb_proc,
+            warm_start=bool(get_value_or_default(tixi, SU2_WARM_START_XPATH, False)),
+            progress_callback=_su2_progress_update,
+        )
     _progress_update(progress_callback, detail="SU2 simulations completed.", progress=1.0)
 
     # 4. Retrieve SU2 results
@@ -42,7 +42,7 @@ class TestSU2ExtractLoads(unittest.TestCase):
 
     @patch(f"ceasiompy.{SU2RUN}.func.extractloads.compute_point_normals")
     @patch(f"ceasiompy.{SU2RUN}.func.extractloads.vtk_to_numpy")
-    @patch(f"ceasiompy.{SU2RUN}.func.extractloads.get_mesh_markers_ids")
+    @patch(f"ceasiompy.{SU2RUN}.func.extractloads.get_point_marker_index")
     @patch(f"ceasiompy.{SU2RUN}.func.extractloads.pd.DataFrame")
     @patch(f"ceasiompy.{SU2RUN}.func.extractloads.vtk.vtkXMLUnstructuredGridReader")
     def test_compute_forces(
@@ -57,12 +57,17 @@ class TestSU2ExtractLoads(unittest.TestCase):
             np.array([1.0, 2.0, 3.0]),  # pressure
         ]
         mock_compute_normals.return_value = np.ones((3, 3))
-        mock_get_markers.return_value = {"marker": [0, 1, 2]}
+        mock_get_markers.return_value = (["marker"], np.array([0, 0], dtype=np.int32))
         mock_df.return_value.to_csv = MagicMock()
         config_dict = {"MESH_FILENAME": "dummy.su2"}
         _ = compute_forces("dummy.vtu", "dummy_force.csv", config_dict)
         self.assertTrue(mock_df.called)
         self.assertTrue(mock_get_markers.called)
+        # Point 2 is not in the marker index
+        self.assertEqual(
+            list(mock_df.call_args.kwargs["data"]["marker"]),
+            ["marker", "marker", ""],
+        )
 
     def test_dimensionalize_pressure_dimensional(self):
         p = np.array([101325.0, 101400.0])
@@ -0,0 +1,143 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions of 'ceasiompy/su2run/func/su2mesh.py'
+"""
+
+# Imports
+
+import unittest
+import tempfile
+import numpy as np
+
+from ceasiompy.cpacs2gmsh.utility.su2writer import write_su2_mesh
+from ceasiompy.su2run.func.su2mesh import (
+    read_marker_nodes,
+    read_marker_names,
+    read_su2_mesh_info,
+    get_point_marker_index,
+    build_point_marker_index,
+)
+
+from pathlib import Path
+from unittest import main
+
+from ceasiompy.su2run.func.su2mesh import MARKER_INDEX_SUFFIX
+
+# =================================================================================================
+#   CONSTANTS
+# =================================================================================================
+
+SU2_MESH_1 = Path(Path(__file__).parent, "tests_su2utils", "test_mesh1.su2")
+
+
+# Functions
+
+def write_surface_mesh(su2_mesh_path: Path, nb_markers: int, nb_elems: int) -> None:
+    """
+    Write a SU2 mesh with nb_markers triangle markers of nb_elems elements each.
+    """
+
+    rng = np.random.default_rng(0)
+    nb_points = nb_markers * nb_elems
+    with open(su2_mesh_path, "w") as f:
+        f.write(f"NDIME=3\nNPOIN={nb_points}\n")
+        np.savetxt(f, rng.random((nb_points, 3)), fmt="%.6f")
+        f.write(f"NMARK={nb_markers}\n")
+        for i in range(nb_markers):
+            offset = i * nb_elems
+            nodes = offset + rng.integers(0, nb_elems, (nb_elems, 3))
+            f.write(f"MARKER_TAG=Marker{i}\nMARKER_ELEMS={nb_elems}\n")
+            np.savetxt(f, np.column_stack([np.full(nb_elems, 5), nodes]), fmt="%d")
+
+
+def legacy_point_markers(marker_dict: dict, nb_points: int) -> list[str]:
+    """
+    Point to marker lookup with Python lists, as done previously in compute_forces.
+    """
+
+    mesh_marker = []
+    for i in range(nb_points):
+        for marker, ids_list in marker_dict.items():
+            if i in ids_list:
+                mesh_marker.append(marker)
+                break
+        else:
+            mesh_marker.append("")
+    return mesh_marker
+
+
+# =================================================================================================
+#   CLASSES
+# =================================================================================================
+
+
+class TestSU2Mesh(unittest.TestCase):
+
+    def test_read_marker_nodes(self):
+        marker_nodes = read_marker_nodes(SU2_MESH_1)
+        self.assertEqual(list(marker_nodes)[0], "D150_VAMP_SL1")
+        self.assertIn("D150_ENGINE1_Ex", marker_nodes)
+        self.assertIn("Farfield", marker_nodes)
+        np.testing.assert_array_equal(
+            marker_nodes["D150_VAMP_SL1"][:6], [0, 1, 1382, 2, 3, 1387]
+        )
+
+    def test_build_point_marker_index(self):
+        marker_names, point_marker = build_point_marker_index(
+            {"A": np.array([0, 1]), "B": np.array([1, 3])}
+        )
+        self.assertEqual(marker_names, ["A", "B"])
+        np.testing.assert_array_equal(point_marker, [0, 0, -1, 1])
+
+    def test_get_point_marker_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            su2_mesh_path = Path(tmpdir, "mesh.su2")
+            write_surface_mesh(su2_mesh_path, nb_markers=3, nb_elems=20)
+
+            marker_names, point_marker = get_point_marker_index(su2_mesh_path)
+            cache_path = Path(tmpdir, "mesh.su2" + MARKER_INDEX_SUFFIX)
+            self.assertTrue(cache_path.exists())
+            self.assertEqual(marker_names, ["Marker0", "Marker1", "Marker2"])
+
+            cached_names, cached_point_marker = get_point_marker_index(su2_mesh_path)
+            self.assertEqual(cached_names, marker_names)
+            np.testing.assert_array_equal(cached_point_marker, point_marker)
+
+            marker_dict = {
+                name: nodes.tolist() for name, nodes in read_marker_nodes(su2_mesh_path).items()
+            }
+            expected = legacy_point_markers(marker_dict, len(point_marker))
+            names = np.array(marker_names + [""], dtype=object)
+            self.assertEqual(list(names[point_marker]), expected)
+
+    def test_read_su2_mesh_info(self):
+        self.assertIsNone(read_su2_mesh_info(SU2_MESH_1))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            su2_mesh_path = Path(tmpdir, "mesh.su2")
+            write_su2_mesh(
+                su2_mesh_path,
+                points=np.eye(4, 3),
+                elements=np.array([[0, 1, 2, 3]]),
+                markers={"wall": np.array([[0, 1, 2]]), "Farfield": np.array([[1, 2, 3]])},
+            )
+
+            info = read_su2_mesh_info(su2_mesh_path)
+            self.assertEqual(info["nelem"], 1)
+            self.assertEqual(info["npoin"], 4)
+            self.assertEqual(info["markers"], {"Farfield": 1, "wall": 1})
+            self.assertEqual(read_marker_names(su2_mesh_path), ["Farfield", "wall"])
+
+            # An outdated sidecar is ignored, markers are read from the mesh
+            with open(su2_mesh_path, "a") as f:
+                f.write("MARKER_TAG=extra\nMARKER_ELEMS=0\n")
+            self.assertIsNone(read_su2_mesh_info(su2_mesh_path))
+            self.assertEqual(read_marker_names(su2_mesh_path), ["Farfield", "wall", "extra"])
+
+
+# Main
+if __name__ == "__main__":
+    main(verbosity=0)
@@ -0,0 +1,73 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions of 'ceasiompy/su2run/func/runconfigfiles.py'
+"""
+
+# Imports
+
+import unittest
+import tempfile
+
+from ceasiompy.su2run.func.runconfigfiles import (
+    get_su2_job_list,
+    get_su2_job_layout,
+)
+
+from pathlib import Path
+from unittest import main
+
+from ceasiompy.su2run import SU2_MESH_BYTES_PER_CPU
+from ceasiompy.utils.commonnames import CONFIG_CFD_NAME
+
+# =================================================================================================
+#   CLASSES
+# =================================================================================================
+
+
+class TestSU2RunConfigFiles(unittest.TestCase):
+
+    def test_get_su2_job_layout(self):
+        # Many small cases: one cpu each, as many as possible at a time
+        self.assertEqual(get_su2_job_layout(40, 64), (40, 1))
+
+        # Few cases: spread remaining cpus between them
+        self.assertEqual(get_su2_job_layout(3, 64), (3, 21))
+
+        # Large mesh needs at least 4 ranks per case
+        self.assertEqual(get_su2_job_layout(30, 16, 4 * SU2_MESH_BYTES_PER_CPU), (4, 4))
+
+        # Mesh larger than the machine: one case at a time on all cpus
+        self.assertEqual(get_su2_job_layout(5, 8, 100 * SU2_MESH_BYTES_PER_CPU), (1, 8))
+
+        # Single cpu
+        self.assertEqual(get_su2_job_layout(10, 1), (1, 1))
+
+    def test_get_su2_job_list(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            wkdir = Path(tmpdir)
+
+            with self.assertRaises(FileNotFoundError):
+                get_su2_job_list(wkdir)
+
+            flat_case = Path(wkdir, "Case00_alt0_mach0.3_aoa0.0_aos0.0")
+            flat_case.mkdir()
+            Path(flat_case, CONFIG_CFD_NAME).touch()
+
+            dynstab_case = Path(wkdir, "Case01_alt0_mach0.3_anglealpha_dynstab")
+            Path(dynstab_case, "aileron").mkdir(parents=True)
+            Path(dynstab_case, "aileron", CONFIG_CFD_NAME).touch()
+
+            jobs = get_su2_job_list(wkdir)
+            self.assertEqual(
+                [label for _, _, label in jobs],
+                [flat_case.name, f"{dynstab_case.name}/aileron"],
+            )
+            self.assertEqual(jobs[1][1], Path(dynstab_case, "aileron", CONFIG_CFD_NAME))
+
+
+# Main
+if __name__ == "__main__":
+    main(verbosity=0)
@@ -0,0 +1,88 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions of 'ceasiompy/su2run/func/warmstart.py'
+"""
+
+# Imports
+
+import unittest
+import tempfile
+
+from ceasiompy.su2run.func.warmstart import (
+    set_restart,
+    is_converged,
+    find_restart_source,
+    order_continuation_path,
+    split_continuation_path,
+)
+
+from pathlib import Path
+from unittest import main
+from ceasiompy.utils.configfiles import ConfigFile
+
+from ceasiompy.su2run.func.warmstart import (
+    SU2_RESTART_NAME,
+    SU2_SOLUTION_NAME,
+)
+from ceasiompy.utils.commonnames import SU2_FORCES_BREAKDOWN_NAME
+
+# =================================================================================================
+#   CLASSES
+# =================================================================================================
+
+
+class TestSU2WarmStart(unittest.TestCase):
+
+    def test_order_continuation_path(self):
+        points = [(0.0, 4.0), (0.0, 0.0), (0.0, 2.0), (0.0, 1.0), (0.0, 3.0)]
+        self.assertEqual(order_continuation_path(points), [1, 3, 2, 4, 0])
+        self.assertEqual(order_continuation_path([]), [])
+
+    def test_split_continuation_path(self):
+        self.assertEqual(split_continuation_path([0, 1, 2, 3, 4], 2), [[0, 1, 2], [3, 4]])
+        self.assertEqual(split_continuation_path([0, 1], 5), [[0], [1]])
+
+    def test_find_restart_source(self):
+        converged = {
+            Path("Case00"): ("mesh.su2", (0.0, 0.0)),
+            Path("Case01"): ("mesh.su2", (0.0, 2.0)),
+            Path("Case02"): ("aileron.su2", (0.0, 3.0)),
+        }
+        self.assertEqual(find_restart_source("mesh.su2", (0.0, 3.0), converged), Path("Case01"))
+        self.assertIsNone(find_restart_source("rudder.su2", (0.0, 3.0), converged))
+
+    def test_set_restart(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_dir = Path(tmpdir, "Case00")
+            case_dir = Path(tmpdir, "Case01")
+            source_dir.mkdir()
+            case_dir.mkdir()
+
+            self.assertFalse(is_converged(source_dir))
+            Path(source_dir, SU2_RESTART_NAME).write_text("restart")
+            Path(source_dir, SU2_FORCES_BREAKDOWN_NAME).touch()
+            Path(source_dir, "history.csv").write_text('"Inner_Iter","rms[Rho]"\n10, -8.1\n')
+            self.assertTrue(is_converged(source_dir))
+
+            Path(source_dir, "history.csv").write_text('"Inner_Iter","rms[Rho]"\n10, nan\n')
+            self.assertFalse(is_converged(source_dir))
+
+            config_file = Path(case_dir, "ConfigCFD.cfg")
+            config_file.write_text("RESTART_SOL = NO\nAOA = 2.0\n")
+
+            set_restart(config_file, source_dir)
+            cfg = ConfigFile(config_file)
+            self.assertEqual(cfg["RESTART_SOL"], "YES")
+            self.assertEqual(cfg["SOLUTION_FILENAME"], SU2_SOLUTION_NAME)
+            self.assertEqual(Path(case_dir, SU2_SOLUTION_NAME).read_text(), "restart")
+
+            set_restart(config_file, None)
+            self.assertEqual(ConfigFile(config_file)["RESTART_SOL"], "NO")
+
+
+# Main
+if __name__ == "__main__":
+    main(verbosity=0)
@@ -10,6 +10,14 @@ Initialization for ThermoData module.
 
 from pathlib import Path
 
+from ceasiompy.utils.commonxpaths import (
+    ENGINE_BC,
+    RANGE_XPATH,
+    ENGINE_TYPE_XPATH,
+    AEROPERFORMANCE_XPATH,
+    SELECTED_AEROMAP_XPATH,
+)
+
 # ==============================================================================
 #   INITIALIZATION
 # ==============================================================================
@@ -23,3 +31,15 @@ RES_DIR = True
 
 MODULE_DIR = Path(__file__).parent
 MODULE_NAME = MODULE_DIR.name
+
+# ===== CPACS xpaths read and written (workflow dependency graph) =====
+CPACS_INPUTS = (
+    RANGE_XPATH,
+    ENGINE_TYPE_XPATH,
+    AEROPERFORMANCE_XPATH,
+    SELECTED_AEROMAP_XPATH,
+)
+CPACS_OUTPUTS = (
+    ENGINE_BC,
+    AEROPERFORMANCE_XPATH,
+)
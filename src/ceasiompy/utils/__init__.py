@@ -13,7 +13,7 @@ Initialization for UTILS.
 # Imports
 
 from ceasiompy.utils.commonpaths import get_wkdir
-from ceasiompy.utils.ceasiompyutils import get_module_status
+from ceasiompy.utils.softwarepaths import get_module_status
 
 # ==============================================================================
 #   INITIALIZATION
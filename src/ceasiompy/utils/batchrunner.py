@@ -0,0 +1,339 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Headless batch runner: run one workflow (ceasiompy.cfg) on many CPACS files and
+parameter variants, and gather the aeromaps of all the cases in one table.
+
+A parameter table is a CSV file with one row per variant. Its columns are CPACS
+xpaths, whose value is set in the CPACS file of the case, and an optional 'name'.
+Each variant is applied to each CPACS file.
+
+The workflows run in a pool of processes sharing the CPU budget (MAX_CPUS), the
+CPUs are leased by the solvers of the workflows (see cpugovernor.py). The
+processes are reused from case to case: modules are only imported once, and the
+caches of the processes (and the mesh cache on disk) are shared between cases.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import os
+import csv
+import time
+import traceback
+import multiprocessing
+
+import pandas as pd
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+from typing import NamedTuple
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.configfiles import ConfigFile
+
+# Constants
+
+BATCH_DIR_PREFIX = "Batch_"
+BATCH_RESULTS_NAME = "batch_results.csv"
+BATCH_SUMMARY_NAME = "batch_summary.csv"
+
+# Column of a parameter table giving the name of the variants
+VARIANT_NAME_COLUMN = "name"
+
+
+# Classes
+
+class BatchCase(NamedTuple):
+    name: str
+    cpacs_path: Path
+    parameters: dict[str, str]
+
+
+# Functions
+
+def get_cpacs_files(inputs: list[Path]) -> list[Path]:
+    """Return the CPACS files given directly or found (*.xml) in the given directories."""
+
+    cpacs_files: list[Path] = []
+    for path in inputs:
+        path = Path(path).expanduser().absolute()
+        if path.is_dir():
+            cpacs_files.extend(sorted(path.glob("*.xml")))
+        elif path.is_file():
+            cpacs_files.append(path)
+        else:
+            raise FileNotFoundError(f"{path} has not been found!")
+
+    return cpacs_files
+
+
+def read_parameter_table(table_path: Path) -> list[dict[str, str]]:
+    """Return the variants (one dict of column -> value per row) of a parameter table."""
+
+    with open(table_path, newline="", encoding="utf-8") as table_file:
+        rows = [
+            {key.strip(): value.strip() for key, value in row.items() if key}
+            for row in csv.DictReader(table_file)
+        ]
+
+    for row in rows:
+        for column in row:
+            if column != VARIANT_NAME_COLUMN and not column.startswith("/"):
+                raise ValueError(f"Column '{column}' of {table_path} is not a CPACS xpath.")
+
+    return rows
+
+
+def get_batch_cases(
+    cpacs_files: list[Path],
+    variants: list[dict[str, str]] | None = None,
+) -> list[BatchCase]:
+    """Return the cases of a batch: each variant (if any) of each CPACS file, with unique names."""
+
+    cases: list[BatchCase] = []
+    names: set[str] = set()
+    for cpacs_path in cpacs_files:
+        for idx, variant in enumerate(variants or [{}]):
+            variant = dict(variant)
+            name = cpacs_path.stem
+            if variants:
+                name += "_" + (variant.pop(VARIANT_NAME_COLUMN, "") or f"{idx + 1:03d}")
+
+            unique_name, cnt = name, 1
+            while unique_name in names:
+                cnt += 1
+                unique_name = f"{name}_{cnt}"
+            names.add(unique_name)
+
+            cases.append(BatchCase(unique_name, cpacs_path, variant))
+
+    return cases
+
+
+def apply_parameters(cpacs_path: Path, parameters: dict[str, str], cpacs_out: Path) -> Path:
+    """Write in cpacs_out the CPACS file with the value of each xpath of parameters set."""
+
+    tree = ET.parse(cpacs_path)
+    root = tree.getroot()
+
+    for xpath, value in parameters.items():
+        tags = xpath.strip("/").split("/", 1)
+        element = root.find(tags[1]) if tags[0] == root.tag and len(tags) > 1 else None
+        if element is None:
+            raise ValueError(f"Xpath {xpath} has not been found in {cpacs_path}.")
+        element.text = value
+
+    tree.write(cpacs_out, encoding="utf-8", xml_declaration=True)
+
+    return Path(cpacs_out)
+
+
+def create_batch_dir(wkdir: Path) -> Path:
+    """Create the next Batch_XXX directory of a working directory."""
+
+    wkdir.mkdir(parents=True, exist_ok=True)
+    indices = [
+        int(batch_dir.name.removeprefix(BATCH_DIR_PREFIX))
+        for batch_dir in wkdir.glob(f"{BATCH_DIR_PREFIX}*")
+        if batch_dir.name.removeprefix(BATCH_DIR_PREFIX).isdigit()
+    ]
+    batch_dir = Path(wkdir, BATCH_DIR_PREFIX + str(max(indices, default=0) + 1).rjust(3, "0"))
+    batch_dir.mkdir()
+
+    return batch_dir
+
+
+def _init_worker(max_cpus: int) -> None:
+    """
+    Set the CPU budget shared by the workers, disable the plots of the softwares
+    and import the workflow machinery once.
+    """
+
+    os.environ["MAX_CPUS"] = str(max_cpus)
+    os.environ["CEASIOMPY_NO_GRAPHICS"] = "1"
+
+    import ceasiompy.utils.workflowclasses  # noqa: F401
+
+
+def _read_aeromaps(cpacs_path: Path) -> list[dict]:
+    """Return the rows of all the aeromaps of a CPACS file."""
+
+    from cpacspy.cpacspy import AeroMap
+    from cpacspy.cpacsfunctions import open_tixi
+    from ceasiompy.utils.commonxpaths import AEROPERFORMANCE_XPATH
+
+    tixi = open_tixi(str(cpacs_path))
+    if not tixi.checkElement(AEROPERFORMANCE_XPATH):
+        return []
+
+    records: list[dict] = []
+    for i in range(tixi.getNamedChildrenCount(AEROPERFORMANCE_XPATH, "aeroMap")):
+        uid = tixi.getTextAttribute(f"{AEROPERFORMANCE_XPATH}/aeroMap[{i + 1}]", "uID")
+        for record in AeroMap(tixi, uid).df.to_dict("records"):
+            records.append({"aeromap": uid, **record})
+
+    return records
+
+
+def _run_case(case: BatchCase, cfg_path: Path, case_dir: Path) -> dict:
+    """Run the workflow of cfg_path on one case, in its own working directory."""
+
+    from ceasiompy.utils.workflowclasses import (
+        Workflow,
+        get_workflow_outcome,
+    )
+
+    start = time.perf_counter()
+    summary = {"case": case.name, "cpacs": str(case.cpacs_path), "status": "failed"}
+    try:
+        case_dir.mkdir(parents=True, exist_ok=True)
+        cpacs_in = case.cpacs_path
+        if case.parameters:
+            cpacs_in = apply_parameters(cpacs_in, case.parameters, Path(case_dir, "variant.xml"))
+
+        # Same workflow, on the CPACS of the case
+        cfg = ConfigFile(cfg_path)
+        cfg["CPACS_TOOLINPUT"] = cpacs_in
+        case_cfg_path = Path(case_dir, "ceasiompy.cfg")
+        cfg.write_file(case_cfg_path, overwrite=True)
+
+        workflow = Workflow()
+        workflow.from_config_file(case_cfg_path)
+        workflow.set_workflow()
+        workflow.run_workflow()
+
+        summary["workflow_dir"] = str(workflow.current_wkflow_dir)
+        summary["status"], detail = get_workflow_outcome(workflow.current_wkflow_dir)
+        if detail is not None:
+            summary["detail"] = detail
+            summary["aeromaps"] = []
+        else:
+            summary["aeromaps"] = _read_aeromaps(
+                Path(workflow.current_wkflow_dir, "ToolOutput.xml")
+            )
+
+    except Exception as exc:
+        summary["detail"] = f"{type(exc).__name__}: {exc}"
+        summary["traceback"] = traceback.format_exc()
+        summary["aeromaps"] = []
+
+    summary["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+
+    return summary
+
+
+def write_results(results: pd.DataFrame, results_path: Path) -> Path:
+    """Write the results table in CSV, or Parquet if results_path ends with .parquet."""
+
+    if results_path.suffix == ".parquet":
+        try:
+            results.to_parquet(results_path, index=False)
+            return results_path
+        except ImportError as err:
+            log.warning(f"Can not write Parquet ({err}), writing CSV instead.")
+            results_path = results_path.with_suffix(".csv")
+
+    results.to_csv(results_path, index=False)
+
+    return results_path
+
+
+def run_batch(
+    cfg_path: Path,
+    inputs: list[Path] | None = None,
+    parameter_table: Path | None = None,
+    wkdir: Path | None = None,
+    nb_cpus: int | None = None,
+    nb_workers: int | None = None,
+    results_path: Path | None = None,
+) -> Path:
+    """
+    Run the workflow of cfg_path on each case of the batch and return the path of the
+    consolidated aeromaps of all the cases (one row per aeromap point and case).
+
+    Args:
+        cfg_path (Path): Workflow configuration file (ceasiompy.cfg).
+        inputs (list[Path]): CPACS files or directories, the CPACS of cfg_path by default.
+        parameter_table (Path): CSV file of CPACS variants (see module docstring).
+        wkdir (Path): Directory in which the Batch_XXX directory is created.
+        nb_cpus (int): CPU budget shared by all the workflows.
+        nb_workers (int): Number of workflows run concurrently.
+        results_path (Path): Results file (.csv or .parquet), in the batch directory by default.
+
+    """
+
+    cfg_path = Path(cfg_path).absolute()
+    if not inputs:
+        inputs = [Path(cfg_path.parent, ConfigFile(cfg_path)["CPACS_TOOLINPUT"])]
+
+    variants = read_parameter_table(parameter_table) if parameter_table is not None else None
+    cases = get_batch_cases(get_cpacs_files(inputs), variants)
+    if not cases:
+        raise ValueError("No CPACS file has been found for the batch.")
+
+    nb_cpus = max(int(nb_cpus or os.cpu_count() or 1), 1)
+    if nb_workers is None:
+        # By default each workflow gets (at least) two CPUs
+        nb_workers = max(nb_cpus // 2, 1)
+    nb_workers = max(min(int(nb_workers), len(cases), nb_cpus), 1)
+
+    batch_dir = create_batch_dir(Path(wkdir) if wkdir is not None else cfg_path.parent)
+    log.info(
+        f"Running {len(cases)} case(s) in {batch_dir} "
+        f"on {nb_workers} process(es) sharing {nb_cpus} cpu(s)."
+    )
+
+    summaries: list[dict] = []
+    records: list[dict] = []
+
+    # Spawn fresh interpreters: modules may hold non fork-safe state (gmsh, threads)
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=nb_workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(nb_cpus,),
+    ) as executor:
+        futures = {
+            executor.submit(_run_case, case, cfg_path, Path(batch_dir, case.name)): case
+            for case in cases
+        }
+        for future in as_completed(futures):
+            case = futures[future]
+            summary = future.result()
+            aeromaps = summary.pop("aeromaps")
+            if "traceback" in summary:
+                log.error(summary.pop("traceback"))
+            summaries.append(summary)
+
+            log.info(
+                f"Case {case.name}: {summary['status']} "
+                f"({len(summaries)}/{len(cases)}) {summary.get('detail', '')}"
+            )
+            for record in aeromaps:
+                records.append({"case": case.name, **case.parameters, **record})
+
+    case_order = {case.name: idx for idx, case in enumerate(cases)}
+    summaries.sort(key=lambda summary: case_order[summary["case"]])
+    pd.DataFrame(summaries).to_csv(Path(batch_dir, BATCH_SUMMARY_NAME), index=False)
+
+    results_path = write_results(
+        pd.DataFrame(records),
+        Path(results_path) if results_path is not None else Path(batch_dir, BATCH_RESULTS_NAME),
+    )
+
+    nb_failed = sum(summary["status"] != "finished" for summary in summaries)
+    if nb_failed:
+        log.warning(f"{nb_failed}/{len(cases)} case(s) failed, see {BATCH_SUMMARY_NAME}.")
+    log.info(f"Results of the batch written in {results_path}.")
+
+    return results_path
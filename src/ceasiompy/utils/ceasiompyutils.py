@@ -10,18 +10,26 @@ Functions utils to run ceasiompy workflows
 
 import re
 import os
-import sys
 import shutil
 import argparse
 import importlib
 import inspect
 import subprocess
-import time
 import streamlit as st
 
 from pydantic import validate_call
 from contextlib import contextmanager
 from ceasiompy.utils import get_wkdir
+from ceasiompy.utils.softwarepaths import get_install_path
+from ceasiompy.utils.progressbus import follow_output
+from ceasiompy.utils.cpugovernor import (
+    cpu_lease,
+    get_sane_max_cpu,
+)
+from ceasiompy.utils.profiling import (
+    profiled,
+    profile_span,
+)
 from ceasiompy.utils.moduleinterfaces import (
     get_module_list,
     get_specs_for_module,
@@ -54,10 +62,7 @@ from ceasiompy import (
     log,
     ceasiompy_cfg,
 )
-from ceasiompy.utils.commonpaths import (
-    INSTALLDIR_PATH,
-    CPACS_FILES_PATH,
-)
+from ceasiompy.utils.commonpaths import CPACS_FILES_PATH
 from ceasiompy.utils.moduleinterfaces import (
     MODNAME_INIT,
     MODNAME_SPECS,
@@ -87,30 +92,6 @@ def update_xpath_at_xyz(tixi: Tixi3, xpath: str, x: str, y: str, z: str) -> None
     tixi.updateTextElement(xpath + "/z", z)
 
 
-def _check_software_exists(soft_name: str) -> bool:
-    soft_path = get_install_path(software_name=soft_name)
-    if soft_path is None:
-        # i.e. the path to the software does not exist
-        return False
-    else:
-        return True
-
-
-def get_module_status(
-    default: bool,
-    needs_soft_name: str | None = None,
-) -> bool:
-    # Return
-    if not default:
-        return False
-
-    if needs_soft_name is not None:
-        return _check_software_exists(needs_soft_name)
-
-    # Does not need a specific software and default is True
-    return True
-
-
 def write_inouts(
     tixi: Tixi3,
     df: DataFrame,
@@ -351,12 +332,15 @@ def run_module(
     test=False,
     *,
     progress_callback: Callable[..., None] | None = None,
+    cpacs: CPACS | None = None,
 ):
     """Run a 'ModuleToRun' object in a specific wkdir.
 
     Args:
         module (ModuleToRun): 'ModuleToRun' object (define in workflowclasses.py)
         wkdir (Path, optional): Path of the working directory. Defaults to Path.cwd().
+        cpacs (CPACS, optional): Live CPACS object to run the module on, then saved by the
+            caller (see utils/livecpacs.py). Defaults to loading and saving module's CPACS files.
     """
 
     module_name = module.name
@@ -381,12 +365,16 @@ def run_module(
             log.warning(f"No python files found for module {module_name}.")
 
         # Import the main function from the module's python file
-        my_module = importlib.import_module(f"ceasiompy.{module_name}.{python_file}")
+        with profile_span(f"import {module_name}"):
+            my_module = importlib.import_module(f"ceasiompy.{module_name}.{python_file}")
 
         # Run the module
         with change_working_dir(wkdir):
             # Try loading with full CPACS (for 3D files)
-            cpacs = CPACS(cpacs_in)
+            save_cpacs = cpacs is None
+            if cpacs is None:
+                with profile_span("load CPACS"):
+                    cpacs = CPACS(cpacs_in)
 
             if test:
                 log.info("Updating CPACS from __specs__")
@@ -401,125 +389,18 @@ def run_module(
                 if main_sig is not None and "progress_callback" in main_sig.parameters:
                     main_kwargs["progress_callback"] = progress_callback
 
-            if module.results_dir is None:
-                my_module.main(cpacs, **main_kwargs)
-            else:
-                my_module.main(cpacs, module.results_dir, **main_kwargs)
-            cpacs.save_cpacs(cpacs_out, overwrite=True)
+            with profile_span(f"{module_name}.main"):
+                if module.results_dir is None:
+                    my_module.main(cpacs, **main_kwargs)
+                else:
+                    my_module.main(cpacs, module.results_dir, **main_kwargs)
+            if save_cpacs:
+                with profile_span("save CPACS"):
+                    cpacs.save_cpacs(cpacs_out, overwrite=True)
 
             log.info("---------- End of " + module_name + " ---------- \n")
 
 
-def get_install_path(
-    software_name: str,
-    raise_error: bool = False,
-    display_name: str | None = None,
-) -> Path | None:
-    """Return the installation path of a software.
-
-    Args:
-        software_name (str): Name of the software.
-        raise_error (bool, optional): If True, raise an error if the software is not installed.
-        display_name (str, optional): Friendly name used in logs. Defaults to software_name.
-
-    """
-
-    display_name = display_name or software_name
-
-    def _is_compatible_executable(path: Path) -> bool:
-        if not (path.is_file() and os.access(path, os.X_OK)):
-            return False
-        if sys.platform == "darwin" and _detect_binary_format(path) == "elf":
-            log.warning(
-                "%s was found at %s but appears to be a Linux ELF executable; "
-                "skipping it on macOS.",
-                display_name,
-                path,
-            )
-            return False
-        return True
-
-    # First, try to locate the software inside INSTALLDIR_PATH
-    if INSTALLDIR_PATH.exists():
-        # Directly under INSTALLDIR_PATH
-        candidate = INSTALLDIR_PATH / software_name
-        if _is_compatible_executable(candidate):
-            log.info(f"{display_name} is installed at: {candidate}")
-            return candidate
-
-        # Common layout: installdir/<pkg>[/bin]/<software_name>
-        for subdir in INSTALLDIR_PATH.iterdir():
-            if not subdir.is_dir():
-                continue
-
-            direct = subdir / software_name
-            if _is_compatible_executable(direct):
-                log.info(f"{display_name} is installed at: {direct}")
-                return direct
-
-            bin_candidate = subdir / "bin" / software_name
-            if _is_compatible_executable(bin_candidate):
-                log.info(f"{display_name} is installed at: {bin_candidate}")
-                return bin_candidate
-
-            bin_candidate = subdir / "bin" / software_name.lower()
-            if _is_compatible_executable(bin_candidate):
-                log.info(f"{display_name} is installed at: {bin_candidate}")
-                return bin_candidate
-
-    # If not found in installdir, fall back to the system PATH
-    install_path = shutil.which(software_name)
-
-    if install_path is not None:
-        resolved = Path(install_path)
-        if _is_compatible_executable(resolved):
-            log.info(f"{display_name} is installed at: {install_path}")
-            return resolved
-        else:
-            log.warning(f"{software_name=} at {install_path=} is not compatible.")
-
-    log.warning(f"{display_name} is not installed on your computer!")
-
-    if raise_error:
-        raise FileNotFoundError(f"{display_name} is not installed on your computer!")
-    else:
-        return None
-
-
-def _detect_binary_format(executable: Path) -> str:
-    """Best-effort detection of a binary format based on magic bytes.
-
-    Returns one of: "mach-o", "elf", "unknown".
-    """
-
-    try:
-        with open(executable, "rb") as handle:
-            header = handle.read(4)
-    except OSError:
-        return "unknown"
-
-    if header == b"\x7fELF":
-        return "elf"
-
-    # Mach-O magics (thin + universal).
-    if header in (
-        b"\xfe\xed\xfa\xce",
-        b"\xce\xfa\xed\xfe",
-        b"\xfe\xed\xfa\xcf",
-        b"\xcf\xfa\xed\xfe"
-    ):
-        return "mach-o"
-    if header in (
-        b"\xca\xfe\xba\xbe",
-        b"\xbe\xba\xfe\xca",
-        b"\xca\xfe\xba\xbf",
-        b"\xbf\xba\xfe\xca"
-    ):
-        return "mach-o"
-
-    return "unknown"
-
-
 def check_version(software_name: str, required_version: str) -> tuple[bool, str]:
     """
     Check if the version is greater than or equal to the required version.
@@ -571,6 +452,27 @@ def parse_bool(value: str) -> bool:
     raise argparse.ArgumentTypeError(f"Invalid boolean value: {value!r}")
 
 
+def with_xvfb(command_line: list) -> list:
+    """Return command_line run in a virtual X server (xvfb-run), if xvfb-run is installed."""
+
+    xvfb_run = shutil.which("xvfb-run")
+    if xvfb_run is None:
+        log.warning("xvfb-run not found. Proceeding without it.")
+        return command_line
+
+    # Derive a unique starting display number from the current PID so
+    # that concurrent xvfb-run processes (across forked workers) don't
+    # all start searching from the same number.  --auto-servernum still
+    # searches upward from this offset if the exact slot is taken.
+    server_num = os.getpid() % 2000 + 100
+    return [
+        "xvfb-run",
+        f"--server-num={server_num}",
+        "--auto-servernum",
+    ] + command_line
+
+
+@profiled(label_arg="software_name")
 def run_software(
     software_name: str,
     arguments: list[str],
@@ -581,13 +483,17 @@ def run_software(
     log_bool: bool = True,
     xvfb: bool = False,
     progress_callback: Callable[..., None] | None = None,
-    progress_parser: Optional[Callable[[Path], tuple]] = None,
-    poll_interval: float = 0.5,
+    progress_parser: Optional[Callable[[str], Optional[tuple]]] = None,
+    progress_interval: float = 0.5,
     timeout: Optional[float] = None,
 ) -> None:
     """Run a software with the given arguments in a specific wkdir. If the software is compatible
     with MPI, 'with_mpi' can be set to True and the number of processors can be specified.
     A logfile will be created in the wkdir.
+
+    If a progress_parser is given, it is called with each line of the output and returns
+    (progress, detail) for the lines reporting a progress (or None), which is sent to
+    progress_callback at most every progress_interval seconds (see utils/progressbus.py).
     """
 
     # Check nb_cpus
@@ -598,49 +504,39 @@ def run_software(
     if nb_cpu > 1:
         _check_nb_cpu(nb_cpu)
 
-    log.info(
-        f"{int(nb_cpu)} cpu{'s' if nb_cpu > 1 else ''} "
-        f"over {get_sane_max_cpu()} will be used for this calculation."
-    )
-
-    install_path = get_install_path(software_name)
-
-    command_line = []
-    if with_mpi:
-        mpiexec_install_path = get_install_path("mpiexec")  # "mpirun.mpich"
-        # If runs with open mpi add --allow-run-as-root
-        if mpiexec_install_path is not None:
-            command_line += [mpiexec_install_path, "-np", str(int(nb_cpu))]
-        # mpirun_install_path = get_install_path("mpiexec")  # "mpirun.mpich"
-        # # If runs with open mpi add --allow-run-as-root
-        # if mpi_install_path is not None:
-        #     command_line += [mpi_install_path, "-np", str(int(nb_cpu))]
-
-    command_line += [install_path]
-    command_line += arguments
-
-    if xvfb:
-        xvfb_run = shutil.which("xvfb-run")
-        if xvfb_run is None:
-            log.warning("xvfb-run not found. Proceeding without it.")
-        else:
-            # Derive a unique starting display number from the current PID so
-            # that concurrent xvfb-run processes (across forked workers) don't
-            # all start searching from the same number.  --auto-servernum still
-            # searches upward from this offset if the exact slot is taken.
-            server_num = os.getpid() % 2000 + 100
-            command_line = [
-                "xvfb-run",
-                f"--server-num={server_num}",
-                "--auto-servernum",
-            ] + command_line
-
-    log.info(f">>> Running {software_name} on {int(nb_cpu)} cpu(s)")
-    log.info(f"Working directory: {wkdir}")
-    log.info("Command line that will be run is:")
-    log.info(" ".join(map(str, command_line)))
-
-    with change_working_dir(wkdir):
+    # Wait for free CPUs, shared with the other solvers and workflows (see cpugovernor.py)
+    with cpu_lease(nb_cpu, minimum=nb_cpu) as nb_cpu:
+        log.info(
+            f"{int(nb_cpu)} cpu{'s' if nb_cpu > 1 else ''} "
+            f"over {get_sane_max_cpu()} will be used for this calculation."
+        )
+
+        install_path = get_install_path(software_name)
+
+        command_line = []
+        if with_mpi:
+            mpiexec_install_path = get_install_path("mpiexec")  # "mpirun.mpich"
+            # If runs with open mpi add --allow-run-as-root
+            if mpiexec_install_path is not None:
+                command_line += [mpiexec_install_path, "-np", str(int(nb_cpu))]
+            # mpirun_install_path = get_install_path("mpiexec")  # "mpirun.mpich"
+            # # If runs with open mpi add --allow-run-as-root
+            # if mpi_install_path is not None:
+            #     command_line += [mpi_install_path, "-np", str(int(nb_cpu))]
+
+        command_line += [install_path]
+        command_line += arguments
+
+        if xvfb:
+            command_line = with_xvfb(command_line)
+
+        log.info(f">>> Running {software_name} on {int(nb_cpu)} cpu(s)")
+        log.info(f"Working directory: {wkdir}")
+        log.info("Command line that will be run is:")
+        log.info(" ".join(map(str, command_line)))
+
+        # Subprocesses are started with cwd=wkdir, the interpreter's working directory is
+        # left untouched so that several softwares can be run concurrently from threads.
         if log_bool:
             logfile_path = Path(wkdir, f"logfile_{software_name}.log")
             with open(logfile_path, "w") as logfile:
@@ -664,34 +560,37 @@ def run_software(
                         )
                         raise
                 else:
+                    # The output is consumed line by line by a reader thread,
+                    # which writes it to the logfile and reports the progress
                     proc = subprocess.Popen(
                         command_line,
-                        stdout=logfile,
+                        stdout=subprocess.PIPE,
                         stdin=stdin,
                         cwd=wkdir,
+                        text=True,
+                        errors="replace",
+                        bufsize=1,
                     )
-                    deadline = time.monotonic() + timeout if timeout is not None else None
-                    while True:
-                        retcode = proc.poll()
-                        progress, detail, log_tail = progress_parser(logfile_path)
-                        if progress_callback is not None:
-                            progress_callback(
-                                detail=detail,
-                                progress=progress,
-                                log_path=str(logfile_path),
-                                log_tail=log_tail,
-                            )
-                        if retcode is not None:
-                            break
-                        if deadline is not None and time.monotonic() > deadline:
-                            proc.kill()
-                            proc.wait()
-                            log.error(
-                                f"{software_name} timed out after {timeout}s and was killed."
-                            )
-                            raise subprocess.TimeoutExpired(command_line, timeout)
-                        time.sleep(poll_interval)
-                    proc.wait()
+                    reader = follow_output(
+                        proc.stdout,
+                        logfile,
+                        progress_parser,
+                        progress_callback,
+                        logfile_path,
+                        min_interval=progress_interval,
+                    )
+                    try:
+                        proc.wait(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        proc.wait()
+                        log.error(
+                            f"{software_name} timed out after {timeout}s and was killed."
+                        )
+                        raise
+                    finally:
+                        reader.join()
+                        proc.stdout.close()
         else:
             try:
                 if stdin is None:
@@ -707,53 +606,17 @@ def run_software(
     log.info(f">>> {software_name} End")
 
 
-def _get_env_max_cpus() -> Optional[int]:
-    """
-    Return the value of MAX_CPUS if it exists and is a positive integer.
-    """
-    max_cpus_val = os.environ.get("MAX_CPUS")
-    if max_cpus_val is None:
-        return None
-
-    try:
-        max_cpus = int(max_cpus_val)
-    except ValueError:
-        log.warning("MAX_CPUS must be an integer, got %r.", max_cpus_val)
-        return None
-
-    if max_cpus < 1:
-        log.warning("MAX_CPUS must be positive, got %d.", max_cpus)
-        return None
-
-    return max_cpus
-
-
 def has_display() -> bool:
     """X11 and Wayland conventions"""
     return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
 
 
-def get_sane_max_cpu() -> int:
+def graphics_enabled() -> bool:
     """
-    Return a sane upper bound on the number of CPUs that can be used.
-    This prefers the MAX_CPUS environment variable and falls back to the
-    value returned by os.cpu_count(). A warning is emitted if neither source
-    yields a usable number.
+    Return True if the softwares should write their plots: a display is available and
+    graphics are not disabled with CEASIOMPY_NO_GRAPHICS (set in batch runs).
     """
-
-    cpu_count = os.cpu_count()
-    if cpu_count is None or cpu_count in [1, 2]:
-        return 1
-
-    env_cpus = _get_env_max_cpus()
-    if env_cpus is None:
-        return cpu_count - 1
-
-    sane_cpu = min(cpu_count - 1, env_cpus)
-    if sane_cpu < 1:
-        return 1
-
-    return sane_cpu
+    return has_display() and not os.environ.get("CEASIOMPY_NO_GRAPHICS")
 
 
 def _check_nb_cpu(nb_proc: int) -> None:
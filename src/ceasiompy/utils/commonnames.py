@@ -31,6 +31,9 @@ SURFACE_FLOW_FILE_NAME = "surface_flow.vtu"
 SURFACE_FLOW_FORCE_FILE_NAME = "surface_flow_forces.vtu"
 FORCE_FILE_NAME = "forces.csv"
 
+# Sidecar of SU2 meshes with their sizes and marker names (e.g. mesh.su2.info.json)
+SU2_MESH_INFO_SUFFIX = ".info.json"
+
 ENGINE_INTAKE_SUFFIX = "_In"
 ENGINE_EXHAUST_SUFFIX = "_Ex"
 
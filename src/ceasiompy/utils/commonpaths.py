@@ -47,6 +47,15 @@ BLACKCEASIOMPY_LOGO_PATH = Path(LOGOS_PATH, "blackceasiompy.svg")
 # /CEASIOMpy/.ceasiompy/.runworkflow_history
 RUNWORKFLOW_HISTORY_PATH = Path(CEASIOMPY_PATH, ".ceasiompy", ".runworkflow_history")
 
+# /CEASIOMpy/.ceasiompy/mesh_cache/
+MESH_CACHE_PATH = Path(CEASIOMPY_PATH, ".ceasiompy", "mesh_cache")
+
+# /CEASIOMpy/.ceasiompy/jobs.sqlite
+JOB_DB_PATH = Path(CEASIOMPY_PATH, ".ceasiompy", "jobs.sqlite")
+
+# /CEASIOMpy/.ceasiompy/cpu_tokens/
+CPU_TOKENS_PATH = Path(CEASIOMPY_PATH, ".ceasiompy", "cpu_tokens")
+
 # /CEASIOMpy/src/app
 STREAMLIT_PATH = Path(SRC_PATH, "app")
 
@@ -80,3 +89,30 @@ def get_wkdir() -> Path:
     if env_wkdir:
         return Path(env_wkdir)
     return WKDIR_PATH
+
+
+def get_mesh_cache_dir() -> Path:
+    """Return mesh cache directory passed with CEASIOMPY_MESH_CACHE_DIR, or the default."""
+
+    env_cache_dir = os.environ.get("CEASIOMPY_MESH_CACHE_DIR")
+    if env_cache_dir:
+        return Path(env_cache_dir)
+    return MESH_CACHE_PATH
+
+
+def get_job_db_path() -> Path:
+    """Return job queue database passed with CEASIOMPY_JOB_DB, or the default."""
+
+    env_job_db = os.environ.get("CEASIOMPY_JOB_DB")
+    if env_job_db:
+        return Path(env_job_db)
+    return JOB_DB_PATH
+
+
+def get_cpu_tokens_dir() -> Path:
+    """Return CPU tokens directory passed with CEASIOMPY_CPU_TOKENS_DIR, or the default."""
+
+    env_tokens_dir = os.environ.get("CEASIOMPY_CPU_TOKENS_DIR")
+    if env_tokens_dir:
+        return Path(env_tokens_dir)
+    return CPU_TOKENS_PATH
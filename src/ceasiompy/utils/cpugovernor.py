@@ -0,0 +1,270 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+CPU governor shared by all the solvers and pools of CEASIOMpy.
+
+CPUs are leased with cpu_lease. Each leased CPU is a token: an exclusive lock on one
+of the cpu_XXX.lock files of the token directory (see get_cpu_tokens_dir), shared by
+all the CEASIOMpy processes of the machine. A process only uses the first
+get_sane_max_cpu() tokens, concurrent runs never use more than MAX_CPUS CPUs.
+The locks are released by the system when a process ends, even if it crashes.
+
+The CPUs of a lease are only lent to the work started from it: leases taken in the
+context of a lease (same thread, or threads run in a copy of its context, see
+contextvars.copy_context) draw from its CPUs, and the workers of a pool started
+with init_worker_lease draw from the share given by their parent. Nested parallelism
+(e.g. PyAVL pools in SMTrain pools) does not oversubscribe the CPUs, and unrelated
+threads of the process (e.g. two workflows run from the GUI) take their own tokens.
+
+Without fcntl (Windows), leases are granted without locking.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import os
+import time
+import threading
+import contextvars
+
+from pathlib import Path
+from contextlib import contextmanager
+from typing import (
+    Iterator,
+    Optional,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.commonpaths import get_cpu_tokens_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Constants
+
+# Time (s) between two attempts to lease CPUs
+LEASE_POLL_INTERVAL = 0.2
+
+ALLOCATION_LOCK_NAME = "allocation.lock"
+
+
+# Classes
+
+class _CPUShare:
+    """CPUs of a lease (or given by the parent process), lent to its nested leases."""
+
+    def __init__(self, nb_cpus: int) -> None:
+        self.condition = threading.Condition()
+        self.total = nb_cpus
+        self.free = nb_cpus
+
+    def lend(self, wanted: int, minimum: int) -> int:
+        """Lend up to wanted CPUs (at least minimum), waiting until they are given back."""
+
+        with self.condition:
+            minimum = max(min(minimum, wanted, self.total), 1)
+            self.condition.wait_for(lambda: self.free >= minimum)
+            lent = min(wanted, self.free)
+            self.free -= lent
+
+            return lent
+
+    def give_back(self, nb_cpus: int) -> None:
+        with self.condition:
+            self.free += nb_cpus
+            self.condition.notify_all()
+
+
+# Share of the lease in which the current code runs
+_PARENT_SHARE: contextvars.ContextVar[_CPUShare | None] = contextvars.ContextVar(
+    "ceasiompy_cpu_share", default=None
+)
+
+# Share given to a worker of a pool by its parent (see init_worker_lease)
+_WORKER_SHARE: _CPUShare | None = None
+
+# Only one thread of the process at a time takes tokens
+_ALLOCATION_LOCK = threading.Lock()
+
+
+# Functions
+
+def _get_env_max_cpus() -> Optional[int]:
+    """
+    Return the value of MAX_CPUS if it exists and is a positive integer.
+    """
+    max_cpus_val = os.environ.get("MAX_CPUS")
+    if max_cpus_val is None:
+        return None
+
+    try:
+        max_cpus = int(max_cpus_val)
+    except ValueError:
+        log.warning("MAX_CPUS must be an integer, got %r.", max_cpus_val)
+        return None
+
+    if max_cpus < 1:
+        log.warning("MAX_CPUS must be positive, got %d.", max_cpus)
+        return None
+
+    return max_cpus
+
+
+def get_sane_max_cpu() -> int:
+    """
+    Return a sane upper bound on the number of CPUs that can be used.
+    This prefers the MAX_CPUS environment variable and falls back to the
+    value returned by os.cpu_count(). A warning is emitted if neither source
+    yields a usable number.
+    """
+
+    cpu_count = os.cpu_count()
+    if cpu_count is None or cpu_count in [1, 2]:
+        return 1
+
+    env_cpus = _get_env_max_cpus()
+    if env_cpus is None:
+        return cpu_count - 1
+
+    sane_cpu = min(cpu_count - 1, env_cpus)
+    if sane_cpu < 1:
+        return 1
+
+    return sane_cpu
+
+
+def _try_lock(path: Path) -> int | None:
+    """Return the file descriptor of path locked, None if it is locked by someone else."""
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+def _memory_available(memory_mb: float | None) -> bool:
+    if memory_mb is None or psutil is None:
+        return True
+    return psutil.virtual_memory().available >= memory_mb * 1024**2
+
+
+def _take_tokens(wanted: int, minimum: int, budget: int, memory_mb: float | None) -> list[int]:
+    """Lock between minimum and wanted tokens among the first budget ones, wait if needed."""
+
+    tokens_dir = get_cpu_tokens_dir()
+    tokens_dir.mkdir(parents=True, exist_ok=True)
+
+    waiting = False
+    while True:
+        # The tokens of a lease are taken all at once, two processes
+        # waiting for several tokens never hold a part of them each
+        with _ALLOCATION_LOCK:
+            allocation_fd = os.open(
+                Path(tokens_dir, ALLOCATION_LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o666
+            )
+            try:
+                fcntl.flock(allocation_fd, fcntl.LOCK_EX)
+
+                fds: list[int] = []
+                if _memory_available(memory_mb):
+                    for idx in range(budget):
+                        if len(fds) == wanted:
+                            break
+                        fd = _try_lock(Path(tokens_dir, f"cpu_{idx:03d}.lock"))
+                        if fd is not None:
+                            fds.append(fd)
+
+                if len(fds) >= minimum:
+                    return fds
+
+                for fd in fds:
+                    _unlock(fd)
+            finally:
+                fcntl.flock(allocation_fd, fcntl.LOCK_UN)
+                os.close(allocation_fd)
+
+        if not waiting:
+            waiting = True
+            memory = f" and {memory_mb:.0f} MB" if memory_mb is not None else ""
+            log.info(f"Waiting for {minimum} free cpu(s){memory}.")
+        time.sleep(LEASE_POLL_INTERVAL)
+
+
+@contextmanager
+def cpu_lease(
+    nb_cpus: int | None = None,
+    minimum: int = 1,
+    memory_mb: float | None = None,
+) -> Iterator[int]:
+    """
+    Lease up to nb_cpus CPUs (all the CPUs of the budget by default) and at least
+    minimum, waiting until they are free. Yields the number of CPUs leased.
+    In the context of another lease, the CPUs are borrowed from it.
+
+    Args:
+        nb_cpus (int): Number of CPUs wanted.
+        minimum (int): Number of CPUs needed to start.
+        memory_mb (float): Memory needed to start (in MB), if psutil is installed.
+
+    """
+
+    budget = get_sane_max_cpu()
+    wanted = max(min(int(nb_cpus or budget), budget), 1)
+
+    # Nested lease: CPUs of the enclosing lease (or of the parent process)
+    parent_share = _PARENT_SHARE.get() or _WORKER_SHARE
+    if parent_share is not None:
+        lent = parent_share.lend(wanted, minimum)
+        try:
+            yield lent
+        finally:
+            parent_share.give_back(lent)
+        return None
+
+    if fcntl is None:
+        fds: list[int] = []
+        leased = wanted
+    else:
+        fds = _take_tokens(wanted, max(min(minimum, wanted), 1), budget, memory_mb)
+        leased = len(fds)
+
+    share_token = _PARENT_SHARE.set(_CPUShare(leased))
+    try:
+        yield leased
+    finally:
+        _PARENT_SHARE.reset(share_token)
+        for fd in fds:
+            _unlock(fd)
+
+
+def init_worker_lease(nb_cpus: int) -> None:
+    """
+    Initializer of the workers of a pool (ProcessPoolExecutor(initializer=...)):
+    the leases of the worker draw from the nb_cpus CPUs given by its parent.
+    """
+
+    global _WORKER_SHARE
+
+    # A forked worker inherits the lease of its parent, its CPUs are not its own
+    _PARENT_SHARE.set(None)
+    _WORKER_SHARE = _CPUShare(max(int(nb_cpus), 1))
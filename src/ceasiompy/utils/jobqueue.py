@@ -0,0 +1,497 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Local job queue of workflows, shared by the GUI and the CLI.
+
+Workflows are submitted (see JobQueue.submit) to a SQLite database and run by the
+worker processes of a service (see serve), at most one workflow per worker. The
+workflow directory of a job is reserved at submission: its status is followed in
+its workflow_status.json, like a workflow run directly.
+
+Run the service with:
+
+    python -m ceasiompy.utils.jobqueue --workers 2
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import threading
+import traceback
+import subprocess
+import multiprocessing
+
+from pathlib import Path
+from contextlib import contextmanager
+from typing import (
+    Iterator,
+    NamedTuple,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.configfiles import ConfigFile
+from ceasiompy.utils.commonpaths import get_job_db_path
+
+# Constants
+
+# Marker of the workflow directories reserved by a job
+JOB_FILE_NAME = "job.json"
+JOB_CFG_NAME = "job.cfg"
+JOB_CPACS_NAME = "job_cpacs.xml"
+
+JOB_STATUS = ["queued", "running", "finished", "failed", "cancelled"]
+ACTIVE_JOB_STATUS = ("queued", "running")
+
+# A worker without heartbeat for this time (s) is considered stopped
+HEARTBEAT_TIMEOUT = 30.0
+HEARTBEAT_INTERVAL = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cfg_path TEXT NOT NULL,
+    workflow_dir TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    submitter TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker_pid INTEGER,
+    detail TEXT,
+    graphics INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS workers (
+    pid INTEGER PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+"""
+
+
+# Classes
+
+class Job(NamedTuple):
+    id: int
+    cfg_path: str
+    workflow_dir: str
+    status: str
+    submitter: str | None
+    submitted_at: float
+    started_at: float | None
+    finished_at: float | None
+    worker_pid: int | None
+    detail: str | None
+    graphics: bool = False
+
+
+class JobQueue:
+    """Queue of workflows stored in a SQLite database (see get_job_db_path)."""
+
+    def __init__(self, db_path: Path | None = None) -> None:
+        self.db_path = Path(db_path) if db_path is not None else get_job_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+            # Databases created before the graphics column
+            columns = [row["name"] for row in connection.execute("PRAGMA table_info(jobs)")]
+            if "graphics" not in columns:
+                connection.execute(
+                    "ALTER TABLE jobs ADD COLUMN graphics INTEGER NOT NULL DEFAULT 0"
+                )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit, transactions are explicit (BEGIN IMMEDIATE)
+        connection = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def submit(
+        self,
+        cfg_path: Path,
+        submitter: str | None = None,
+        graphics: bool = False,
+    ) -> Job:
+        """
+        Add the workflow of a configuration file to the queue. Its CPACS file and
+        configuration are copied in the workflow directory reserved for the job.
+        Softwares write their plots only if graphics is True (jobs submitted from the GUI).
+        """
+
+        cfg_path = Path(cfg_path).absolute()
+        cfg = ConfigFile(cfg_path)
+
+        wkflow_dir = reserve_workflow_dir(cfg_path.parent)
+
+        # Later modifications of the submitted files do not change the job
+        job_cpacs = Path(wkflow_dir, JOB_CPACS_NAME)
+        shutil.copy(Path(cfg_path.parent, cfg["CPACS_TOOLINPUT"]), job_cpacs)
+        cfg["CPACS_TOOLINPUT"] = job_cpacs
+        job_cfg = Path(wkflow_dir, JOB_CFG_NAME)
+        cfg.write_file(job_cfg, overwrite=True)
+
+        with self._connection() as connection:
+            job_id = connection.execute(
+                "INSERT INTO jobs "
+                "(cfg_path, workflow_dir, status, submitter, submitted_at, graphics) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (str(job_cfg), str(wkflow_dir), submitter, time.time(), int(graphics)),
+            ).lastrowid
+
+        Path(wkflow_dir, JOB_FILE_NAME).write_text(
+            json.dumps({"id": job_id, "db_path": str(self.db_path)}), encoding="utf-8"
+        )
+        log.info(f"Job {job_id} submitted in {wkflow_dir}.")
+
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: int) -> Job | None:
+        with self._connection() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else _to_job(row)
+
+    def find_job(self, wkflow_dir: Path) -> Job | None:
+        """Return the job of a workflow directory, None if it was not run as a job."""
+
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE workflow_dir = ?", (str(Path(wkflow_dir).absolute()),)
+            ).fetchone()
+        return None if row is None else _to_job(row)
+
+    def list_jobs(self, limit: int = 50) -> list[Job]:
+        """Return the last submitted jobs, most recent first."""
+
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_to_job(row) for row in rows]
+
+    def claim(self, worker_pid: int) -> Job | None:
+        """Mark the oldest queued job as running by worker_pid and return it."""
+
+        with self._connection() as connection:
+            # Only one worker at a time can claim a job
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, worker_pid = ? "
+                    "WHERE id = ?",
+                    (time.time(), worker_pid, row["id"]),
+                )
+            connection.execute("COMMIT")
+
+        return None if row is None else self.get_job(row["id"])
+
+    def finish(self, job_id: int, status: str, detail: str | None = None) -> None:
+        if status not in JOB_STATUS:
+            raise ValueError(f"Job status {status} not in {JOB_STATUS}.")
+
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, detail = ? WHERE id = ?",
+                (status, time.time(), detail, job_id),
+            )
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued job, return False if it is not queued anymore."""
+
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, worker_pid: int) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO workers (pid, heartbeat) VALUES (?, ?)",
+                (worker_pid, time.time()),
+            )
+
+    def remove_worker(self, worker_pid: int) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM workers WHERE pid = ?", (worker_pid,))
+
+    def get_alive_workers(self) -> list[int]:
+        """Return the pid of the workers with a recent heartbeat."""
+
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT pid FROM workers WHERE heartbeat > ?",
+                (time.time() - HEARTBEAT_TIMEOUT,),
+            ).fetchall()
+        return [row["pid"] for row in rows]
+
+    def recover_stale_jobs(self) -> list[int]:
+        """Mark as failed the running jobs whose worker has stopped, return their ids."""
+
+        alive_workers = self.get_alive_workers()
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, worker_pid FROM jobs WHERE status = 'running'"
+            ).fetchall()
+            stale = [row["id"] for row in rows if row["worker_pid"] not in alive_workers]
+            connection.executemany(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, "
+                "detail = 'The worker running the job has stopped.' WHERE id = ?",
+                [(time.time(), job_id) for job_id in stale],
+            )
+            connection.execute("COMMIT")
+
+        for job_id in stale:
+            log.warning(f"Job {job_id} failed: its worker has stopped.")
+
+        return stale
+
+
+# Functions
+
+def _to_job(row: sqlite3.Row) -> Job:
+    return Job(**dict(row, graphics=bool(row["graphics"])))
+
+
+def reserve_workflow_dir(working_dir: Path) -> Path:
+    """Create the next Workflow_XXX directory of a working directory, without race."""
+
+    indices = [
+        int(wkflow_dir.name.split("_")[-1])
+        for wkflow_dir in Path(working_dir).glob("Workflow_*")
+        if wkflow_dir.name.split("_")[-1].isdigit()
+    ]
+    idx = max(indices, default=0) + 1
+    while True:
+        wkflow_dir = Path(working_dir, "Workflow_" + str(idx).rjust(3, "0")).absolute()
+        try:
+            wkflow_dir.mkdir(parents=True)
+        except FileExistsError:
+            # Reserved meanwhile by another process
+            idx += 1
+            continue
+        # Never reused by Workflow.set_workflow, the job id is added at submission
+        Path(wkflow_dir, JOB_FILE_NAME).write_text("{}", encoding="utf-8")
+        return wkflow_dir
+
+
+def get_workflow_job(wkflow_dir: Path) -> Job | None:
+    """Return the job of a workflow directory, None if it has not been submitted as a job."""
+
+    try:
+        marker = json.loads(Path(wkflow_dir, JOB_FILE_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if "id" not in marker:
+        return None
+
+    return JobQueue(marker.get("db_path")).get_job(marker["id"])
+
+
+def run_job(job: Job) -> tuple[str, str | None]:
+    """Run the workflow of a job, return its status and a possible error."""
+
+    from ceasiompy.utils.workflowclasses import (
+        Workflow,
+        get_workflow_outcome,
+    )
+
+    wkflow_dir = Path(job.workflow_dir)
+
+    # Plots only for the jobs which asked for them (see JobQueue.submit)
+    no_graphics = os.environ.get("CEASIOMPY_NO_GRAPHICS")
+    if not job.graphics:
+        os.environ["CEASIOMPY_NO_GRAPHICS"] = "1"
+
+    try:
+        workflow = Workflow()
+        workflow.from_config_file(Path(job.cfg_path))
+        # Checkpoints of the other workflows of the working directory can be reused
+        workflow.working_dir = wkflow_dir.parent
+        workflow.set_workflow(wkflow_dir=wkflow_dir)
+        workflow.run_workflow()
+    finally:
+        if no_graphics is None:
+            os.environ.pop("CEASIOMPY_NO_GRAPHICS", None)
+        else:
+            os.environ["CEASIOMPY_NO_GRAPHICS"] = no_graphics
+
+    return get_workflow_outcome(wkflow_dir)
+
+
+def run_worker(
+    db_path: Path | None = None,
+    max_cpus: int | None = None,
+    poll_interval: float = 1.0,
+) -> None:
+    """
+    Run the queued jobs one after the other, until the process is stopped.
+    max_cpus is the CPU budget shared by all the workers (see cpugovernor.py).
+    """
+
+    if max_cpus is not None:
+        os.environ["MAX_CPUS"] = str(max_cpus)
+
+    job_queue = JobQueue(db_path)
+    pid = os.getpid()
+
+    # Heartbeat in a thread, a job may run for hours
+    stop = threading.Event()
+
+    def _heartbeat() -> None:
+        while not stop.is_set():
+            job_queue.heartbeat(pid)
+            stop.wait(HEARTBEAT_INTERVAL)
+
+    # Alive before claiming a job, see JobQueue.recover_stale_jobs
+    job_queue.heartbeat(pid)
+    heartbeat_thread = threading.Thread(target=_heartbeat, name="heartbeat", daemon=True)
+    heartbeat_thread.start()
+
+    try:
+        while True:
+            job = job_queue.claim(pid)
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+
+            log.info(f"Worker {pid} runs job {job.id} in {job.workflow_dir}.")
+            try:
+                status, detail = run_job(job)
+            except Exception as exc:
+                log.error(traceback.format_exc())
+                status, detail = "failed", f"{type(exc).__name__}: {exc}"
+            job_queue.finish(job.id, status, detail)
+            log.info(f"Job {job.id} {status}.")
+    finally:
+        stop.set()
+        job_queue.remove_worker(pid)
+
+
+def serve(
+    nb_workers: int = 1,
+    nb_cpus: int | None = None,
+    db_path: Path | None = None,
+    poll_interval: float = HEARTBEAT_INTERVAL,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Run the jobs of the queue with nb_workers worker processes sharing nb_cpus,
+    until the process is stopped (or the stop event is set).
+    The workers which exit (e.g. crash of gmsh or out of memory) are restarted and
+    the jobs of the workers without heartbeat are marked as failed.
+    """
+
+    job_queue = JobQueue(db_path)
+    job_queue.recover_stale_jobs()
+
+    nb_workers = max(int(nb_workers), 1)
+    nb_cpus = max(int(nb_cpus or os.cpu_count() or 1), 1)
+    log.info(
+        f"Job queue {job_queue.db_path}: {nb_workers} worker(s) sharing {nb_cpus} cpu(s)."
+    )
+
+    # Spawn fresh interpreters: modules may hold non fork-safe state (gmsh, threads)
+    mp_context = multiprocessing.get_context("spawn")
+
+    def _start_worker(i: int) -> multiprocessing.Process:
+        worker = mp_context.Process(
+            target=run_worker,
+            args=(job_queue.db_path, nb_cpus),
+            name=f"ceasiompy-worker-{i + 1}",
+        )
+        worker.start()
+        return worker
+
+    workers = [_start_worker(i) for i in range(nb_workers)]
+    stop = threading.Event() if stop is None else stop
+
+    try:
+        while not stop.wait(poll_interval):
+            for i, worker in enumerate(workers):
+                if worker.is_alive():
+                    continue
+                log.warning(
+                    f"Worker {worker.pid} stopped (exit code {worker.exitcode}), restarting it."
+                )
+                job_queue.remove_worker(worker.pid)
+                workers[i] = _start_worker(i)
+            job_queue.recover_stale_jobs()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log.info("Stopping the job queue workers.")
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+            job_queue.remove_worker(worker.pid)
+        job_queue.recover_stale_jobs()
+
+
+def start_service(nb_workers: int = 1, db_path: Path | None = None) -> bool:
+    """
+    Start the job queue service in the background if no worker is running.
+    Return True if it has been started.
+    """
+
+    job_queue = JobQueue(db_path)
+    if job_queue.get_alive_workers():
+        return False
+
+    log_path = job_queue.db_path.with_suffix(".log")
+    with open(log_path, "a") as service_log:
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "ceasiompy.utils.jobqueue",
+                "--workers",
+                str(nb_workers),
+                "--db",
+                str(job_queue.db_path),
+            ],
+            stdout=service_log,
+            stderr=subprocess.STDOUT,
+            # Not stopped with the GUI
+            start_new_session=True,
+        )
+    log.info(f"Job queue service started, logs in {log_path}.")
+
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the CEASIOMpy job queue service.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of concurrent jobs.")
+    parser.add_argument("--cpus", type=int, default=None, help="CPUs shared by the jobs.")
+    parser.add_argument("--db", type=Path, default=None, help="Job queue database.")
+    args = parser.parse_args()
+
+    serve(nb_workers=args.workers, nb_cpus=args.cpus, db_path=args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+In-process handoff of one CPACS object between consecutive modules of a workflow.
+
+The CPACS file is parsed (and TiGL opened) once. After each module, the CPACS is
+exported from TIXI in memory and written to the module output file in a background
+thread, and TiGL is only reopened when the module modified the geometry.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import hashlib
+
+import xml.etree.ElementTree as ET
+
+from cpacspy.cpacsfunctions import open_tigl
+
+from pathlib import Path
+from cpacspy.cpacspy import CPACS
+from cpacspy.aircraft import Aircraft
+from cpacspy.rotorcraft import Rotorcraft
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.commonxpaths import AIRCRAFT_NAME_XPATH
+
+# Constants
+
+AIRCRAFT_MODEL_XPATH = "/cpacs/vehicles/aircraft/model"
+ROTORCRAFT_MODEL_XPATH = "/cpacs/vehicles/rotorcraft/model"
+
+# CPACS subtrees read by TiGL and by the Aircraft/Rotorcraft objects of cpacspy
+GEOMETRY_XPATHS = (
+    AIRCRAFT_MODEL_XPATH,
+    ROTORCRAFT_MODEL_XPATH,
+    "/cpacs/vehicles/profiles",
+)
+
+# Subtrees of the models which do not change the geometry
+NON_GEOMETRY_TAGS = ("analyses",)
+
+
+# Functions
+
+def find_element(root: ET.Element, xpath: str) -> ET.Element | None:
+    """Return the element at a simple xpath (e.g. '/cpacs/vehicles/profiles') or None."""
+
+    tags = xpath.strip("/").split("/")
+    if root.tag != tags[0]:
+        return None
+    return root.find("/".join(tags[1:]))
+
+
+def canonical_xml(element: ET.Element, skip_tags: tuple[str, ...] = ()) -> str:
+    """Serialise an element with sorted attributes and stripped text, without skip_tags."""
+
+    if element.tag in skip_tags:
+        return ""
+
+    attributes = " ".join(f"{key}={value!r}" for key, value in sorted(element.attrib.items()))
+    children = "".join(canonical_xml(child, skip_tags) for child in element)
+    text = (element.text or "").strip()
+
+    return f"<{element.tag} {attributes}>{text}{children}</{element.tag}>"
+
+
+def get_geometry_hash(cpacs_text: str) -> str:
+    """Return the hash of the geometry subtrees of a CPACS document."""
+
+    root = ET.fromstring(cpacs_text)
+
+    digest = hashlib.sha256()
+    for xpath in GEOMETRY_XPATHS:
+        element = find_element(root, xpath)
+        subtree = "" if element is None else canonical_xml(element, NON_GEOMETRY_TAGS)
+        digest.update(f"{xpath}={subtree}\n".encode())
+
+    return digest.hexdigest()
+
+
+def reload_geometry(cpacs: CPACS) -> None:
+    """Reopen TiGL on the (modified) TIXI document of a CPACS object."""
+
+    tixi = cpacs.tixi
+    cpacs.tigl = open_tigl(tixi)
+
+    if tixi.checkElement(AIRCRAFT_MODEL_XPATH):
+        cpacs.aircraft = Aircraft(tixi, cpacs.tigl)
+
+    if tixi.checkElement(ROTORCRAFT_MODEL_XPATH):
+        cpacs.tigl_rotor = open_tigl(tixi, rotorcraft=True)
+        cpacs.rotorcraft = Rotorcraft(tixi, cpacs.tigl_rotor)
+
+
+def _write_text(path: Path, text: str) -> None:
+    # Write then rename, a reader never sees a partial CPACS file
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+# Classes
+
+class LiveCPACS:
+    """
+    CPACS object handed from one module to the next one of a workflow.
+
+    Use checkout(cpacs_in) to get the CPACS object a module should run on,
+    then commit(cpacs_out) once the module is finished.
+    """
+
+    def __init__(self) -> None:
+        self.cpacs: CPACS | None = None
+        self.cpacs_path: Path | None = None
+        self.geometry_hash: str | None = None
+
+        self._cpacs_text: str | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LiveCPACS")
+        self._pending: dict[Path, Future] = {}
+
+    def checkout(self, cpacs_in: Path) -> CPACS:
+        """
+        Return the CPACS object of cpacs_in: the live one if cpacs_in is the
+        last committed file, otherwise a new one loaded from the file.
+        """
+
+        cpacs_in = Path(cpacs_in).absolute()
+
+        # Modules may read (or copy) cpacs.cpacs_file, it must be on disk
+        self.flush()
+
+        if self.cpacs is None or self.cpacs_path != cpacs_in:
+            log.info(f"Loading {cpacs_in} in the live CPACS.")
+            self.cpacs = CPACS(cpacs_in)
+            self._cpacs_text = None
+            self.geometry_hash = get_geometry_hash(self.cpacs.tixi.exportDocumentAsString())
+
+        self.cpacs.cpacs_file = str(cpacs_in)
+        self.cpacs_path = cpacs_in
+
+        return self.cpacs
+
+    def commit(self, cpacs_out: Path) -> None:
+        """
+        Write the live CPACS to cpacs_out in the background and
+        update TiGL if the geometry has been modified.
+        """
+
+        if self.cpacs is None:
+            raise ValueError("No CPACS has been checked out.")
+
+        cpacs_out = Path(cpacs_out).absolute()
+        cpacs = self.cpacs
+
+        cpacs_text = cpacs.tixi.exportDocumentAsString()
+        geometry_hash = get_geometry_hash(cpacs_text)
+        if geometry_hash != self.geometry_hash:
+            log.info("The geometry has been modified, reopening TiGL.")
+            reload_geometry(cpacs)
+            self.geometry_hash = geometry_hash
+
+        # Modules may write aeroMaps directly with TIXI
+        cpacs.load_all_aeromaps()
+        if cpacs.tixi.checkElement(AIRCRAFT_NAME_XPATH):
+            cpacs.ac_name = cpacs.tixi.getTextElement(AIRCRAFT_NAME_XPATH)
+
+        self._cpacs_text = cpacs_text
+        self.cpacs_path = cpacs_out
+        self._pending[cpacs_out] = self._executor.submit(_write_text, cpacs_out, cpacs_text)
+
+    def read_text(self, cpacs_path: Path) -> str:
+        """Return the content of a CPACS file, without waiting if it is the last committed one."""
+
+        cpacs_path = Path(cpacs_path).absolute()
+        if self._cpacs_text is not None and cpacs_path == self.cpacs_path:
+            return self._cpacs_text
+
+        return cpacs_path.read_text(encoding="utf-8")
+
+    def flush(self) -> None:
+        """Wait for the CPACS files being written, re-raise a possible writing error."""
+
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.result()
+
+    def close(self) -> None:
+        """Write the pending CPACS files and release the live CPACS."""
+
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self.cpacs = None
+            self.cpacs_path = None
+            self._cpacs_text = None
@@ -14,6 +14,7 @@ from pathlib import Path
 
 from ceasiompy import log
 from ceasiompy.utils.commonpaths import MODULES_DIR_PATH
+from ceasiompy.utils.moduleregistry import get_registry
 
 
 # Constants
@@ -94,22 +95,17 @@ def get_module_list(only_active=True):
 
     ['SkinFriction', 'PyAVL', ...]
 
+    The modules are not imported (see moduleregistry.py).
+
     Returns:
         A list of module names (as strings)
     """
 
     module_list = []
-    for module_dir in MODULES_DIR_PATH.iterdir():
-        module_name = module_dir.name
-
-        # Ignore "dunder"-files and dot files
-        if module_name.startswith("__") or module_name.startswith("."):
-            continue
+    for module_name, module_info in get_registry().items():
 
-        init = get_init_for_module(module_name, raise_error=False)
-        try:
-            module_status = init.MODULE_STATUS
-        except AttributeError:
+        module_status = module_info.status
+        if module_status is None:
             module_status = False
             if module_name != "utils":
                 log.warning(
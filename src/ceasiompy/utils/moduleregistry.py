@@ -0,0 +1,166 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Static registry of the CEASIOMpy modules.
+
+The name, status and metadata of each module are read from its __init__.py
+with ast, without importing it: the heavy dependencies of a module (gmsh, TiGL,
+SMT, ...) are only imported when the module is actually used.
+
+Supported __init__.py definitions are literals, names defined above them,
+calls to get_module_status and MODULE_STATUS imported from another module.
+Anything else is read by importing the __init__.py.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import ast
+
+from ceasiompy.utils.softwarepaths import get_module_status
+
+from pathlib import Path
+from functools import lru_cache
+from typing import (
+    Any,
+    NamedTuple,
+)
+
+from ceasiompy import log
+from ceasiompy.utils.commonpaths import MODULES_DIR_PATH
+
+# Constants
+
+MODNAME_TOP = "ceasiompy"
+
+
+# Classes
+
+class ModuleInfo(NamedTuple):
+    name: str
+    status: bool | None  # None if MODULE_STATUS is not defined
+    module_type: str | None
+    res_dir: bool
+    software_name: str | None
+
+
+class _NotStatic(Exception):
+    """The value of a definition can not be found without running the code."""
+
+
+# Functions
+
+def _read_definitions(init_path: Path) -> tuple[dict[str, ast.expr], dict[str, tuple[str, str]]]:
+    """
+    Return the top-level assignments (name -> value node) of a Python file
+    and its 'from module import attr as name' imports (name -> (module, attr)).
+    """
+
+    tree = ast.parse(init_path.read_text(encoding="utf-8"), filename=str(init_path))
+
+    assignments: dict[str, ast.expr] = {}
+    imports: dict[str, tuple[str, str]] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            if isinstance(node.targets[0], ast.Name):
+                assignments[node.targets[0].id] = node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            if isinstance(node.target, ast.Name):
+                assignments[node.target.id] = node.value
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (node.module, alias.name)
+
+    return assignments, imports
+
+
+def _evaluate(
+    node: ast.expr,
+    assignments: dict[str, ast.expr],
+    imports: dict[str, tuple[str, str]],
+) -> Any:
+    """Evaluate the value of a definition of a module's __init__.py without running it."""
+
+    if isinstance(node, ast.Constant):
+        return node.value
+
+    if isinstance(node, ast.Name):
+        if node.id in assignments:
+            return _evaluate(assignments[node.id], assignments, imports)
+
+        if node.id in imports:
+            module, attr = imports[node.id]
+            parts = module.split(".")
+            if attr == "MODULE_STATUS" and len(parts) == 2 and parts[0] == MODNAME_TOP:
+                return get_module_info(parts[1]).status
+
+        raise _NotStatic(node.id)
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id == "get_module_status":
+            args = [_evaluate(arg, assignments, imports) for arg in node.args]
+            kwargs = {
+                keyword.arg: _evaluate(keyword.value, assignments, imports)
+                for keyword in node.keywords
+                if keyword.arg is not None
+            }
+            return get_module_status(*args, **kwargs)
+
+    raise _NotStatic(ast.dump(node))
+
+
+@lru_cache(maxsize=None)
+def get_module_info(module_name: str) -> ModuleInfo:
+    """Return the status and metadata of a module, read from its __init__.py."""
+
+    module_dir = Path(MODULES_DIR_PATH, module_name)
+    if not module_dir.is_dir():
+        raise ValueError(f"Module '{module_name}' not found")
+
+    init_path = Path(module_dir, "__init__.py")
+    if not init_path.is_file():
+        return ModuleInfo(module_name, None, None, False, None)
+
+    assignments, imports = _read_definitions(init_path)
+
+    def read(name: str, default: Any = None) -> Any:
+        if name not in assignments:
+            return default
+        try:
+            return _evaluate(assignments[name], assignments, imports)
+        except _NotStatic:
+            # Fall back to importing the __init__.py (and its dependencies)
+            from ceasiompy.utils.moduleinterfaces import get_init_for_module
+
+            log.debug(f"{name} of {module_name} is not static, importing its __init__.py.")
+            return getattr(get_init_for_module(module_name, raise_error=True), name, default)
+
+    return ModuleInfo(
+        name=module_name,
+        status=read("MODULE_STATUS"),
+        module_type=read("MODULE_TYPE"),
+        res_dir=bool(read("RES_DIR", False)),
+        software_name=read("SOFTWARE_NAME"),
+    )
+
+
+def get_module_names() -> list[str]:
+    """Return the names of all the CEASIOMpy modules (directories of src/ceasiompy)."""
+
+    return sorted(
+        module_dir.name
+        for module_dir in MODULES_DIR_PATH.iterdir()
+        if module_dir.is_dir()
+        and not module_dir.name.startswith("__")
+        and not module_dir.name.startswith(".")
+    )
+
+
+def get_registry() -> dict[str, ModuleInfo]:
+    """Return the ModuleInfo of all the CEASIOMpy modules, by module name."""
+
+    return {module_name: get_module_info(module_name) for module_name in get_module_names()}
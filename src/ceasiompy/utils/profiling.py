@@ -0,0 +1,283 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Lightweight hierarchical profiling of workflows.
+
+A span (see profile_span and profiled) records the wall time, the CPU time
+and the peak resident memory of a block of code, nested in the span it runs in.
+Spans are only recorded inside a ProfileSession, which writes them in a JSON file
+(the profile.json of a workflow). Outside of a session a span costs nothing.
+The session is held in a context variable: workflows run in different threads
+have their own session, and threads started with contextvars.copy_context
+record in the session of their caller.
+
+CPU time and peak memory are the ones of the whole process, including its finished
+subprocesses (e.g. SU2): spans running concurrently in threads share them.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import sys
+import json
+import time
+import inspect
+import cProfile
+import threading
+
+from pathlib import Path
+from functools import wraps
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Iterator,
+)
+
+from ceasiompy import log
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Constants
+
+PROFILE_NAME = "profile.json"
+
+# Optional capture of the Python calls of each module (see capture_profile)
+PROFILERS = ["NONE", "CPROFILE", "PYINSTRUMENT"]
+
+_SESSION: ContextVar[ProfileSession | None] = ContextVar(
+    "ceasiompy_profile_session", default=None
+)
+_CURRENT_SPAN: ContextVar[Span | None] = ContextVar("ceasiompy_profile_span", default=None)
+
+
+# Functions
+
+def _cpu_seconds() -> float:
+    """CPU time of the process and of its finished subprocesses."""
+
+    if resource is None:
+        return time.process_time()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident memory of the process (or of its largest subprocess) in MB."""
+
+    if resource is None:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS, in kilobytes on Linux
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def _shift_span(span: dict, offset: float) -> dict:
+    span["start"] += offset
+    for child in span["children"]:
+        _shift_span(child, offset)
+    return span
+
+
+# Classes
+
+class Span:
+    """Timing of a block of code and of the spans it contains."""
+
+    def __init__(self, name: str, start: float) -> None:
+        self.name = name
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss_mb: float | None = None
+        self.children: list[Span | dict] = []
+
+        self._wall_start = time.perf_counter()
+        self._cpu_start = _cpu_seconds()
+
+    def finish(self) -> None:
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = _cpu_seconds() - self._cpu_start
+        self.peak_rss_mb = _peak_rss_mb()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "start": round(self.start, 6),
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "peak_rss_mb": self.peak_rss_mb,
+            "children": [
+                child if isinstance(child, dict) else child.to_dict() for child in self.children
+            ],
+        }
+
+
+class ProfileSession:
+    """
+    Record the spans run inside the session (in its context, see contextvars)
+    and write them in profile_path on exit.
+    """
+
+    def __init__(self, name: str, profile_path: Path | None = None) -> None:
+        self.name = name
+        self.profile_path = profile_path
+        self.lock = threading.Lock()
+        self.root: Span | None = None
+        self.epoch = 0.0
+
+    def __enter__(self) -> ProfileSession:
+        self._session_token = _SESSION.set(self)
+
+        self.epoch = time.time()
+        self.root = Span(self.name, 0.0)
+        self._token = _CURRENT_SPAN.set(self.root)
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.root.finish()
+        _CURRENT_SPAN.reset(self._token)
+        _SESSION.reset(self._session_token)
+
+        if self.profile_path is not None:
+            self.write(self.profile_path)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.root._wall_start
+
+    def to_dict(self) -> dict:
+        return {"epoch": self.epoch, **self.root.to_dict()}
+
+    def write(self, profile_path: Path) -> None:
+        try:
+            with self.lock:
+                profile = self.to_dict()
+            Path(profile_path).write_text(json.dumps(profile, indent=2), encoding="utf-8")
+        except OSError as err:
+            log.warning(f"Could not write profile {profile_path}: {err}")
+
+
+# Functions
+
+@contextmanager
+def profile_span(name: str) -> Iterator[None]:
+    """Record the block of code as a span of the current profiling session."""
+
+    session = _SESSION.get()
+    if session is None:
+        yield
+        return None
+
+    # Threads started with a copy of the context nest in the span of their caller
+    parent = _CURRENT_SPAN.get() or session.root
+    span = Span(name, session.elapsed())
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield
+    finally:
+        _CURRENT_SPAN.reset(token)
+        span.finish()
+        with session.lock:
+            parent.children.append(span)
+
+
+def profiled(f: Callable | None = None, *, label_arg: str | None = None) -> Callable:
+    """
+    Decorator recording each call of f as a span (see profile_span), named after f
+    and, if label_arg is given, the value of this argument (e.g. the software name).
+    """
+
+    def decorator(f: Callable) -> Callable:
+        signature = inspect.signature(f) if label_arg is not None else None
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if _SESSION.get() is None:
+                return f(*args, **kwargs)
+
+            name = f.__name__
+            if signature is not None:
+                label = signature.bind_partial(*args, **kwargs).arguments.get(label_arg)
+                if label is not None:
+                    name = f"{name} {label}"
+
+            with profile_span(name):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator if f is None else decorator(f)
+
+
+def attach_profile(profile: dict) -> None:
+    """
+    Add the spans of a session run in another process (see ProfileSession.to_dict)
+    to the current span, with their start moved to the current session.
+    """
+
+    session = _SESSION.get()
+    if session is None or not profile:
+        return None
+
+    span = dict(profile)
+    _shift_span(span, span.pop("epoch", session.epoch) - session.epoch)
+    parent = _CURRENT_SPAN.get() or session.root
+    with session.lock:
+        parent.children.append(span)
+
+
+@contextmanager
+def capture_profile(profiler: str, output_dir: Path, name: str) -> Iterator[None]:
+    """
+    Capture the Python calls of the block of code with cProfile (written in
+    output_dir/name.prof) or pyinstrument (output_dir/name.html), or do nothing.
+    """
+
+    profiler = str(profiler).upper()
+
+    if profiler == "PYINSTRUMENT":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            log.warning("pyinstrument is not installed, using cProfile instead.")
+            profiler = "CPROFILE"
+        else:
+            pyinstrument_profiler = Profiler()
+            pyinstrument_profiler.start()
+            try:
+                yield
+            finally:
+                pyinstrument_profiler.stop()
+                html_path = Path(output_dir, f"{name}.html")
+                html_path.write_text(pyinstrument_profiler.output_html(), encoding="utf-8")
+                log.info(f"pyinstrument profile written in {html_path}.")
+            return None
+
+    if profiler == "CPROFILE":
+        c_profiler = cProfile.Profile()
+        c_profiler.enable()
+        try:
+            yield
+        finally:
+            c_profiler.disable()
+            prof_path = Path(output_dir, f"{name}.prof")
+            c_profiler.dump_stats(prof_path)
+            log.info(f"cProfile profile written in {prof_path}.")
+        return None
+
+    yield
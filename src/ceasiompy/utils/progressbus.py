@@ -0,0 +1,224 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Event-driven progress reporting of workflows.
+
+The output of a software is consumed line by line by a reader thread (see
+follow_output), which turns it into progress events without re-reading the logfile.
+The status of the modules of a workflow is published on a ProgressBus, to which the
+GUI, the CLI and the StatusWriter (workflow_status.json) subscribe.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import json
+import time
+import threading
+
+from pathlib import Path
+from datetime import datetime
+from collections import deque
+from typing import (
+    IO,
+    Callable,
+)
+
+from ceasiompy import log
+
+# Constants
+
+# Number of output lines kept as log tail in the progress events
+LOG_TAIL_LINES = 20
+
+
+# Functions
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write a file through a temporary file, a reader never sees a partial file."""
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def follow_output(
+    stream: IO[str],
+    logfile: IO[str],
+    line_parser: Callable[[str], tuple[float | None, str | None] | None],
+    progress_callback: Callable[..., None] | None,
+    log_path: Path,
+    min_interval: float = 0.5,
+) -> threading.Thread:
+    """
+    Start a thread copying the output stream of a software to its logfile.
+
+    Each line is given to line_parser, which returns (progress, detail) when the
+    line reports a progress (e.g. a new iteration), or None. The last progress is sent
+    to progress_callback at most every min_interval seconds and once at the end.
+    """
+
+    def _follow() -> None:
+        log_tail: deque[str] = deque(maxlen=LOG_TAIL_LINES)
+        last_event: tuple[float | None, str | None] | None = None
+        sent_event = None
+        last_sent = 0.0
+
+        def _send(event: tuple[float | None, str | None]) -> None:
+            progress, detail = event
+            progress_callback(
+                detail=detail,
+                progress=progress,
+                log_path=str(log_path),
+                log_tail="".join(log_tail),
+            )
+
+        for line in stream:
+            logfile.write(line)
+            log_tail.append(line)
+
+            event = line_parser(line)
+            if event is None:
+                continue
+            last_event = event
+
+            now = time.monotonic()
+            if progress_callback is not None and now - last_sent >= min_interval:
+                logfile.flush()
+                _send(event)
+                sent_event = event
+                last_sent = now
+
+        logfile.flush()
+        if progress_callback is not None and last_event is not None and last_event != sent_event:
+            _send(last_event)
+
+    thread = threading.Thread(target=_follow, name=f"follow {log_path.name}", daemon=True)
+    thread.start()
+
+    return thread
+
+
+# Classes
+
+class ProgressBus:
+    """
+    Publish the status of the modules of a workflow to its subscribers, which are
+    called with the list of module status (see Workflow.run_workflow).
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[Callable[[list[dict]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber: Callable[[list[dict]], None]) -> None:
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Callable[[list[dict]], None]) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, modules_status: list[dict]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            subscriber(modules_status)
+
+
+class StatusWriter:
+    """
+    Subscriber of a ProgressBus writing the status of the modules in a JSON file.
+
+    Updates are coalesced: the file is (atomically) written by a background thread
+    at most every min_interval seconds, with the last published status.
+    """
+
+    def __init__(self, status_file: Path, workflow: str, min_interval: float = 0.5) -> None:
+        self.status_file = Path(status_file)
+        self.workflow = workflow
+        self.min_interval = min_interval
+
+        self._pending: list[dict] | None = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="StatusWriter", daemon=True)
+        self._thread.start()
+
+    def __call__(self, modules_status: list[dict]) -> None:
+        # Copy in the publishing thread, the status is modified while it runs
+        snapshot = [dict(module_status) for module_status in modules_status]
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def _write(self, modules_status: list[dict]) -> None:
+        payload = {
+            "workflow": self.workflow,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "modules": modules_status,
+        }
+        try:
+            write_text_atomic(self.status_file, json.dumps(payload, separators=(",", ":")))
+        except OSError as err:
+            log.warning(f"Could not write {self.status_file}: {err}")
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                modules_status, self._pending = self._pending, None
+                closed = self._closed
+
+            if modules_status is not None:
+                self._write(modules_status)
+            if closed:
+                return None
+
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed, timeout=self.min_interval)
+
+    def close(self) -> None:
+        """Write the last published status and stop the writing thread."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+
+class StatusLogger:
+    """
+    Subscriber of a ProgressBus logging the status changes of the modules and their
+    progress at most every min_interval seconds (e.g. for workflows run without GUI).
+    """
+
+    def __init__(self, min_interval: float = 10.0) -> None:
+        self.min_interval = min_interval
+        self._status: dict[str, str] = {}
+        self._last_logged: dict[str, float] = {}
+
+    def __call__(self, modules_status: list[dict]) -> None:
+        now = time.monotonic()
+        for module_status in list(modules_status):
+            name = str(module_status.get("name"))
+            status = str(module_status.get("status"))
+
+            if self._status.get(name) != status:
+                self._status[name] = status
+                self._last_logged[name] = now
+                log.info(f"{name}: {status}")
+                continue
+
+            detail = module_status.get("detail")
+            elapsed = now - self._last_logged[name]
+            if status == "running" and detail and elapsed >= self.min_interval:
+                self._last_logged[name] = now
+                log.info(f"{name}: {detail}")
@@ -0,0 +1,157 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Functions to find the softwares used by CEASIOMpy modules.
+
+Only standard library imports: this module is imported by the __init__.py
+of the modules, e.g. to define their status.
+"""
+
+# Imports
+
+import os
+import sys
+import shutil
+
+from pathlib import Path
+
+from ceasiompy import log
+from ceasiompy.utils.commonpaths import INSTALLDIR_PATH
+
+
+# Functions
+
+def _check_software_exists(soft_name: str) -> bool:
+    soft_path = get_install_path(software_name=soft_name)
+    if soft_path is None:
+        # i.e. the path to the software does not exist
+        return False
+    else:
+        return True
+
+
+def get_module_status(
+    default: bool,
+    needs_soft_name: str | None = None,
+) -> bool:
+    # Return
+    if not default:
+        return False
+
+    if needs_soft_name is not None:
+        return _check_software_exists(needs_soft_name)
+
+    # Does not need a specific software and default is True
+    return True
+
+
+def get_install_path(
+    software_name: str,
+    raise_error: bool = False,
+    display_name: str | None = None,
+) -> Path | None:
+    """Return the installation path of a software.
+
+    Args:
+        software_name (str): Name of the software.
+        raise_error (bool, optional): If True, raise an error if the software is not installed.
+        display_name (str, optional): Friendly name used in logs. Defaults to software_name.
+
+    """
+
+    display_name = display_name or software_name
+
+    def _is_compatible_executable(path: Path) -> bool:
+        if not (path.is_file() and os.access(path, os.X_OK)):
+            return False
+        if sys.platform == "darwin" and _detect_binary_format(path) == "elf":
+            log.warning(
+                "%s was found at %s but appears to be a Linux ELF executable; "
+                "skipping it on macOS.",
+                display_name,
+                path,
+            )
+            return False
+        return True
+
+    # First, try to locate the software inside INSTALLDIR_PATH
+    if INSTALLDIR_PATH.exists():
+        # Directly under INSTALLDIR_PATH
+        candidate = INSTALLDIR_PATH / software_name
+        if _is_compatible_executable(candidate):
+            log.info(f"{display_name} is installed at: {candidate}")
+            return candidate
+
+        # Common layout: installdir/<pkg>[/bin]/<software_name>
+        for subdir in INSTALLDIR_PATH.iterdir():
+            if not subdir.is_dir():
+                continue
+
+            direct = subdir / software_name
+            if _is_compatible_executable(direct):
+                log.info(f"{display_name} is installed at: {direct}")
+                return direct
+
+            bin_candidate = subdir / "bin" / software_name
+            if _is_compatible_executable(bin_candidate):
+                log.info(f"{display_name} is installed at: {bin_candidate}")
+                return bin_candidate
+
+            bin_candidate = subdir / "bin" / software_name.lower()
+            if _is_compatible_executable(bin_candidate):
+                log.info(f"{display_name} is installed at: {bin_candidate}")
+                return bin_candidate
+
+    # If not found in installdir, fall back to the system PATH
+    install_path = shutil.which(software_name)
+
+    if install_path is not None:
+        resolved = Path(install_path)
+        if _is_compatible_executable(resolved):
+            log.info(f"{display_name} is installed at: {install_path}")
+            return resolved
+        else:
+            log.warning(f"{software_name=} at {install_path=} is not compatible.")
+
+    log.warning(f"{display_name} is not installed on your computer!")
+
+    if raise_error:
+        raise FileNotFoundError(f"{display_name} is not installed on your computer!")
+    else:
+        return None
+
+
+def _detect_binary_format(executable: Path) -> str:
+    """Best-effort detection of a binary format based on magic bytes.
+
+    Returns one of: "mach-o", "elf", "unknown".
+    """
+
+    try:
+        with open(executable, "rb") as handle:
+            header = handle.read(4)
+    except OSError:
+        return "unknown"
+
+    if header == b"\x7fELF":
+        return "elf"
+
+    # Mach-O magics (thin + universal).
+    if header in (
+        b"\xfe\xed\xfa\xce",
+        b"\xce\xfa\xed\xfe",
+        b"\xfe\xed\xfa\xcf",
+        b"\xcf\xfa\xed\xfe"
+    ):
+        return "mach-o"
+    if header in (
+        b"\xca\xfe\xba\xbe",
+        b"\xbe\xba\xfe\xca",
+        b"\xca\xfe\xba\xbf",
+        b"\xbf\xba\xfe\xca"
+    ):
+        return "mach-o"
+
+    return "unknown"
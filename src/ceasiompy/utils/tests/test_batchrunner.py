@@ -0,0 +1,77 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/batchrunner.py'
+"""
+
+# Imports
+
+import tempfile
+
+import xml.etree.ElementTree as ET
+
+from ceasiompy.utils.batchrunner import (
+    get_batch_cases,
+    apply_parameters,
+    create_batch_dir,
+    read_parameter_table,
+)
+
+from pathlib import Path
+
+# =================================================================================================
+#   CONSTANTS
+# =================================================================================================
+
+SCALING_XPATH = "/cpacs/vehicles/aircraft/model/wings/wing[@uID='Wing']/transformation/scaling/x"
+
+CPACS = """<?xml version="1.0" encoding="utf-8"?>
+<cpacs>
+  <vehicles><aircraft><model>
+    <wings><wing uID="Wing"><transformation><scaling><x>1.0</x></scaling></transformation>
+    </wing></wings>
+  </model></aircraft></vehicles>
+</cpacs>
+"""
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_batch_cases():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        table_path = Path(tmpdir, "table.csv")
+        table_path.write_text(f"name,{SCALING_XPATH}\nsmall,0.9\n,1.1\n", encoding="utf-8")
+
+        variants = read_parameter_table(table_path)
+        cases = get_batch_cases([Path(tmpdir, "d150.xml"), Path(tmpdir, "d150.xml")], variants)
+
+    assert [case.name for case in cases] == [
+        "d150_small",
+        "d150_002",
+        "d150_small_2",
+        "d150_002_2",
+    ]
+    assert cases[0].parameters == {SCALING_XPATH: "0.9"}
+
+    # Without parameter table: one case per CPACS file
+    assert [case.name for case in get_batch_cases([Path("a.xml"), Path("b.xml")])] == ["a", "b"]
+
+
+def test_apply_parameters():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cpacs_path = Path(tmpdir, "cpacs.xml")
+        cpacs_path.write_text(CPACS, encoding="utf-8")
+
+        variant = apply_parameters(cpacs_path, {SCALING_XPATH: "1.2"}, Path(tmpdir, "variant.xml"))
+
+        scaling = ET.parse(variant).getroot().find("vehicles/aircraft/model/wings/wing//x")
+        assert scaling.text == "1.2"
+
+        assert create_batch_dir(Path(tmpdir)).name == "Batch_001"
+        assert create_batch_dir(Path(tmpdir)).name == "Batch_002"
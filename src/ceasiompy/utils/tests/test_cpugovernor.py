@@ -0,0 +1,92 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/cpugovernor.py'
+"""
+
+# Imports
+
+import os
+import pytest
+import tempfile
+import contextvars
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ceasiompy.utils import cpugovernor
+from ceasiompy.utils.cpugovernor import (
+    cpu_lease,
+    get_sane_max_cpu,
+)
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@pytest.fixture
+def cpu_budget(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setattr(os, "cpu_count", lambda: 8)
+        monkeypatch.setenv("MAX_CPUS", "4")
+        monkeypatch.setenv("CEASIOMPY_CPU_TOKENS_DIR", tmpdir)
+        yield tmpdir
+
+
+def test_get_sane_max_cpu(cpu_budget, monkeypatch):
+
+    assert get_sane_max_cpu() == 4
+
+    monkeypatch.setenv("MAX_CPUS", "not_a_number")
+    assert get_sane_max_cpu() == 7
+
+
+@pytest.mark.skipif(cpugovernor.fcntl is None, reason="CPU tokens need fcntl")
+def test_tokens_are_exclusive(cpu_budget):
+
+    first = cpugovernor._take_tokens(3, 1, 4, None)
+    second = cpugovernor._take_tokens(3, 1, 4, None)
+    try:
+        assert len(first) == 3
+        assert len(second) == 1
+    finally:
+        for fd in first + second:
+            cpugovernor._unlock(fd)
+
+    third = cpugovernor._take_tokens(8, 1, 4, None)
+    for fd in third:
+        cpugovernor._unlock(fd)
+    assert len(third) == 4
+
+
+def test_nested_leases(cpu_budget):
+
+    with cpu_lease(3) as nb_cpus:
+        assert nb_cpus == 3
+
+        with cpu_lease(2) as nested_cpus:
+            assert nested_cpus == 2
+
+            # At most what is left of the outer lease
+            with cpu_lease(5) as last_cpus:
+                assert last_cpus == 1
+
+    with cpu_lease(10) as nb_cpus:
+        assert nb_cpus == 4
+
+
+@pytest.mark.skipif(cpugovernor.fcntl is None, reason="CPU tokens need fcntl")
+def test_leases_of_other_threads(cpu_budget):
+
+    def nb_cpus_leased() -> int:
+        with cpu_lease(4) as nb_cpus:
+            return nb_cpus
+
+    with cpu_lease(3), ThreadPoolExecutor(max_workers=1) as executor:
+        # Unrelated thread: only the token left
+        assert executor.submit(nb_cpus_leased).result() == 1
+
+        # Thread run in the context of the lease: CPUs of the lease
+        assert executor.submit(contextvars.copy_context().run, nb_cpus_leased).result() == 3
@@ -0,0 +1,182 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/jobqueue.py'
+"""
+
+# Imports
+
+import os
+import json
+import time
+import signal
+import sqlite3
+import tempfile
+import threading
+
+from ceasiompy.utils import jobqueue
+from ceasiompy.utils.jobqueue import (
+    JOB_FILE_NAME,
+    JobQueue,
+    serve,
+    run_job,
+    get_workflow_job,
+    reserve_workflow_dir,
+)
+
+from pathlib import Path
+from typing import Callable
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _wait_for(condition: Callable, timeout: float = 60.0) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_reserve_workflow_dir():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "Workflow_002").mkdir()
+
+        wkflow_dir = reserve_workflow_dir(Path(tmpdir))
+
+        assert wkflow_dir.name == "Workflow_003"
+        assert Path(wkflow_dir, JOB_FILE_NAME).exists()
+
+
+def test_job_queue():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "cpacs.xml").write_text("<cpacs/>", encoding="utf-8")
+        cfg_path = Path(tmpdir, "ceasiompy.cfg")
+        cfg_path.write_text("CPACS_TOOLINPUT = cpacs.xml\nMODULE_TO_RUN = ( PyAVL )\n")
+
+        job_queue = JobQueue(Path(tmpdir, "jobs.sqlite"))
+        first = job_queue.submit(cfg_path, submitter="test", graphics=True)
+        second = job_queue.submit(cfg_path)
+
+        # Each job gets its own workflow directory, with a copy of its inputs
+        assert first.status == "queued"
+        assert first.graphics and not second.graphics
+        assert Path(first.workflow_dir).name == "Workflow_001"
+        assert Path(second.workflow_dir).name == "Workflow_002"
+        assert Path(first.workflow_dir, "job_cpacs.xml").read_text() == "<cpacs/>"
+        marker = json.loads(Path(first.workflow_dir, JOB_FILE_NAME).read_text())
+        assert marker["id"] == first.id
+        assert get_workflow_job(Path(first.workflow_dir)) == first
+
+        assert job_queue.cancel(second.id)
+
+        # Jobs are claimed in order, cancelled jobs are skipped
+        claimed = job_queue.claim(worker_pid=1)
+        assert claimed.id == first.id and claimed.status == "running"
+        assert job_queue.claim(worker_pid=2) is None
+        assert not job_queue.cancel(first.id)
+
+        # The worker of the job is not alive
+        assert job_queue.recover_stale_jobs() == [first.id]
+        assert job_queue.find_job(Path(first.workflow_dir)).status == "failed"
+        assert [job.id for job in job_queue.list_jobs()] == [second.id, first.id]
+
+
+def test_serve_recovers_jobs_and_workers(monkeypatch):
+
+    monkeypatch.setattr(jobqueue, "HEARTBEAT_TIMEOUT", 1.0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "cpacs.xml").write_text("<cpacs/>", encoding="utf-8")
+        cfg_path = Path(tmpdir, "ceasiompy.cfg")
+        cfg_path.write_text("CPACS_TOOLINPUT = cpacs.xml\nMODULE_TO_RUN = ( PyAVL )\n")
+
+        job_queue = JobQueue(Path(tmpdir, "jobs.sqlite"))
+        job = job_queue.submit(cfg_path)
+        job_queue.heartbeat(-1)
+        assert job_queue.claim(worker_pid=-1).id == job.id
+
+        stop = threading.Event()
+        service = threading.Thread(
+            target=serve,
+            kwargs={"db_path": job_queue.db_path, "poll_interval": 0.1, "stop": stop},
+        )
+        service.start()
+        try:
+            # The worker of the job stops its heartbeat while the service is running
+            assert _wait_for(lambda: job_queue.get_job(job.id).status == "failed")
+
+            # A worker which dies is restarted
+            assert _wait_for(lambda: job_queue.get_alive_workers())
+            worker_pid = job_queue.get_alive_workers()[0]
+            os.kill(worker_pid, signal.SIGKILL)
+            assert _wait_for(
+                lambda: job_queue.get_alive_workers()
+                and worker_pid not in job_queue.get_alive_workers()
+            )
+        finally:
+            stop.set()
+            service.join()
+
+        assert not job_queue.get_alive_workers()
+
+
+def test_run_job_graphics(monkeypatch):
+
+    from ceasiompy.utils import workflowclasses
+
+    no_graphics = []
+
+    class Workflow:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+        def run_workflow(self):
+            no_graphics.append(os.environ.get("CEASIOMPY_NO_GRAPHICS"))
+
+    monkeypatch.setattr(workflowclasses, "Workflow", Workflow)
+    monkeypatch.setattr(workflowclasses, "get_workflow_outcome", lambda wkflow_dir: ("ok", None))
+    monkeypatch.delenv("CEASIOMPY_NO_GRAPHICS", raising=False)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Path(tmpdir, "cpacs.xml").write_text("<cpacs/>", encoding="utf-8")
+        cfg_path = Path(tmpdir, "ceasiompy.cfg")
+        cfg_path.write_text("CPACS_TOOLINPUT = cpacs.xml\nMODULE_TO_RUN = ( PyAVL )\n")
+
+        # Only the jobs submitted without graphics (CLI) run headless
+        job_queue = JobQueue(Path(tmpdir, "jobs.sqlite"))
+        assert run_job(job_queue.submit(cfg_path)) == ("ok", None)
+        assert run_job(job_queue.submit(cfg_path, graphics=True)) == ("ok", None)
+
+    assert no_graphics == ["1", None]
+    assert "CEASIOMPY_NO_GRAPHICS" not in os.environ
+
+
+def test_job_queue_old_database():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir, "jobs.sqlite")
+        connection = sqlite3.connect(db_path)
+        connection.executescript(
+            jobqueue._SCHEMA.replace(",\n    graphics INTEGER NOT NULL DEFAULT 0", "")
+        )
+        connection.execute(
+            "INSERT INTO jobs (cfg_path, workflow_dir, status, submitted_at) "
+            "VALUES ('job.cfg', 'Workflow_001', 'finished', 0.0)"
+        )
+        connection.commit()
+        connection.close()
+
+        job_queue = JobQueue(db_path)
+        assert not job_queue.get_job(1).graphics
@@ -0,0 +1,40 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/livecpacs.py'
+"""
+
+# Imports
+
+from ceasiompy.utils.livecpacs import get_geometry_hash
+
+# =================================================================================================
+#   CONSTANTS
+# =================================================================================================
+
+CPACS_TEXT = """<?xml version="1.0" encoding="utf-8"?>
+<cpacs>
+  <vehicles><aircraft><model uID="ac">
+    <wings><wing uID="w1"><name>wing</name></wing></wings>
+    <analyses><aeroPerformance>base</aeroPerformance></analyses>
+  </model></aircraft></vehicles>
+  <toolspecific><CEASIOMpy>settings</CEASIOMpy></toolspecific>
+</cpacs>
+"""
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_get_geometry_hash():
+
+    geometry_hash = get_geometry_hash(CPACS_TEXT)
+
+    # Analyses and tool settings do not change the geometry
+    assert get_geometry_hash(CPACS_TEXT.replace(">base<", ">avl<")) == geometry_hash
+    assert get_geometry_hash(CPACS_TEXT.replace(">settings<", ">other<")) == geometry_hash
+
+    assert get_geometry_hash(CPACS_TEXT.replace('"w1"', '"w2"')) != geometry_hash
@@ -0,0 +1,85 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/moduleregistry.py'
+"""
+
+# Imports
+
+import sys
+import json
+import subprocess
+
+from ceasiompy.utils.moduleinterfaces import get_init_for_module
+from ceasiompy.utils.moduleregistry import (
+    get_registry,
+    get_module_info,
+)
+
+from ceasiompy.pyavl import MODULE_NAME as PYAVL
+from ceasiompy.smtrain import MODULE_NAME as SMTRAIN
+
+# =================================================================================================
+#   CONSTANTS
+# =================================================================================================
+
+# Packages which must not be imported to list the modules
+HEAVY_PACKAGES = (
+    "streamlit",
+    "pydantic",
+    "numpy",
+    "pandas",
+    "gmsh",
+    "tigl3",
+    "tixi3",
+    "cpacspy",
+    "smt",
+)
+
+# Listing of the modules in a fresh interpreter, writes the imported modules
+LIST_MODULES_CODE = """
+import sys, json
+from ceasiompy.utils.moduleinterfaces import get_module_list
+get_module_list(only_active=False)
+sys.stderr.write(json.dumps(sorted(sys.modules)))
+"""
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_registry_matches_init():
+
+    for module_name, module_info in get_registry().items():
+        init = get_init_for_module(module_name)
+        if init is None or not hasattr(init, "MODULE_STATUS"):
+            assert module_info.status is None
+            continue
+
+        assert module_info.status == init.MODULE_STATUS
+        assert module_info.res_dir == getattr(init, "RES_DIR", False)
+        assert module_info.module_type == getattr(init, "MODULE_TYPE", None)
+
+
+def test_imported_status():
+
+    # MODULE_STATUS of SMTrain is the one of PyAVL
+    assert get_module_info(SMTRAIN).status == get_module_info(PYAVL).status
+
+
+def test_list_modules_imports():
+    """Listing the modules must not import their heavy dependencies."""
+
+    result = subprocess.run(
+        [sys.executable, "-c", LIST_MODULES_CODE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = json.loads(result.stderr.strip().splitlines()[-1])
+
+    imported = {module.split(".")[0] for module in modules}
+    assert not imported.intersection(HEAVY_PACKAGES)
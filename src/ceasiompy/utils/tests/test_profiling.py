@@ -0,0 +1,109 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/profiling.py'
+"""
+
+# Imports
+
+import json
+import tempfile
+import threading
+import contextvars
+
+from ceasiompy.utils.profiling import (
+    ProfileSession,
+    profiled,
+    profile_span,
+    attach_profile,
+)
+
+from pathlib import Path
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+@profiled(label_arg="software_name")
+def _run(software_name: str) -> str:
+    return software_name
+
+
+def test_profile_span_without_session():
+
+    # Outside of a session spans are not recorded and do not fail
+    with profile_span("nothing"):
+        assert _run("avl") == "avl"
+
+
+def test_profile_session():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        profile_path = Path(tmpdir, "profile.json")
+
+        with ProfileSession("workflow", profile_path) as session:
+            with profile_span("module pyavl"):
+                _run(software_name="avl")
+
+            # Profile of another process, started 1 s after this one
+            attach_profile({
+                "epoch": session.epoch + 1.0,
+                "name": "worker",
+                "start": 0.5,
+                "wall": 1.0,
+                "cpu": 1.0,
+                "peak_rss_mb": None,
+                "children": [],
+            })
+
+        profile = json.loads(profile_path.read_text(encoding="utf-8"))
+
+    assert profile["name"] == "workflow"
+    module, worker = profile["children"]
+    assert module["name"] == "module pyavl"
+    assert [child["name"] for child in module["children"]] == ["_run avl"]
+    assert module["wall"] >= module["children"][0]["wall"]
+    assert worker["start"] == 1.5
+    assert "epoch" not in worker
+
+
+def test_profile_sessions_in_threads():
+
+    barrier = threading.Barrier(2)
+    profiles = {}
+
+    def _run_workflow(name: str) -> None:
+        with ProfileSession(name) as session:
+            # Both sessions are open at the same time
+            barrier.wait()
+            with profile_span(f"module {name}"):
+                barrier.wait()
+
+            # Threads record in the session of their caller only with its context
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(_run, "su2")),
+                threading.Thread(target=_run, args=("avl",)),
+            ]
+            for thread in threads:
+                thread.start()
+                thread.join()
+
+        profiles[name] = session.to_dict()
+
+    threads = [
+        threading.Thread(target=_run_workflow, args=(name,)) for name in ("first", "second")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, profile in profiles.items():
+        assert [child["name"] for child in profile["children"]] == [f"module {name}", "_run su2"]
+
+    # No session left open in this thread
+    with profile_span("nothing"):
+        assert _run("avl") == "avl"
@@ -0,0 +1,80 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/progressbus.py'
+"""
+
+# Imports
+
+import io
+import json
+import tempfile
+
+from ceasiompy.utils.progressbus import (
+    ProgressBus,
+    StatusWriter,
+    follow_output,
+)
+
+from pathlib import Path
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def _iteration_parser(line: str):
+    if not line.startswith("|"):
+        return None
+    iteration = int(line.strip("|\n "))
+    return iteration / 4, f"iteration {iteration}"
+
+
+def test_follow_output():
+
+    events = []
+    logfile = io.StringIO()
+    output = io.StringIO("header\n| 1 |\n| 2 |\nwarning\n| 3 |\n| 4 |\n")
+
+    reader = follow_output(
+        output,
+        logfile,
+        _iteration_parser,
+        lambda **kwargs: events.append(kwargs),
+        Path("logfile_SU2_CFD.log"),
+        min_interval=60.0,
+    )
+    reader.join()
+
+    # Whole output in the logfile, only the first and last progress are sent
+    assert logfile.getvalue() == output.getvalue()
+    assert [event["progress"] for event in events] == [0.25, 1.0]
+    assert events[-1]["detail"] == "iteration 4"
+    assert events[-1]["log_tail"].endswith("| 4 |\n")
+
+
+def test_status_writer():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        status_file = Path(tmpdir, "workflow_status.json")
+
+        bus = ProgressBus()
+        status_writer = StatusWriter(status_file, tmpdir, min_interval=60.0)
+        bus.subscribe(status_writer)
+
+        modules_status = [{"index": 0, "name": "PyAVL", "status": "waiting"}]
+        bus.publish(modules_status)
+        for progress in (0.1, 0.2, 0.3):
+            modules_status[0].update(status="running", progress=progress)
+            bus.publish(modules_status)
+
+        # Updates published meanwhile are coalesced, the last one is written on close
+        status_writer.close()
+
+        payload = json.loads(status_file.read_text(encoding="utf-8"))
+        assert payload["modules"] == [
+            {"index": 0, "name": "PyAVL", "status": "running", "progress": 0.3}
+        ]
+        assert not Path(tmpdir, ".workflow_status.json.tmp").exists()
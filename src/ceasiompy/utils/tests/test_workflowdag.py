@@ -0,0 +1,109 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Test functions for 'utils/workflowdag.py'
+"""
+
+# Imports
+
+import tempfile
+
+import xml.etree.ElementTree as ET
+
+from ceasiompy.utils.workflowdag import (
+    ModuleIO,
+    get_ancestors,
+    get_module_io,
+    xpaths_overlap,
+    merge_cpacs_outputs,
+    build_dependency_graph,
+)
+
+from pathlib import Path
+
+from ceasiompy.pyavl import MODULE_NAME as PYAVL
+from ceasiompy.cpacs2gmsh import MODULE_NAME as CPACS2GMSH
+
+# =================================================================================================
+#   CONSTANTS
+# =================================================================================================
+
+AERO_XPATH = "/cpacs/vehicles/aircraft/model/analyses/aeroPerformance"
+WINGS_XPATH = "/cpacs/vehicles/aircraft/model/wings"
+MESH_XPATH = "/cpacs/toolspecific/CEASIOMpy/filesPath/su2Mesh"
+
+BASE_CPACS = """<?xml version="1.0" encoding="utf-8"?>
+<cpacs>
+  <vehicles><aircraft><model>
+    <wings><wing uID="w1"/></wings>
+    <analyses><aeroPerformance>base</aeroPerformance></analyses>
+  </model></aircraft></vehicles>
+</cpacs>
+"""
+
+# =================================================================================================
+#   TESTS
+# =================================================================================================
+
+
+def test_xpaths_overlap():
+
+    assert xpaths_overlap("/cpacs/vehicles", WINGS_XPATH)
+    assert xpaths_overlap(WINGS_XPATH + "/wing[2]", WINGS_XPATH)
+    assert not xpaths_overlap(WINGS_XPATH, AERO_XPATH)
+
+
+def test_build_dependency_graph():
+
+    modules_io = [
+        ModuleIO(inputs=(WINGS_XPATH,), outputs=(MESH_XPATH,)),  # mesher
+        ModuleIO(inputs=("/cpacs/vehicles",), outputs=(AERO_XPATH,)),  # vlm solver
+        ModuleIO(inputs=(MESH_XPATH,), outputs=(AERO_XPATH,)),  # cfd solver
+        ModuleIO(inputs=(AERO_XPATH,), outputs=()),  # post-processing
+    ]
+    dependencies = build_dependency_graph(modules_io)
+
+    assert dependencies == [set(), set(), {0, 1}, {1, 2}]
+    assert get_ancestors(dependencies, 3) == [0, 1, 2]
+
+
+def test_get_module_io():
+
+    assert MESH_XPATH in get_module_io(CPACS2GMSH).outputs
+    assert AERO_XPATH in get_module_io(PYAVL).outputs
+
+    # Modules without declaration read and write the whole CPACS
+    assert get_module_io("utils") == ModuleIO(inputs=("/cpacs",), outputs=("/cpacs",))
+
+
+def test_merge_cpacs_outputs():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir, "base.xml")
+        base.write_text(BASE_CPACS)
+
+        # Module 1 writes the aeroPerformance, module 2 the su2 mesh
+        out_1 = Path(tmpdir, "out_1.xml")
+        out_1.write_text(BASE_CPACS.replace(">base<", ">avl<").replace('"w1"', '"changed"'))
+        out_2 = Path(tmpdir, "out_2.xml")
+        out_2.write_text(
+            BASE_CPACS.replace(
+                "</cpacs>",
+                "<toolspecific><CEASIOMpy><filesPath><su2Mesh>mesh.su2</su2Mesh>"
+                "</filesPath></CEASIOMpy></toolspecific></cpacs>",
+            )
+        )
+
+        merged = merge_cpacs_outputs(
+            base,
+            [(out_1, (AERO_XPATH,)), (out_2, (MESH_XPATH,))],
+            Path(tmpdir, "merged.xml"),
+        )
+
+        root = ET.parse(merged).getroot()
+        assert root.find("vehicles/aircraft/model/analyses/aeroPerformance").text == "avl"
+        assert root.find("toolspecific/CEASIOMpy/filesPath/su2Mesh").text == "mesh.su2"
+        # Not declared as output: not merged
+        assert root.find("vehicles/aircraft/model/wings/wing").get("uID") == "w1"
@@ -8,14 +8,20 @@ Test functions for 'utils/workflowclasses.py'
 
 # Imports
 
+import json
 import pytest
+import tempfile
 
 from ceasiompy.utils.ceasiompyutils import current_workflow_dir
 
 from pathlib import Path
+from types import SimpleNamespace
 from ceasiompy.utils.workflowclasses import (
     Workflow,
     ModuleToRun,
+    get_input_hash,
+    find_checkpoint,
+    restore_checkpoint,
 )
 
 from ceasiompy.pyavl import MODULE_NAME as PYAVL
@@ -44,6 +50,64 @@ def test_no_wkflow_error():
         ModuleToRun(SU2RUN, Path("./Not_WKFLOW"), CPACS_PATH)
 
 
+def test_find_checkpoint():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wkflow_1 = Path(tmpdir, "Workflow_001")
+        wkflow_2 = Path(tmpdir, "Workflow_002")
+        for wkflow_dir in (wkflow_1, wkflow_2):
+            wkflow_dir.mkdir()
+            Path(wkflow_dir, "cpacs_in.xml").write_text(f"<cpacs>{wkflow_dir}/mesh.su2</cpacs>")
+
+        # The workflow directory does not change the hash
+        input_hash = get_input_hash(PYAVL, Path(wkflow_1, "cpacs_in.xml"), wkflow_1)
+        assert input_hash == get_input_hash(PYAVL, Path(wkflow_2, "cpacs_in.xml"), wkflow_2)
+        assert input_hash != get_input_hash(SU2RUN, Path(wkflow_2, "cpacs_in.xml"), wkflow_2)
+
+        cpacs_out = Path(wkflow_1, "ToolOutput.xml")
+        cpacs_out.write_text("<cpacs/>")
+        modules = [{"name": PYAVL, "status": "finished", "input_hash": input_hash}]
+        Path(wkflow_1, "workflow_status.json").write_text(json.dumps({"modules": modules}))
+
+        # No output recorded
+        assert find_checkpoint(Path(tmpdir), wkflow_2, PYAVL, input_hash) is None
+
+        modules[0]["cpacs_out"] = str(cpacs_out)
+        Path(wkflow_1, "workflow_status.json").write_text(json.dumps({"modules": modules}))
+
+        assert find_checkpoint(Path(tmpdir), wkflow_2, PYAVL, input_hash)[0] == wkflow_1
+        assert find_checkpoint(Path(tmpdir), wkflow_2, PYAVL, "other") is None
+        assert find_checkpoint(Path(tmpdir), wkflow_1, PYAVL, input_hash) is None
+
+
+def test_restore_checkpoint():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wkflow_1 = Path(tmpdir, "Workflow_001")
+        wkflow_2 = Path(tmpdir, "Workflow_002")
+        results_1 = Path(wkflow_1, "Results", SU2RUN)
+        results_1.mkdir(parents=True)
+        wkflow_2.mkdir()
+
+        cpacs_out = Path(wkflow_1, "ToolOutput.xml")
+        cpacs_out.write_text(f"<cpacs>{wkflow_1}/mesh.su2</cpacs>")
+        Path(results_1, "config.cfg").write_text(f"MESH_FILENAME= {wkflow_1}/mesh.su2\n")
+        Path(results_1, "forces.dat").write_bytes(b"\x00\xff")
+
+        module = SimpleNamespace(
+            cpacs_out=Path(wkflow_2, "ToolOutput.xml"),
+            results_dir=Path(wkflow_2, "Results", SU2RUN),
+        )
+        module_status = {"cpacs_out": str(cpacs_out), "results_dir": str(results_1)}
+        restore_checkpoint(module, wkflow_2, (wkflow_1, module_status))
+
+        assert module.cpacs_out.read_text() == f"<cpacs>{wkflow_2}/mesh.su2</cpacs>"
+        assert Path(module.results_dir, "config.cfg").read_text() == (
+            f"MESH_FILENAME= {wkflow_2}/mesh.su2\n"
+        )
+        assert Path(module.results_dir, "forces.dat").read_bytes() == b"\x00\xff"
+
+
 class TestModuleToRun:
 
     # Remove old wkflow_test dir and create an empty one
@@ -123,6 +187,7 @@ class TestWorkflow:
 if __name__ == "__main__":
     test_module_name_error()
     test_no_wkflow_error()
+    test_find_checkpoint()
     test1 = TestModuleToRun()
     test1.test_default_values()
     test1.test_create_module_wkflow_dir()
@@ -10,25 +10,57 @@ Classes to run ceasiompy workflows.
 
 import os
 import json
+import queue
 import shutil
-import importlib
+import hashlib
 import traceback
+import multiprocessing
 
 from ceasiompy.utils import get_wkdir
+from ceasiompy.utils.livecpacs import LiveCPACS
+from ceasiompy.utils.jobqueue import JOB_FILE_NAME
+from ceasiompy.utils.progressbus import (
+    ProgressBus,
+    StatusWriter,
+    StatusLogger,
+)
+from ceasiompy.utils.profiling import (
+    PROFILERS,
+    PROFILE_NAME,
+    ProfileSession,
+    profile_span,
+    attach_profile,
+    capture_profile,
+)
+from ceasiompy.utils.moduleregistry import get_module_info
 from ceasiompy.utils.moduleinterfaces import get_module_list
 from ceasiompy.utils.ceasiompylogger import add_to_runworkflow_history
 from ceasiompy.utils.ceasiompyutils import (
     run_module,
+    get_sane_max_cpu,
     change_working_dir,
     get_results_directory,
 )
+from ceasiompy.utils.workflowdag import (
+    get_ancestors,
+    get_module_io,
+    merge_cpacs_outputs,
+    build_dependency_graph,
+)
 
 from pathlib import Path
 from typing import Callable
 from datetime import datetime
+from functools import lru_cache
+from contextlib import ExitStack
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
 from ceasiompy.utils.configfiles import ConfigFile
 
-from ceasiompy.utils.moduleinterfaces import MODNAME_INIT
+from ceasiompy import log
 from ceasiompy.utils.commonpaths import (
     CPACS_FILES_PATH,
     MODULES_DIR_PATH,
@@ -37,6 +69,203 @@ from ceasiompy.utils.commonpaths import (
 #
 OPTIM_METHOD = ["Optimisation", "DOE"]
 
+PROGRESS_KEYS = (
+    "detail",
+    "progress",
+    "eta_seconds",
+    "elapsed_seconds",
+    "log_path",
+    "log_tail",
+)
+
+WORKFLOW_STATUS_NAME = "workflow_status.json"
+
+# Replaces the workflow directory in the hashed CPACS, to compare inputs of different workflows
+WORKFLOW_DIR_PLACEHOLDER = "<WORKFLOW_DIR>"
+
+# Larger result files are data (meshes, restarts...), copied without moving their paths
+CHECKPOINT_REWRITE_MAX_BYTES = 64 * 1024**2
+
+
+# =================================================================================================
+#   FUNCTIONS
+# =================================================================================================
+
+
+def _set_failed_status(module_status: dict, exc: BaseException) -> None:
+    module_status["status"] = "failed"
+    module_status["error"] = str(exc)
+    tb_frames = traceback.extract_tb(exc.__traceback__)
+    if tb_frames:
+        last_frame = tb_frames[-1]
+        module_status["error_location"] = f"{last_frame.filename}:{last_frame.lineno}"
+
+
+def get_workflow_outcome(wkflow_dir: Path) -> tuple[str, str | None]:
+    """
+    Return ('finished', None) if all the modules of a workflow are finished,
+    otherwise ('failed', description of the first module not finished).
+    """
+
+    try:
+        status = json.loads(Path(wkflow_dir, WORKFLOW_STATUS_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as err:
+        return "failed", f"No workflow status: {err}"
+
+    for module_status in status.get("modules", []):
+        if module_status.get("status") != "finished":
+            reason = module_status.get("error") or module_status.get("status")
+            return "failed", f"{module_status.get('name')}: {reason}"
+
+    return "finished", None
+
+
+def _run_module_in_process(
+    module,
+    wkdir: Path,
+    iteration: int,
+    test: bool,
+    progress_queue,
+    profiler: str = "NONE",
+) -> dict:
+    """
+    Run a module in a worker process of the DAG executor, progress goes to the queue.
+    Returns the profile of the module (see utils/profiling.py).
+    """
+
+    def _queue_progress(**kwargs) -> None:
+        progress_queue.put((module.name, kwargs))
+
+    with ProfileSession(f"module {module.name}") as session:
+        with capture_profile(profiler, module.module_wkflow_path, module.name):
+            run_module(module, wkdir, iteration, test, progress_callback=_queue_progress)
+
+    return session.to_dict()
+
+
+@lru_cache(maxsize=None)
+def get_code_version(module_name: str) -> str:
+    """
+    Return the hash of the source code of a module and of the utils it relies on:
+    outputs of another version of the code are not reused.
+    """
+
+    digest = hashlib.sha256()
+    for code_dir in (Path(MODULES_DIR_PATH, module_name), Path(MODULES_DIR_PATH, "utils")):
+        for py_file in sorted(code_dir.rglob("*.py")):
+            if "tests" in py_file.parts:
+                continue
+            digest.update(f"{py_file.relative_to(MODULES_DIR_PATH).as_posix()}\n".encode())
+            digest.update(py_file.read_bytes())
+
+    return digest.hexdigest()
+
+
+def get_input_hash(
+    module_name: str,
+    cpacs_in: Path,
+    wkflow_dir: Path,
+    cpacs_text: str | None = None,
+) -> str:
+    """
+    Return the hash of the input of a module: its name, the version of its code
+    (see get_code_version) and its input CPACS file (or cpacs_text, its content),
+    which also holds the GUI settings. The path of the workflow directory is replaced
+    by a placeholder, so that the same input gives the same hash in any workflow.
+    """
+
+    if cpacs_text is None:
+        cpacs_text = Path(cpacs_in).read_text(encoding="utf-8", errors="replace")
+    cpacs_text = cpacs_text.replace(str(Path(wkflow_dir).absolute()), WORKFLOW_DIR_PLACEHOLDER)
+
+    digest = hashlib.sha256()
+    digest.update(f"{module_name}\n".encode())
+    digest.update(f"{get_code_version(module_name)}\n".encode())
+    digest.update(cpacs_text.encode())
+
+    return digest.hexdigest()
+
+
+def find_checkpoint(
+    working_dir: Path,
+    current_wkflow_dir: Path,
+    module_name: str,
+    input_hash: str,
+) -> tuple[Path, dict] | None:
+    """
+    Look in the other workflows of the working directory, newest first, for a finished
+    run of module_name with the same input hash whose output CPACS still exists.
+
+    Returns:
+        (workflow directory, module status) of the checkpoint, or None if there is none.
+
+    """
+
+    wkflow_dirs = []
+    for wkflow_dir in Path(working_dir).glob("Workflow_*"):
+        idx_str = wkflow_dir.name.split("_")[-1]
+        if wkflow_dir.is_dir() and idx_str.isdigit() and wkflow_dir != current_wkflow_dir:
+            wkflow_dirs.append((int(idx_str), wkflow_dir))
+
+    for _, wkflow_dir in sorted(wkflow_dirs, reverse=True):
+        try:
+            status = json.loads(
+                Path(wkflow_dir, WORKFLOW_STATUS_NAME).read_text(encoding="utf-8")
+            )
+            modules_status = status["modules"]
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+
+        for module_status in modules_status:
+            if (
+                module_status.get("name") == module_name
+                and module_status.get("status") == "finished"
+                and module_status.get("input_hash") == input_hash
+                and Path(module_status.get("cpacs_out", "")).is_file()
+            ):
+                return wkflow_dir, module_status
+
+    return None
+
+
+def restore_checkpoint(module, wkflow_dir: Path, checkpoint: tuple[Path, dict]) -> None:
+    """
+    Reuse the output of a checkpoint (see find_checkpoint) for a module of wkflow_dir:
+    copy its output CPACS, with the paths moved to wkflow_dir, and its results directory.
+    """
+
+    old_wkflow_dir, module_status = checkpoint
+    old_path = str(Path(old_wkflow_dir).absolute())
+    new_path = str(Path(wkflow_dir).absolute())
+
+    cpacs_text = Path(module_status["cpacs_out"]).read_text(encoding="utf-8")
+    Path(module.cpacs_out).write_text(cpacs_text.replace(old_path, new_path), encoding="utf-8")
+
+    def _copy_moving_paths(src: str, dst: str) -> None:
+        # Result files (e.g. SU2 configurations with MESH_FILENAME) may hold
+        # absolute paths into the old workflow: they must point to the new one.
+        if Path(src).stat().st_size <= CHECKPOINT_REWRITE_MAX_BYTES:
+            data = Path(src).read_bytes()
+            if old_path.encode() in data:
+                try:
+                    text = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    log.warning(f"{src} refers to {old_path} but is not a text file.")
+                else:
+                    Path(dst).write_text(text.replace(old_path, new_path), encoding="utf-8")
+                    shutil.copystat(src, dst)
+                    return None
+        shutil.copy2(src, dst)
+
+    old_results_dir = module_status.get("results_dir")
+    if module.results_dir is not None and old_results_dir and Path(old_results_dir).is_dir():
+        shutil.copytree(
+            old_results_dir,
+            module.results_dir,
+            copy_function=_copy_moving_paths,
+            dirs_exist_ok=True,
+        )
+
 # =================================================================================================
 #   CLASSES
 # =================================================================================================
@@ -64,8 +293,8 @@ class ModuleToRun:
         self.name = name
         self.wkflow_dir = wkflow_dir
         self.cpacs_in = cpacs_in
-        init = importlib.import_module(f"ceasiompy.{name}.{MODNAME_INIT}")
-        add_res_dir: bool = init.RES_DIR
+        # Read without importing the module, it is only imported when run
+        add_res_dir: bool = get_module_info(name).res_dir
 
         if add_res_dir:
             self.results_dir = get_results_directory(name, create=True, wkflow_dir=wkflow_dir)
@@ -157,6 +386,18 @@ class Workflow:
         self.optim_method = None
         self.module_optim = []
 
+        # Run independent modules concurrently (see run_workflow)
+        self.dag_mode = False
+
+        # Reuse the outputs of modules already run with the same input (see run_workflow)
+        self.resume = False
+
+        # Hand one CPACS object from module to module (see utils/livecpacs.py)
+        self.live_cpacs = False
+
+        # Capture the Python calls of each module (see utils/profiling.py)
+        self.profiler = "NONE"
+
     def from_config_file(self, cfg_file: Path) -> None:
         """Get parameters from a config file
 
@@ -181,6 +422,29 @@ class Workflow:
         except KeyError:
             self.optim_method = "None"
 
+        try:
+            self.dag_mode = str(cfg["DAG_MODE"]).upper() == "YES"
+        except KeyError:
+            self.dag_mode = False
+
+        try:
+            self.resume = str(cfg["RESUME"]).upper() == "YES"
+        except KeyError:
+            self.resume = False
+
+        try:
+            self.live_cpacs = str(cfg["LIVE_CPACS"]).upper() == "YES"
+        except KeyError:
+            self.live_cpacs = False
+
+        try:
+            self.profiler = str(cfg["PROFILER"]).upper()
+        except KeyError:
+            self.profiler = "NONE"
+        if self.profiler not in PROFILERS:
+            log.warning(f"Profiler {self.profiler} not supported, use one of {PROFILERS}.")
+            self.profiler = "NONE"
+
     def write_config_file(self) -> None:
         """Write the workflow configuration file in the working directory."""
 
@@ -200,11 +464,21 @@ class Workflow:
             cfg["comment_module_optim"] = "MODULE_OPTIM = (  )"
             cfg["comment_optim_method"] = "OPTIM_METHOD = NONE"
 
+        cfg["DAG_MODE"] = "YES" if self.dag_mode else "NO"
+        cfg["RESUME"] = "YES" if self.resume else "NO"
+        cfg["LIVE_CPACS"] = "YES" if self.live_cpacs else "NO"
+        cfg["PROFILER"] = self.profiler
+
         cfg_file = Path(self.working_dir, "ceasiompy.cfg")
         cfg.write_file(cfg_file, overwrite=True)
 
-    def set_workflow(self) -> None:
-        """Create the directory structure and set input/output of each modules"""
+    def set_workflow(self, wkflow_dir: Path | None = None) -> None:
+        """Create the directory structure and set input/output of each modules
+
+        Args:
+            wkflow_dir (Path): Workflow directory already reserved (e.g. by the job
+                queue) to use instead of the next Workflow_XXX directory.
+        """
 
         # Check optim method validity
         if str(self.optim_method) not in (OPTIM_METHOD + ["None", "NONE"]):
@@ -231,16 +505,23 @@ class Workflow:
 
         # Reuse latest incomplete workflow (no Results folder), otherwise create next index.
         workflow_dirs = []
-        for wkflow_dir in wkdir.glob("Workflow_*"):
-            if not wkflow_dir.is_dir():
+        for wkflow_path in wkdir.glob("Workflow_*"):
+            if not wkflow_path.is_dir():
                 continue
-            idx_str = wkflow_dir.stem.split("_")[-1]
+            idx_str = wkflow_path.stem.split("_")[-1]
             if idx_str.isdigit():
-                workflow_dirs.append((int(idx_str), wkflow_dir))
+                workflow_dirs.append((int(idx_str), wkflow_path))
 
-        if workflow_dirs:
+        if wkflow_dir is not None:
+            self.current_wkflow_dir = Path(wkflow_dir)
+            self.current_wkflow_dir.mkdir(parents=True, exist_ok=True)
+        elif workflow_dirs:
             last_idx, last_wkflow_dir = max(workflow_dirs, key=lambda item: item[0])
-            if not Path(last_wkflow_dir, "Results").is_dir():
+            # Workflows of the job queue are never reused, they may be queued or running
+            is_reusable = not Path(last_wkflow_dir, "Results").is_dir() and not Path(
+                last_wkflow_dir, JOB_FILE_NAME
+            ).exists()
+            if is_reusable:
                 self.current_wkflow_dir = last_wkflow_dir
                 for child in self.current_wkflow_dir.iterdir():
                     if child.is_dir():
@@ -315,10 +596,19 @@ class Workflow:
 
         # Save the original working directory to restore it later
         original_cwd = os.getcwd()
+        live_cpacs = None
+        exit_stack = ExitStack()
 
         try:
+            # Timings of the workflow, written in its profile.json
+            exit_stack.enter_context(
+                ProfileSession(
+                    self.current_wkflow_dir.name,
+                    Path(self.current_wkflow_dir, PROFILE_NAME),
+                )
+            )
             add_to_runworkflow_history(self.current_wkflow_dir)
-            status_file = Path(self.current_wkflow_dir, "workflow_status.json")
+            status_file = Path(self.current_wkflow_dir, WORKFLOW_STATUS_NAME)
 
             modules_status = []
             for idx, module in enumerate(self.modules):
@@ -329,27 +619,38 @@ class Workflow:
                     "status": "waiting",
                 })
 
-            def persist_status() -> None:
-                payload = {
-                    "workflow": str(self.current_wkflow_dir),
-                    "updated_at": datetime.now().isoformat(timespec="seconds"),
-                    "modules": modules_status,
-                }
-                try:
-                    status_file.write_text(
-                        json.dumps(payload, indent=2),
-                        encoding="utf-8",
-                    )
-                except OSError:
-                    pass
+            # The status is written in workflow_status.json and sent to the
+            # GUI (or logged) by the subscribers of the progress bus
+            progress_bus = ProgressBus()
+            status_writer = StatusWriter(status_file, str(self.current_wkflow_dir))
+            exit_stack.callback(status_writer.close)
+            progress_bus.subscribe(status_writer)
+            progress_bus.subscribe(
+                StatusLogger() if progress_callback is None else progress_callback
+            )
+
+            def notify() -> None:
+                progress_bus.publish(modules_status)
+
+            notify()
+
+            if self.dag_mode:
+                if any(module.is_optim_module for module in self.modules):
+                    log.warning("DAG mode does not support optimisation, running in order.")
+                else:
+                    self._run_workflow_dag(modules_status, notify, test)
+                    return None
 
-            persist_status()
+            if self.live_cpacs:
+                live_cpacs = LiveCPACS()
 
             for idx, module in enumerate(self.modules):
+                if self._reuse_checkpoint(module, modules_status[idx], live_cpacs):
+                    notify()
+                    continue
+
                 modules_status[idx]["status"] = "running"
-                persist_status()
-                if progress_callback is not None:
-                    progress_callback(modules_status)
+                notify()
 
                 def module_progress_update(
                     *,
@@ -372,41 +673,203 @@ class Workflow:
                         modules_status[idx]["log_path"] = log_path
                     if log_tail is not None:
                         modules_status[idx]["log_tail"] = log_tail
-                    persist_status()
-                    if progress_callback is not None:
-                        progress_callback(modules_status)
+                    notify()
 
                 try:
-                    if module.is_optim_module:
-                        self.subworkflow.run_subworkflow()
-                    else:
-                        run_module(
-                            module,
-                            self.current_wkflow_dir,
-                            self.modules_list.index(module.name),
-                            test,
-                            progress_callback=module_progress_update,
-                        )
+                    with profile_span(f"module {module.name}"), capture_profile(
+                        self.profiler, module.module_wkflow_path, module.name
+                    ):
+                        if module.is_optim_module:
+                            if live_cpacs is not None:
+                                live_cpacs.flush()
+                            self.subworkflow.run_subworkflow()
+                        else:
+                            run_module(
+                                module,
+                                self.current_wkflow_dir,
+                                self.modules_list.index(module.name),
+                                test,
+                                progress_callback=module_progress_update,
+                                cpacs=(
+                                    None if live_cpacs is None
+                                    else live_cpacs.checkout(module.cpacs_in)
+                                ),
+                            )
+                            if live_cpacs is not None:
+                                live_cpacs.commit(module.cpacs_out)
                 except Exception as exc:
-                    modules_status[idx]["status"] = "failed"
-                    modules_status[idx]["error"] = str(exc)
-                    tb_frames = traceback.extract_tb(exc.__traceback__)
-                    if tb_frames:
-                        last_frame = tb_frames[-1]
-                        modules_status[idx]["error_location"] = (
-                            f"{last_frame.filename}:{last_frame.lineno}"
-                        )
-                    persist_status()
-                    if progress_callback is not None:
-                        progress_callback(modules_status)
+                    _set_failed_status(modules_status[idx], exc)
+                    notify()
                     return None
                 else:
-                    modules_status[idx]["status"] = "finished"
-                    persist_status()
-                    if progress_callback is not None:
-                        progress_callback(modules_status)
+                    self._set_finished_status(module, modules_status[idx])
+                    notify()
 
+            if live_cpacs is not None:
+                live_cpacs.flush()
             shutil.copy(module.cpacs_out, Path(self.current_wkflow_dir, "ToolOutput.xml"))
         finally:
+            if live_cpacs is not None:
+                live_cpacs.close()
+            exit_stack.close()
             # Always restore the original working directory
             os.chdir(original_cwd)
+
+    def _set_finished_status(self, module: ModuleToRun, module_status: dict) -> None:
+        """Mark a module as finished and record its output, to be reused as a checkpoint."""
+
+        module_status["status"] = "finished"
+        module_status["cpacs_out"] = str(Path(module.cpacs_out).absolute())
+        if module.results_dir is not None:
+            module_status["results_dir"] = str(Path(module.results_dir).absolute())
+
+    def _reuse_checkpoint(
+        self,
+        module: ModuleToRun,
+        module_status: dict,
+        live_cpacs: LiveCPACS | None = None,
+    ) -> bool:
+        """
+        Record the input hash of a module and, if resume is on, reuse the output of a previous
+        workflow which ran it with the same input (see find_checkpoint).
+        With a live CPACS, the input is read from it instead of waiting for its file.
+
+        Returns:
+            True if the module does not need to run.
+
+        """
+
+        if module.is_optim_module or module.cpacs_in is None:
+            return False
+        if live_cpacs is not None:
+            cpacs_text = live_cpacs.read_text(module.cpacs_in)
+        elif Path(module.cpacs_in).is_file():
+            cpacs_text = None
+        else:
+            return False
+
+        input_hash = get_input_hash(
+            module.name, module.cpacs_in, self.current_wkflow_dir, cpacs_text
+        )
+        module_status["input_hash"] = input_hash
+
+        if not self.resume:
+            return False
+
+        checkpoint = find_checkpoint(
+            self.working_dir, self.current_wkflow_dir, module.name, input_hash
+        )
+        if checkpoint is None:
+            return False
+
+        try:
+            restore_checkpoint(module, self.current_wkflow_dir, checkpoint)
+        except OSError as err:
+            log.warning(f"Could not reuse {module.name} from {checkpoint[0]}: {err}")
+            return False
+
+        log.info(f"Reusing {module.name} from {checkpoint[0]} (same input).")
+        self._set_finished_status(module, module_status)
+        module_status["reused_from"] = str(checkpoint[0])
+
+        return True
+
+    def _run_workflow_dag(
+        self,
+        modules_status: list[dict],
+        notify: Callable[[], None],
+        test: bool,
+    ) -> None:
+        """
+        Run the modules as a dependency graph built from the CPACS xpaths they read and write
+        (see utils/workflowdag.py). Independent modules run concurrently in separate processes.
+        Each module gets the CPACS of the workflow updated with the outputs of its
+        dependencies, and all outputs are merged in workflow order into the final CPACS.
+        """
+
+        base_cpacs = Path(self.current_wkflow_dir, "selected_cpacs.xml")
+        modules_io = [get_module_io(module.name) for module in self.modules]
+        dependencies = build_dependency_graph(modules_io)
+        index_by_name = {module.name: idx for idx, module in enumerate(self.modules)}
+
+        def merged_outputs(indices: list[int]) -> list[tuple[Path, tuple[str, ...]]]:
+            return [(self.modules[i].cpacs_out, modules_io[i].outputs) for i in indices]
+
+        finished: set[int] = set()
+        nb_workers = max(1, min(get_sane_max_cpu(), len(self.modules)))
+        log.info(f"Running workflow as a dependency graph on {nb_workers} processes.")
+
+        # Spawn fresh interpreters: modules may hold non fork-safe state (gmsh, threads).
+        mp_context = multiprocessing.get_context("spawn")
+        with mp_context.Manager() as manager:
+            progress_queue = manager.Queue()
+            with ProcessPoolExecutor(max_workers=nb_workers, mp_context=mp_context) as executor:
+                running = {}
+                while len(finished) < len(self.modules):
+
+                    # Start the modules whose dependencies are all finished
+                    for idx, module in enumerate(self.modules):
+                        if modules_status[idx]["status"] != "waiting":
+                            continue
+                        if not dependencies[idx] <= finished:
+                            continue
+
+                        module.cpacs_in = merge_cpacs_outputs(
+                            base_cpacs,
+                            merged_outputs(get_ancestors(dependencies, idx)),
+                            Path(module.module_wkflow_path, "ToolInput.xml"),
+                        )
+                        if self._reuse_checkpoint(module, modules_status[idx]):
+                            finished.add(idx)
+                            notify()
+                            continue
+
+                        future = executor.submit(
+                            _run_module_in_process,
+                            module,
+                            self.current_wkflow_dir,
+                            self.modules_list.index(module.name),
+                            test,
+                            progress_queue,
+                            self.profiler,
+                        )
+                        running[future] = idx
+                        modules_status[idx]["status"] = "running"
+                        notify()
+
+                    done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                    updated = False
+                    while True:
+                        try:
+                            module_name, kwargs = progress_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        module_status = modules_status[index_by_name[module_name]]
+                        for key in PROGRESS_KEYS:
+                            if kwargs.get(key) is not None:
+                                module_status[key] = kwargs[key]
+                        updated = True
+
+                    for future in done:
+                        idx = running.pop(future)
+                        try:
+                            attach_profile(future.result())
+                        except Exception as exc:
+                            _set_failed_status(modules_status[idx], exc)
+                            for other in running:
+                                other.cancel()
+                            notify()
+                            return None
+                        self._set_finished_status(self.modules[idx], modules_status[idx])
+                        finished.add(idx)
+                        updated = True
+
+                    if updated:
+                        notify()
+
+        merge_cpacs_outputs(
+            base_cpacs,
+            merged_outputs(list(range(len(self.modules)))),
+            Path(self.current_wkflow_dir, "ToolOutput.xml"),
+        )
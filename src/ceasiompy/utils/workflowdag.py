@@ -0,0 +1,169 @@
+"""
+CEASIOMpy: Conceptual Aircraft Design Software
+
+Developed by CFS ENGINEERING, 1015 Lausanne, Switzerland
+
+Dependency graph of the modules of a workflow, built from the CPACS xpaths
+each module reads and writes, and merging of the CPACS files they output.
+
+A module declares its xpaths in its __init__.py:
+
+    CPACS_INPUTS = (WINGS_XPATH, MESH_XPATH, ...)
+    CPACS_OUTPUTS = (SU2MESH_XPATH, ...)
+
+Modules without declaration are assumed to read and write the whole CPACS.
+"""
+
+# Futures
+
+from __future__ import annotations
+
+# Imports
+import re
+
+import xml.etree.ElementTree as ET
+
+from ceasiompy.utils.moduleinterfaces import get_init_for_module
+
+from pathlib import Path
+from typing import NamedTuple
+
+from ceasiompy import log
+
+# Constants
+
+CPACS_ROOT_XPATH = "/cpacs"
+
+
+# Classes
+
+class ModuleIO(NamedTuple):
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+# Functions
+
+def get_module_io(module_name: str) -> ModuleIO:
+    """
+    Return the CPACS xpaths read and written by a module,
+    the whole CPACS if the module does not declare them.
+    """
+
+    init = get_init_for_module(module_name, raise_error=False)
+    inputs = getattr(init, "CPACS_INPUTS", None)
+    outputs = getattr(init, "CPACS_OUTPUTS", None)
+
+    if inputs is None or outputs is None:
+        return ModuleIO(inputs=(CPACS_ROOT_XPATH,), outputs=(CPACS_ROOT_XPATH,))
+
+    return ModuleIO(inputs=tuple(inputs), outputs=tuple(outputs))
+
+
+def _split_xpath(xpath: str) -> list[str]:
+    """Split an xpath in element names, without predicates (e.g. '[1]' or '[@uID=...]')."""
+    return [tag for tag in re.sub(r"\[[^\]]*\]", "", xpath).strip("/").split("/") if tag]
+
+
+def xpaths_overlap(xpath_a: str, xpath_b: str) -> bool:
+    """Check if one xpath is the other or one of its ancestors."""
+
+    tags_a = _split_xpath(xpath_a)
+    tags_b = _split_xpath(xpath_b)
+    nb_tags = min(len(tags_a), len(tags_b))
+
+    return tags_a[:nb_tags] == tags_b[:nb_tags]
+
+
+def _any_overlap(xpaths_a: tuple[str, ...], xpaths_b: tuple[str, ...]) -> bool:
+    return any(xpaths_overlap(a, b) for a in xpaths_a for b in xpaths_b)
+
+
+def build_dependency_graph(modules_io: list[ModuleIO]) -> list[set[int]]:
+    """
+    Return, for each module, the indices of the earlier modules it must wait for:
+    the ones writing what it reads (read after write) or what it writes
+    (write after write, to keep the workflow order for the merged CPACS).
+    """
+
+    dependencies: list[set[int]] = []
+    for j, module_j in enumerate(modules_io):
+        dependencies.append({
+            i
+            for i, module_i in enumerate(modules_io[:j])
+            if _any_overlap(module_i.outputs, module_j.inputs)
+            or _any_overlap(module_i.outputs, module_j.outputs)
+        })
+
+    return dependencies
+
+
+def get_ancestors(dependencies: list[set[int]], idx: int) -> list[int]:
+    """Return the sorted indices of all the (transitive) dependencies of module idx."""
+
+    ancestors: set[int] = set()
+    stack = list(dependencies[idx])
+    while stack:
+        i = stack.pop()
+        if i not in ancestors:
+            ancestors.add(i)
+            stack.extend(dependencies[i])
+
+    return sorted(ancestors)
+
+
+def _replace_subtree(dst_root: ET.Element, src_root: ET.Element, xpath: str) -> None:
+    """Replace the elements at xpath in dst_root by the ones of src_root."""
+
+    tags = _split_xpath(xpath)
+    if not tags or tags[0] != dst_root.tag:
+        log.warning(f"Can not merge xpath {xpath}, it is not in the CPACS file.")
+        return None
+
+    # Create the missing parents in the destination
+    dst_parent = dst_root
+    for tag in tags[1:-1]:
+        child = dst_parent.find(tag)
+        if child is None:
+            child = ET.SubElement(dst_parent, tag)
+        dst_parent = child
+
+    src_parent = src_root.find("/".join(tags[1:-1])) if len(tags) > 2 else src_root
+    src_elements = [] if src_parent is None else src_parent.findall(tags[-1])
+
+    children = list(dst_parent)
+    position = next(
+        (i for i, child in enumerate(children) if child.tag == tags[-1]),
+        len(children),
+    )
+    for child in children:
+        if child.tag == tags[-1]:
+            dst_parent.remove(child)
+    for offset, element in enumerate(src_elements):
+        dst_parent.insert(position + offset, element)
+
+
+def merge_cpacs_outputs(
+    base_cpacs: Path,
+    outputs: list[tuple[Path, tuple[str, ...]]],
+    cpacs_out: Path,
+) -> Path:
+    """
+    Write in cpacs_out the base CPACS file updated, in order, with the xpaths
+    written by each module: outputs is a list of (module output CPACS, written xpaths).
+    """
+
+    tree = ET.parse(base_cpacs)
+    for module_cpacs, xpaths in outputs:
+        if any(len(_split_xpath(xpath)) <= 1 for xpath in xpaths):
+            # The module may have modified everything: start from its output
+            tree = ET.parse(module_cpacs)
+            continue
+
+        src_root = ET.parse(module_cpacs).getroot()
+        for xpath in xpaths:
+            _replace_subtree(tree.getroot(), src_root, xpath)
+
+    tree.write(cpacs_out, encoding="utf-8", xml_declaration=True)
+
+    return Path(cpacs_out)
@@ -1,6 +1,6 @@
 # Imports
 from ceasiompy.utils import get_module_status
-from ceasiompy.utils.ceasiompyutils import get_install_path
+from ceasiompy.utils.softwarepaths import get_install_path
 
 from typing import Final
 from pathlib import Path